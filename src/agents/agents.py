@@ -1,19 +1,100 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
 from langgraph.prebuilt import create_react_agent
 
 from src.config.agents import AGENT_LLM_MAP
+from src.config.loader import get_int_env
 from src.llms.llm import get_llm_by_type
 from src.prompts import apply_prompt_template
 
+from .step_budget import step_budget_hook
+from .tool_node import ConcurrentToolNode, get_tool_concurrency, get_tool_timeout
+
+logger = logging.getLogger(__name__)
+
+# LRU cache of compiled agent graphs, keyed by agent and tool signature
+_agent_cache: OrderedDict[tuple, object] = OrderedDict()
+_agent_cache_lock = threading.Lock()
+
+
+def _get_agent_cache_size() -> int:
+    return get_int_env("AGENT_CACHE_SIZE", 32)
+
+
+def _tools_signature(tools: list) -> str:
+    """Return a digest identifying the tools and their configuration.
+
+    The repr of a tool includes its name, description and configured fields
+    (e.g. max results), so agents are only shared between steps that would
+    have been built with equivalent tools. Tools whose repr contains objects
+    built per step (e.g. a retriever provider) define ``cache_signature``
+    to return stable data instead.
+    """
+    digest = hashlib.sha256()
+    for tool in tools:
+        digest.update(type(tool).__qualname__.encode())
+        cache_signature = getattr(tool, "cache_signature", None)
+        signature = cache_signature() if callable(cache_signature) else repr(tool)
+        digest.update(signature.encode())
+    return digest.hexdigest()
+
+
+def clear_agent_cache() -> None:
+    """Drop all cached agents, e.g. after the available tools changed."""
+    with _agent_cache_lock:
+        _agent_cache.clear()
+
 
 # Create agents using configured LLM types
 def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
-    """Factory function to create agents with consistent configuration."""
-    return create_react_agent(
+    """Factory function to create agents with consistent configuration.
+
+    Compiled agents are cached, so repeated steps and concurrent sessions
+    with the same agent, LLM, tools and prompt reuse one agent graph.
+    """
+    llm_type = AGENT_LLM_MAP[agent_type]
+    llm = get_llm_by_type(llm_type)
+    tool_concurrency = get_tool_concurrency()
+    tool_timeout = get_tool_timeout()
+    key = (
+        agent_name,
+        agent_type,
+        llm_type,
+        id(llm),
+        prompt_template,
+        _tools_signature(tools),
+        tool_concurrency,
+        tool_timeout,
+    )
+    with _agent_cache_lock:
+        agent = _agent_cache.get(key)
+        if agent is not None:
+            _agent_cache.move_to_end(key)
+            return agent
+
+    # Tool calls of one turn run concurrently, with a cap and timeouts
+    tool_node = ConcurrentToolNode(
+        tools, max_concurrency=tool_concurrency, timeout=tool_timeout
+    )
+    agent = create_react_agent(
         name=agent_name,
-        model=get_llm_by_type(AGENT_LLM_MAP[agent_type]),
-        tools=tools,
+        model=llm,
+        tools=tool_node,
         prompt=lambda state: apply_prompt_template(prompt_template, state),
+        # Stops the agent once the budget of the current step is spent
+        pre_model_hook=step_budget_hook,
     )
+    logger.debug(f"Compiled new {agent_name} agent with {len(tools)} tools")
+
+    with _agent_cache_lock:
+        _agent_cache[key] = agent
+        _agent_cache.move_to_end(key)
+        while len(_agent_cache) > max(0, _get_agent_cache_size()):
+            _agent_cache.popitem(last=False)
+    return agent
@@ -0,0 +1,157 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Wall-clock, tool call and token budget of one agent step.
+
+Without a budget, a researcher or coder step runs until the model stops
+calling tools or the recursion limit is hit, which can stall the whole plan.
+``_execute_agent_step`` activates a ``StepBudget`` with ``use_step_budget``
+around the agent run. ``step_budget_hook`` runs before every model call of
+the agent: it keeps the messages gathered so far and raises
+``StepBudgetExceeded`` once the budget is spent, so the step can be finalized
+from what the agent already found.
+
+The deadline of a step is the earlier of its own timeout and the deadline of
+the whole request, so a request budget also bounds every step.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from src.utils.context_compaction import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Why a step ended
+COMPLETED = "completed"
+DEADLINE = "deadline"
+TOOL_CALLS = "tool_calls"
+TOKENS = "tokens"
+RECURSION_LIMIT = "recursion_limit"
+
+# Graph steps one agent turn needs (hook, model and tools)
+_STEPS_PER_TURN = 3
+
+
+class StepBudgetExceeded(Exception):
+    """Raised inside the agent when the step budget is spent."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Step budget exhausted: {reason}")
+        self.reason = reason
+
+
+class StepBudget:
+    """Budget of one agent step and the messages gathered within it.
+
+    Args:
+        deadline: Epoch time the step must finish by, ``None`` for none.
+        max_tool_calls: Tool calls allowed in the step, 0 for no limit.
+        max_tokens: LLM tokens allowed in the step, 0 for no limit.
+    """
+
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        max_tool_calls: int = 0,
+        max_tokens: int = 0,
+    ):
+        self.deadline = deadline
+        self.max_tool_calls = max_tool_calls
+        self.max_tokens = max_tokens
+        self.tool_calls = 0
+        self.tokens = 0
+        self.messages: List[BaseMessage] = []
+        self.end_reason = COMPLETED
+
+    @classmethod
+    def from_configuration(cls, configurable: Any) -> "StepBudget":
+        """Create the budget of a step from a ``Configuration``."""
+        deadlines = []
+        step_timeout = float(configurable.step_timeout)
+        if step_timeout > 0:
+            deadlines.append(time.time() + step_timeout)
+        request_deadline = float(configurable.request_deadline)
+        if request_deadline > 0:
+            deadlines.append(request_deadline)
+        return cls(
+            deadline=min(deadlines) if deadlines else None,
+            max_tool_calls=int(configurable.max_step_tool_calls),
+            max_tokens=int(configurable.max_step_tokens),
+        )
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left until the deadline, ``None`` without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def observe(self, messages: List[BaseMessage]) -> None:
+        """Record the messages of the agent and count its tool calls and tokens."""
+        self.messages = list(messages)
+        tool_calls = tokens = 0
+        for message in messages:
+            if not isinstance(message, AIMessage):
+                continue
+            tool_calls += len(message.tool_calls)
+            usage = message.usage_metadata
+            tokens += (
+                usage["total_tokens"] if usage else estimate_tokens(message.text())
+            )
+        self.tool_calls, self.tokens = tool_calls, tokens
+
+    def exhausted(self) -> Optional[str]:
+        """Return why the budget is spent, or ``None`` if it is not."""
+        if self.deadline is not None and time.time() >= self.deadline:
+            return DEADLINE
+        if self.max_tool_calls > 0 and self.tool_calls >= self.max_tool_calls:
+            return TOOL_CALLS
+        if self.max_tokens > 0 and self.tokens >= self.max_tokens:
+            return TOKENS
+        return None
+
+
+_current_budget: ContextVar[Optional[StepBudget]] = ContextVar(
+    "step_budget", default=None
+)
+
+
+def current_step_budget() -> Optional[StepBudget]:
+    """Return the budget of the agent step being executed, if any."""
+    return _current_budget.get()
+
+
+@contextmanager
+def use_step_budget(budget: Optional[StepBudget]) -> Iterator[None]:
+    """Make ``budget`` visible to the agents run in this context."""
+    token = _current_budget.set(budget)
+    try:
+        yield
+    finally:
+        _current_budget.reset(token)
+
+
+def step_budget_hook(state: dict) -> dict:
+    """Pre-model hook of the agents enforcing the current step budget."""
+    messages = state["messages"]
+    budget = current_step_budget()
+    if budget is not None:
+        budget.observe(messages)
+        reason = budget.exhausted()
+        remaining_steps = state.get("remaining_steps")
+        if (
+            reason is None
+            and remaining_steps is not None
+            and remaining_steps < _STEPS_PER_TURN
+        ):
+            # Finalize instead of answering "need more steps"
+            reason = RECURSION_LIMIT
+        if reason is not None:
+            raise StepBudgetExceeded(reason)
+    return {"llm_input_messages": messages}
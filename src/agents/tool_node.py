@@ -0,0 +1,96 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Tool node running the tool calls of one agent turn concurrently.
+
+When a model asks for several searches or crawls in one message, the prebuilt
+``ToolNode`` starts all of them at once with no limit and waits for the
+slowest one however long it takes. ``ConcurrentToolNode`` caps the calls
+running at the same time and gives every call a timeout. A call that times
+out is answered with an error message, so the agent can go on with the
+results of the other calls.
+
+Environment variables:
+    AGENT_TOOL_CONCURRENCY: Tool calls of one turn running at the same time
+        (default: 4, 1 runs them one by one).
+    AGENT_TOOL_TIMEOUT: Seconds allowed per tool call (default: 120, 0 for no
+        timeout).
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.prebuilt import ToolNode
+from langgraph.store.base import BaseStore
+
+from src.config.loader import get_int_env
+
+logger = logging.getLogger(__name__)
+
+
+def get_tool_concurrency() -> int:
+    return get_int_env("AGENT_TOOL_CONCURRENCY", 4)
+
+
+def get_tool_timeout() -> int:
+    return get_int_env("AGENT_TOOL_TIMEOUT", 120)
+
+
+class ConcurrentToolNode(ToolNode):
+    def __init__(
+        self,
+        tools: list,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(tools, **kwargs)
+        self.max_concurrency = (
+            max_concurrency if max_concurrency is not None else get_tool_concurrency()
+        )
+        self.timeout = timeout if timeout is not None else get_tool_timeout()
+
+    # Reuses the private input parsing and per call execution of ToolNode in
+    # langgraph-prebuilt 0.1.x, which pyproject.toml pins for this reason
+    async def _afunc(
+        self,
+        input: Any,
+        config: RunnableConfig,
+        *,
+        store: Optional[BaseStore],
+    ) -> Any:
+        tool_calls, input_type = self._parse_input(input, store)
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency)
+            if self.max_concurrency > 0
+            else contextlib.nullcontext()
+        )
+
+        async def run_one(call: dict) -> Any:
+            async with semaphore:
+                try:
+                    # Synchronous tools keep running in their executor thread
+                    # after a timeout, only the agent stops waiting for them
+                    return await asyncio.wait_for(
+                        self._arun_one(call, input_type, config),
+                        timeout=self.timeout if self.timeout > 0 else None,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Tool {call['name']} timed out after {self.timeout}s"
+                    )
+                    return ToolMessage(
+                        content=f"Error: {call['name']} did not finish within "
+                        f"{self.timeout}s. Continue with the other results.",
+                        name=call["name"],
+                        tool_call_id=call["id"],
+                        status="error",
+                    )
+
+        outputs = await asyncio.gather(*(run_one(call) for call in tool_calls))
+        return self._combine_tool_outputs(outputs, input_type)
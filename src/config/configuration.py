@@ -51,6 +51,18 @@ class Configuration:
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
     report_style: str = ReportStyle.BULLDOZER.value  # Report style
     enable_deep_thinking: bool = False  # Whether to enable deep thinking
+    enable_parallel_steps: bool = False  # Whether to run independent steps in parallel
+    max_parallel_steps: int = 3  # Maximum number of steps dispatched at once
+    completed_steps_token_budget: int = 8000  # Token budget for prior findings per step
+    observations_token_budget: int = 32000  # Token budget for report observations
+    enable_map_reduce_report: bool = False  # Condense observation groups first
+    report_group_size: int = 3  # Observations condensed together in the map phase
+    max_report_map_concurrency: int = 4  # Maximum concurrent map-phase LLM calls
+    crawl_max_chars: int = 1000  # Character budget for the content of a crawled page
+    step_timeout: int = 600  # Seconds an agent step may run before it is finalized
+    max_step_tool_calls: int = 20  # Tool calls an agent step may make, 0 for no limit
+    max_step_tokens: int = 0  # LLM tokens an agent step may use, 0 for no limit
+    request_deadline: float = 0.0  # Epoch time the whole request must finish by
 
     @classmethod
     def from_runnable_config(
@@ -30,6 +30,17 @@ def get_int_env(name: str, default: int = 0) -> int:
         return default
 
 
+def get_float_env(name: str, default: float = 0.0) -> float:
+    val = os.getenv(name)
+    if val is None:
+        return default
+    try:
+        return float(val.strip())
+    except ValueError:
+        print(f"Invalid float value for {name}: {val}. Using default {default}.")
+        return default
+
+
 def replace_env_vars(value: str) -> str:
     """Replace environment variables in string values."""
     if not isinstance(value, str):
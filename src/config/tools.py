@@ -15,16 +15,30 @@ class SearchEngine(enum.Enum):
     BRAVE_SEARCH = "brave_search"
     ARXIV = "arxiv"
     WIKIPEDIA = "wikipedia"
+    # Several of the engines above, see src/tools/federated_search.py
+    FEDERATED = "federated"
 
 
 # Tool configuration
 SELECTED_SEARCH_ENGINE = os.getenv("SEARCH_API", SearchEngine.TAVILY.value)
 
 
+class ExtractorEngine(enum.Enum):
+    READABILITY = "readability"
+    FAST = "fast"
+
+
+class FetcherBackend(enum.Enum):
+    JINA = "jina"
+    DIRECT = "direct"
+
+
 class RAGProvider(enum.Enum):
     RAGFLOW = "ragflow"
     VIKINGDB_KNOWLEDGE_BASE = "vikingdb_knowledge_base"
     MILVUS = "milvus"
+    # In-process vector index, see src/rag/local.py
+    LOCAL = "local"
 
 
 SELECTED_RAG_PROVIDER = os.getenv("RAG_PROVIDER")
@@ -2,8 +2,21 @@
 # SPDX-License-Identifier: MIT
 
 from .article import Article
-from .crawler import Crawler
+from .crawler import Crawler, create_extractor
+from .fast_extractor import FastExtractor
+from .fetcher import DirectFetcher, FetchError, JinaFetcher, RoutedFetcher
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
-__all__ = ["Article", "Crawler", "JinaClient", "ReadabilityExtractor"]
+__all__ = [
+    "Article",
+    "Crawler",
+    "DirectFetcher",
+    "FastExtractor",
+    "FetchError",
+    "JinaClient",
+    "JinaFetcher",
+    "ReadabilityExtractor",
+    "RoutedFetcher",
+    "create_extractor",
+]
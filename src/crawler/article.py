@@ -2,25 +2,135 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Callable, Iterator, List, Optional
 from urllib.parse import urljoin
 
+import lxml.html
+from lxml import etree
 from markdownify import markdownify as md
 
+# Elements converted to markdown as one unit by ``to_markdown_within_budget``
+_BLOCK_TAGS = {
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "p",
+    "pre",
+    "blockquote",
+    "ul",
+    "ol",
+    "dl",
+    "table",
+    "figure",
+    "img",
+}
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+def _query_terms(query: Optional[str]) -> set[str]:
+    return {term.lower() for term in _WORD_RE.findall(query or "")}
+
+
+def _iter_blocks(element: lxml.html.HtmlElement) -> Iterator[lxml.html.HtmlElement]:
+    """Yield the block-level elements of ``element`` in document order."""
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        has_own_text = (child.text or "").strip() or any(
+            (grandchild.tail or "").strip() for grandchild in child
+        )
+        if child.tag in _BLOCK_TAGS or not len(child) or has_own_text:
+            yield child
+        else:
+            yield from _iter_blocks(child)
+
 
 class Article:
     url: str
+    # Called with the full markdown once it has been converted, e.g. to cache it
+    on_markdown: Optional[Callable[[str], None]] = None
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(self, title: str, html_content: str, markdown: Optional[str] = None):
         self.title = title
         self.html_content = html_content
+        self._markdown = markdown
 
     def to_markdown(self, including_title: bool = True) -> str:
+        if including_title and self._markdown is not None:
+            return self._markdown
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
         markdown += md(self.html_content)
+        if including_title:
+            self._markdown = markdown
+            if self.on_markdown is not None:
+                self.on_markdown(markdown)
         return markdown
 
+    def to_markdown_within_budget(
+        self,
+        max_chars: int,
+        query: Optional[str] = None,
+        including_title: bool = True,
+    ) -> str:
+        """Convert only as much of the article as fits in ``max_chars``.
+
+        Blocks (headings, paragraphs, lists, tables...) are converted one at a
+        time, most relevant first: blocks matching ``query``, then the rest in
+        document order. Conversion stops once the budget is
+        met and the selected blocks are returned in document order, so huge
+        pages are never converted in full.
+        """
+        title = f"# {self.title}\n\n" if including_title else ""
+        if including_title and self._markdown is not None:
+            if len(self._markdown) <= max_chars:
+                return self._markdown
+        if not self.html_content:
+            return title[:max_chars]
+
+        root = lxml.html.fragment_fromstring(self.html_content, create_parent="div")
+        blocks = list(_iter_blocks(root))
+        terms = _query_terms(query)
+
+        def score(index: int) -> int:
+            if not terms:
+                return 0
+            words = set(_WORD_RE.findall(blocks[index].text_content().lower()))
+            return len(terms & words)
+
+        scores = [score(i) for i in range(len(blocks))]
+        order = sorted(range(len(blocks)), key=lambda i: (-scores[i], i))
+
+        selected: dict[int, str] = {}
+        used = len(title)
+        for index in order:
+            if used >= max_chars:
+                break
+            block = blocks[index]
+            markdown = md(
+                etree.tostring(
+                    block, encoding="unicode", method="html", with_tail=False
+                )
+            ).strip()
+            if not markdown:
+                continue
+            # Cut the block that overflows so lower ranked blocks earlier in
+            # the document cannot push more relevant ones out of the budget
+            remaining = max_chars - used - 2
+            if len(markdown) > remaining:
+                markdown = markdown[: max(0, remaining)].rstrip()
+                if not markdown:
+                    break
+            selected[index] = markdown
+            used += len(markdown) + 2
+
+        parts: List[str] = [selected[index] for index in sorted(selected)]
+        return (title + "\n\n".join(parts))[:max_chars]
+
     def to_message(self) -> list[dict]:
         image_pattern = r"!\[.*?\]\((.*?)\)"
 
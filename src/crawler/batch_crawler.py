@@ -0,0 +1,162 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Concurrent crawling of many URLs.
+
+Researchers usually crawl several search hits per step. ``BatchCrawler``
+fetches them concurrently over a pooled HTTP client shared per event loop,
+limits the number of requests in flight overall and per target host, applies
+a timeout to every URL and yields results as soon as each one finishes.
+
+Environment variables:
+    CRAWL_MAX_CONCURRENCY: URLs crawled at the same time (default: 8).
+    CRAWL_MAX_PER_HOST: URLs of the same host crawled at the same time
+        (default: 2).
+    CRAWL_TIMEOUT: Seconds allowed per URL (default: 30).
+    CRAWL_EXTRACT_WORKERS: Threads running article extraction (default: 4).
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config.loader import get_int_env
+
+from .article import Article
+from .crawler import Crawler
+from .fetcher import http2_available
+
+logger = logging.getLogger(__name__)
+
+# One pooled client per event loop, httpx clients cannot be shared across loops
+_http_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_extraction_executor: Optional[ThreadPoolExecutor] = None
+_extraction_executor_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        max_connections = get_int_env("CRAWL_MAX_CONCURRENCY", 8) * 2
+        client = httpx.AsyncClient(
+            http2=http2_available(),
+            timeout=httpx.Timeout(get_int_env("CRAWL_TIMEOUT", 30)),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=True,
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the pooled HTTP client of the running event loop, if any."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_extraction_executor() -> ThreadPoolExecutor:
+    """Return the worker pool used for article extraction."""
+    global _extraction_executor
+    with _extraction_executor_lock:
+        if _extraction_executor is None:
+            _extraction_executor = ThreadPoolExecutor(
+                max_workers=max(1, get_int_env("CRAWL_EXTRACT_WORKERS", 4)),
+                thread_name_prefix="crawl-extract",
+            )
+        return _extraction_executor
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of crawling one URL."""
+
+    url: str
+    article: Optional[Article] = None
+    error: Optional[str] = None
+
+
+class BatchCrawler:
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        crawler: Optional[Crawler] = None,
+    ):
+        self.max_concurrency = max(
+            1,
+            max_concurrency
+            if max_concurrency is not None
+            else get_int_env("CRAWL_MAX_CONCURRENCY", 8),
+        )
+        self.max_per_host = max(
+            1,
+            max_per_host
+            if max_per_host is not None
+            else get_int_env("CRAWL_MAX_PER_HOST", 2),
+        )
+        self.timeout = (
+            timeout if timeout is not None else get_int_env("CRAWL_TIMEOUT", 30)
+        )
+        self.crawler = crawler or Crawler()
+
+    async def _crawl_one(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        host_semaphores: Dict[str, asyncio.Semaphore],
+    ) -> CrawlResult:
+        host = urlsplit(url).netloc.lower()
+        try:
+            # Wait for the host first so a busy host does not hold global slots
+            async with host_semaphores[host], semaphore:
+                article = await asyncio.wait_for(
+                    self.crawler.acrawl(
+                        url,
+                        client=get_http_client(),
+                        executor=get_extraction_executor(),
+                    ),
+                    timeout=self.timeout,
+                )
+            return CrawlResult(url=url, article=article)
+        except asyncio.TimeoutError:
+            return CrawlResult(url=url, error=f"Timed out after {self.timeout}s")
+        except Exception as e:
+            logger.warning(f"Failed to crawl {url}: {repr(e)}")
+            return CrawlResult(url=url, error=repr(e))
+
+    async def crawl_many(self, urls: List[str]) -> AsyncIterator[CrawlResult]:
+        """Crawl ``urls`` concurrently, yielding results as they finish.
+
+        Duplicate URLs are crawled once. Closing the iterator early cancels
+        the crawls still in flight.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.max_per_host)
+        )
+        tasks = [
+            asyncio.create_task(self._crawl_one(url, semaphore, host_semaphores))
+            for url in dict.fromkeys(urls)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
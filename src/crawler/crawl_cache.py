@@ -0,0 +1,301 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Content-addressed cache of crawled pages.
+
+Company pages, filings and other hot URLs are crawled by many steps and
+sessions. The cache keeps the raw HTML, the extracted article and its markdown
+for each canonicalized URL. Page bodies are stored once per content hash and
+compressed, URL entries only point at them together with the HTTP validators
+(ETag / Last-Modified) used to revalidate stale entries with a conditional
+request. The least recently used content is evicted once the size budget is
+exceeded.
+
+Environment variables:
+    CRAWL_CACHE_ENABLED: Enable the cache (default: true).
+    CRAWL_CACHE_PATH: SQLite file to persist the cache in (default: unset,
+        the cache lives in memory).
+    CRAWL_CACHE_TTL: Seconds a page is served without revalidation
+        (default: 86400).
+    CRAWL_CACHE_MAX_MB: Budget for compressed page content (default: 256).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the visitor and never change the page
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize ``url`` so equivalent spellings share a cache entry."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_")
+            and key.lower() not in _TRACKING_PARAMS
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _compress(text: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(text.encode("utf-8")) if text is not None else None
+
+
+def _decompress(data: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+
+@dataclass
+class CachedPage:
+    """A cached crawl result of one URL."""
+
+    url: str
+    content_hash: str
+    html: str
+    title: Optional[str]
+    article_html: Optional[str]
+    markdown: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return time.time() - self.fetched_at < ttl_seconds
+
+    def to_article(self) -> Article:
+        article = Article(
+            title=self.title,
+            html_content=self.article_html,
+            markdown=self.markdown,
+        )
+        article.url = self.url
+        return article
+
+
+class CrawlCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.path = path if path is not None else get_str_env("CRAWL_CACHE_PATH")
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else get_int_env("CRAWL_CACHE_TTL", 24 * 3600)
+        )
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else get_int_env("CRAWL_CACHE_MAX_MB", 256) * 1024 * 1024
+        )
+        self._lock = threading.Lock()
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path or ":memory:", check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_content (
+                content_hash TEXT PRIMARY KEY,
+                html BLOB NOT NULL,
+                title TEXT,
+                article_html BLOB,
+                markdown BLOB,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS crawl_urls (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS crawl_content_last_access
+                ON crawl_content (last_access);
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page of ``url``, fresh or stale."""
+        key = canonicalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT u.content_hash, c.html, c.title, c.article_html, c.markdown,
+                       u.etag, u.last_modified, u.fetched_at
+                FROM crawl_urls u JOIN crawl_content c USING (content_hash)
+                WHERE u.url = ?
+                """,
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE crawl_content SET last_access = ? WHERE content_hash = ?",
+                (time.time(), row[0]),
+            )
+            self._conn.commit()
+        return CachedPage(
+            url=url,
+            content_hash=row[0],
+            html=_decompress(row[1]),
+            title=row[2],
+            article_html=_decompress(row[3]),
+            markdown=_decompress(row[4]),
+            etag=row[5],
+            last_modified=row[6],
+            fetched_at=row[7],
+        )
+
+    def get_fresh(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page of ``url`` if it is within the TTL."""
+        page = self.get(url)
+        if page is not None and page.is_fresh(self.ttl_seconds):
+            return page
+        return None
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        article: Article,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> str:
+        """Store a crawled page and return its content hash."""
+        content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM crawl_content WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if exists:
+                self._conn.execute(
+                    "UPDATE crawl_content SET last_access = ? WHERE content_hash = ?",
+                    (now, content_hash),
+                )
+            else:
+                html_data = _compress(html)
+                article_data = _compress(article.html_content)
+                self._conn.execute(
+                    "INSERT INTO crawl_content VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                    (
+                        content_hash,
+                        html_data,
+                        article.title,
+                        article_data,
+                        len(html_data) + len(article_data or b""),
+                        now,
+                    ),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_urls VALUES (?, ?, ?, ?, ?)",
+                (canonicalize_url(url), content_hash, etag, last_modified, now),
+            )
+            self._evict()
+            self._conn.commit()
+        return content_hash
+
+    def put_markdown(self, content_hash: str, markdown: str) -> None:
+        """Store the markdown converted from a cached page."""
+        data = _compress(markdown)
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE crawl_content SET markdown = ?, size = size + ?
+                WHERE content_hash = ? AND markdown IS NULL
+                """,
+                (data, len(data), content_hash),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark a cached page as revalidated, e.g. after a 304 response."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_urls SET fetched_at = ? WHERE url = ?",
+                (time.time(), canonicalize_url(url)),
+            )
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM crawl_content"
+            ).fetchone()[0]
+
+    def _evict(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM crawl_content"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for content_hash, size in self._conn.execute(
+            "SELECT content_hash, size FROM crawl_content ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((content_hash,))
+            total -= size
+        self._conn.executemany(
+            "DELETE FROM crawl_content WHERE content_hash = ?", evicted
+        )
+        self._conn.executemany("DELETE FROM crawl_urls WHERE content_hash = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} pages from the crawl cache")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM crawl_urls")
+            self._conn.execute("DELETE FROM crawl_content")
+            self._conn.commit()
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Return the process-wide crawl cache, or ``None`` if disabled."""
+    global _crawl_cache
+    if not get_bool_env("CRAWL_CACHE_ENABLED", True):
+        return None
+    with _crawl_cache_lock:
+        if _crawl_cache is None:
+            _crawl_cache = CrawlCache()
+        return _crawl_cache
@@ -1,27 +1,128 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Optional
+
+import httpx
+
+from src.config.loader import get_str_env
+from src.config.tools import ExtractorEngine
 
 from .article import Article
-from .jina_client import JinaClient
+from .crawl_cache import CachedPage, CrawlCache, get_crawl_cache
+from .fast_extractor import FastExtractor
+from .fetcher import FetchError, FetchResult, RoutedFetcher
 from .readability_extractor import ReadabilityExtractor
 
+logger = logging.getLogger(__name__)
+
+
+def create_extractor(engine: Optional[str] = None):
+    """Create the article extractor selected by ``engine``.
+
+    Defaults to the ``CRAWL_EXTRACTOR`` environment variable: ``readability``
+    (Readability.js in Node.js, the default) or ``fast`` (in-process lxml).
+    """
+    if engine is None:
+        engine = get_str_env("CRAWL_EXTRACTOR", ExtractorEngine.READABILITY.value)
+    if engine == ExtractorEngine.FAST.value:
+        return FastExtractor()
+    if engine != ExtractorEngine.READABILITY.value:
+        logger.warning(f"Unknown extractor engine {engine}, using readability")
+    return ReadabilityExtractor()
+
 
 class Crawler:
+    def __init__(self, extractor=None, fetcher: Optional[RoutedFetcher] = None):
+        # Any object with an ``extract_article(html) -> Article`` method
+        self.extractor = extractor
+        self.fetcher = fetcher
+
     def crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
         # them into text and image blocks for one single and unified
         # LLM message.
         #
-        # Jina is not the best crawler on readability, however it's
-        # much easier and free to use.
+        # Pages are downloaded directly or through Jina, depending on
+        # the fetcher configuration (see src/crawler/fetcher.py).
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        cache = get_crawl_cache()
+        page = cache.get(url) if cache is not None else None
+        if page is not None and page.is_fresh(cache.ttl_seconds):
+            return self._from_cache(cache, page)
+        fetcher = self.fetcher or RoutedFetcher()
+        fetched = fetcher.fetch(
+            url,
+            etag=page.etag if page else None,
+            last_modified=page.last_modified if page else None,
+        )
+        if fetched.not_modified and page is not None:
+            cache.touch(url)
+            return self._from_cache(cache, page)
+        return self._extract(url, fetched, cache)
+
+    async def acrawl(
+        self,
+        url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        executor: Optional[Executor] = None,
+    ) -> Article:
+        """Async version of ``crawl``.
+
+        The page is fetched with ``client`` and the CPU-bound extraction runs
+        in ``executor`` (the loop's default executor if ``None``) so it does
+        not block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        cache = get_crawl_cache()
+        page = None
+        if cache is not None:
+            page = await loop.run_in_executor(executor, cache.get, url)
+            if page is not None and page.is_fresh(cache.ttl_seconds):
+                return self._from_cache(cache, page)
+        fetcher = self.fetcher or RoutedFetcher()
+        fetched = await fetcher.afetch(
+            url,
+            etag=page.etag if page else None,
+            last_modified=page.last_modified if page else None,
+            client=client,
+        )
+        if fetched.not_modified and page is not None:
+            await loop.run_in_executor(executor, cache.touch, url)
+            return self._from_cache(cache, page)
+        return await loop.run_in_executor(executor, self._extract, url, fetched, cache)
+
+    def _extract(
+        self, url: str, fetched: FetchResult, cache: Optional[CrawlCache]
+    ) -> Article:
+        if fetched.not_modified:
+            raise FetchError(f"Got 304 Not Modified for {url} without a cached page")
+        extractor = self.extractor or create_extractor()
+        article = extractor.extract_article(fetched.html)
         article.url = url
+        if cache is not None:
+            content_hash = cache.put(
+                url,
+                fetched.html,
+                article,
+                etag=fetched.etag,
+                last_modified=fetched.last_modified,
+            )
+            article.on_markdown = lambda markdown: cache.put_markdown(
+                content_hash, markdown
+            )
+        return article
+
+    def _from_cache(self, cache: CrawlCache, page: CachedPage) -> Article:
+        article = page.to_article()
+        if page.markdown is None:
+            article.on_markdown = lambda markdown: cache.put_markdown(
+                page.content_hash, markdown
+            )
         return article
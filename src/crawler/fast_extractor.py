@@ -0,0 +1,323 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process article extractor based on lxml.
+
+``ReadabilityExtractor`` runs Readability.js in a Node.js subprocess for every
+page, which dominates the cost of a crawl. This extractor implements the same
+idea in Python on an lxml tree: boilerplate is dropped, paragraphs score their
+ancestors by text length and comma count, scores are damped by link density
+and the best scoring container is returned together with its related
+siblings.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+import lxml.html
+from lxml import etree
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+# Elements that never carry article content
+_REMOVE_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "iframe",
+    "object",
+    "embed",
+    "form",
+    "button",
+    "input",
+    "select",
+    "textarea",
+    "svg",
+    "canvas",
+    "nav",
+    "aside",
+    "footer",
+    "link",
+    "meta",
+]
+_UNLIKELY_RE = re.compile(
+    r"-ad-|ad-break|agegate|banner|breadcrumb|combx|comment|community|cookie|"
+    r"cover-wrap|disqus|extra|footer|gdpr|header|legends|menu|modal|newsletter|"
+    r"pager|pagination|popup|related|remark|replies|rss|share|shoutbox|sidebar|"
+    r"skyscraper|social|sponsor|subscribe|supplemental|yom-remote",
+    re.I,
+)
+_MAYBE_CANDIDATE_RE = re.compile(r"and|article|body|column|content|main|shadow", re.I)
+_POSITIVE_RE = re.compile(
+    r"article|body|content|entry|hentry|h-entry|main|page|pagination|post|text|"
+    r"blog|story",
+    re.I,
+)
+_NEGATIVE_RE = re.compile(
+    r"-ad-|hidden|^hid$| hid$| hid |^hid |banner|combx|comment|com-|contact|"
+    r"foot|footer|footnote|gdpr|masthead|media|meta|outbrain|promo|related|"
+    r"scroll|share|shoutbox|sidebar|skyscraper|sponsor|shopping|tags|tool|widget",
+    re.I,
+)
+_TITLE_SEPARATOR_RE = re.compile(r"\s+[|\-–—_/»]\s+")
+_SCORED_TAGS = ("p", "pre", "td", "blockquote", "h2", "h3", "h4")
+_BLOCK_CHILD_TAGS = {
+    "div",
+    "p",
+    "pre",
+    "table",
+    "ul",
+    "ol",
+    "dl",
+    "blockquote",
+    "section",
+    "article",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+}
+_KEPT_ATTRIBUTES = {"href", "src", "alt", "title", "colspan", "rowspan"}
+_MIN_PARAGRAPH_LENGTH = 25
+
+
+def _text(element: lxml.html.HtmlElement) -> str:
+    return " ".join(element.text_content().split())
+
+
+def _class_weight(element: lxml.html.HtmlElement) -> int:
+    weight = 0
+    for value in (element.get("class"), element.get("id")):
+        if not value:
+            continue
+        if _NEGATIVE_RE.search(value):
+            weight -= 25
+        if _POSITIVE_RE.search(value):
+            weight += 25
+    return weight
+
+
+def _link_density(element: lxml.html.HtmlElement) -> float:
+    text_length = len(_text(element))
+    if text_length == 0:
+        return 0.0
+    link_length = sum(len(_text(link)) for link in element.iter("a"))
+    return link_length / text_length
+
+
+def _initial_score(element: lxml.html.HtmlElement) -> float:
+    tag = element.tag
+    if tag == "div":
+        score = 5
+    elif tag in ("pre", "td", "blockquote"):
+        score = 3
+    elif tag in ("address", "ol", "ul", "dl", "dd", "dt", "li", "form"):
+        score = -3
+    elif tag in ("h1", "h2", "h3", "h4", "h5", "h6", "th"):
+        score = -5
+    else:
+        score = 0
+    return score + _class_weight(element)
+
+
+def _is_hidden(element: lxml.html.HtmlElement) -> bool:
+    style = (element.get("style") or "").replace(" ", "").lower()
+    return (
+        element.get("hidden") is not None
+        or element.get("aria-hidden") == "true"
+        or "display:none" in style
+        or "visibility:hidden" in style
+    )
+
+
+class FastExtractor:
+    def extract_article(self, html: str) -> Article:
+        try:
+            doc = lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.warning(f"Failed to parse HTML: {repr(e)}")
+            return Article(title=None, html_content="")
+
+        title = self._extract_title(doc)
+        self._remove_boilerplate(doc)
+        body = doc.find("body")
+        if body is None:
+            body = doc
+
+        content = self._grab_content(body)
+        if content.tag in ("html", "body"):
+            content.tag = "div"
+        self._clean(content, title)
+        html_content = etree.tostring(content, encoding="unicode", method="html")
+        return Article(title=title, html_content=html_content)
+
+    def _extract_title(self, doc: lxml.html.HtmlElement) -> Optional[str]:
+        for xpath in (
+            "//meta[@property='og:title']/@content",
+            "//meta[@name='twitter:title']/@content",
+        ):
+            values = doc.xpath(xpath)
+            if values and values[0].strip():
+                return " ".join(values[0].split())
+
+        title_element = doc.find(".//title")
+        title = _text(title_element) if title_element is not None else ""
+        headings = [_text(heading) for heading in doc.iter("h1")]
+        for heading in headings:
+            # The headline is usually the title without the site name
+            if heading and heading != title and heading in title:
+                return heading
+        if title and _TITLE_SEPARATOR_RE.search(title):
+            # Drop the site name, e.g. "Headline | Site" or "Site - Headline"
+            parts = _TITLE_SEPARATOR_RE.split(title)
+            candidate = " ".join(parts[:-1])
+            if len(candidate.split()) < 3:
+                candidate = max(parts, key=len)
+            title = candidate
+        if title:
+            return title
+
+        return headings[0] if headings else None
+
+    def _remove_boilerplate(self, doc: lxml.html.HtmlElement) -> None:
+        etree.strip_elements(doc, etree.Comment, with_tail=False)
+        etree.strip_elements(doc, *_REMOVE_TAGS, with_tail=False)
+
+        for element in list(doc.iter()):
+            if not isinstance(element.tag, str) or element.getparent() is None:
+                continue
+            if element.tag in ("html", "body", "article", "main"):
+                continue
+            if _is_hidden(element):
+                element.drop_tree()
+                continue
+            match_string = f"{element.get('class', '')} {element.get('id', '')}"
+            unlikely = _UNLIKELY_RE.search(
+                match_string
+            ) and not _MAYBE_CANDIDATE_RE.search(match_string)
+            if unlikely or (element.tag == "header" and element.find(".//h1") is None):
+                element.drop_tree()
+
+    def _grab_content(self, body: lxml.html.HtmlElement) -> lxml.html.HtmlElement:
+        scores: Dict[lxml.html.HtmlElement, float] = {}
+
+        for element in body.iter(*_SCORED_TAGS, "div"):
+            # Divs without block children are paragraphs in disguise
+            if element.tag == "div" and any(
+                child.tag in _BLOCK_CHILD_TAGS for child in element
+            ):
+                continue
+            text = _text(element)
+            if len(text) < _MIN_PARAGRAPH_LENGTH:
+                continue
+            score = 1 + text.count(",") + text.count("，") + min(len(text) // 100, 3)
+            ancestor = element.getparent()
+            level = 0
+            while ancestor is not None and level < 3:
+                if ancestor not in scores:
+                    scores[ancestor] = _initial_score(ancestor)
+                divider = 1 if level == 0 else 2 if level == 1 else level * 3
+                scores[ancestor] += score / divider
+                ancestor = ancestor.getparent()
+                level += 1
+
+        if not scores:
+            return body
+
+        for candidate in scores:
+            scores[candidate] *= 1 - _link_density(candidate)
+        top = max(scores, key=scores.get)
+        if top.tag == "html":
+            return body
+
+        # Readability scores only three levels up, so an article split into
+        # several sibling sections picks one of them. Climb while the parent
+        # holds most of the score of the whole body.
+        top_score = scores[top]
+        parent = top.getparent()
+        while parent is not None and parent.tag not in ("body", "html"):
+            if scores.get(parent, 0) < top_score * 0.75:
+                break
+            top, top_score = parent, max(top_score, scores[parent])
+            parent = top.getparent()
+
+        threshold = max(10.0, top_score * 0.2)
+        content = lxml.html.Element("div")
+        parent = top.getparent()
+        siblings: List[lxml.html.HtmlElement] = (
+            [child for child in parent if isinstance(child.tag, str)]
+            if parent is not None and parent.tag != "html"
+            else [top]
+        )
+        for sibling in siblings:
+            if sibling is top or self._is_related_sibling(
+                sibling, scores, threshold, _class_weight(top)
+            ):
+                # A layout cell or list item would be rendered as a table or
+                # a list by markdownify
+                if sibling.tag not in ("div", "article", "section", "p"):
+                    sibling.tag = "div"
+                content.append(sibling)
+        return content
+
+    def _is_related_sibling(
+        self,
+        sibling: lxml.html.HtmlElement,
+        scores: Dict[lxml.html.HtmlElement, float],
+        threshold: float,
+        top_weight: int,
+    ) -> bool:
+        bonus = top_weight * 0.2 if _class_weight(sibling) == top_weight else 0
+        if scores.get(sibling, 0) + bonus >= threshold:
+            return True
+        if sibling.tag != "p":
+            return False
+        text = _text(sibling)
+        density = _link_density(sibling)
+        if len(text) > 80:
+            return density < 0.25
+        return density == 0 and bool(re.search(r"\.( |$)", text))
+
+    def _clean(self, content: lxml.html.HtmlElement, title: Optional[str]) -> None:
+        # The title is rendered separately by Article.to_markdown
+        if title:
+            for heading in content.iter("h1", "h2"):
+                if _text(heading).lower() == title.lower():
+                    heading.drop_tree()
+                    break
+
+        for element in list(content.iter("div", "section", "ul", "ol", "table")):
+            if element.getparent() is None:
+                continue
+            text_length = len(_text(element))
+            if _class_weight(element) < 0 and text_length < 200:
+                element.drop_tree()
+            elif text_length < 200 and _link_density(element) > 0.5:
+                element.drop_tree()
+
+        for element in list(content.iter("p", "div", "span", "section")):
+            if (
+                element.getparent() is not None
+                and not _text(element)
+                and element.find(".//img") is None
+            ):
+                element.drop_tree()
+
+        for element in content.iter():
+            if not isinstance(element.tag, str):
+                continue
+            if element.tag == "img" and not element.get("src"):
+                lazy_src = element.get("data-src") or element.get("data-original")
+                if lazy_src:
+                    element.set("src", lazy_src)
+            for name in list(element.attrib):
+                if name not in _KEPT_ATTRIBUTES:
+                    del element.attrib[name]
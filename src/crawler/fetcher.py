@@ -0,0 +1,438 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Backends that download the HTML of a page for the crawler.
+
+``JinaFetcher`` goes through the Jina Reader proxy, which renders JavaScript
+but adds a network hop and third party rate limits. ``DirectFetcher`` fetches
+the page itself over a pooled httpx client (HTTP/2 when ``h2`` is installed,
+gzip/deflate and brotli when ``brotli`` is installed), with a body size limit,
+a redirect limit, a minimum delay between requests to the same host and
+conditional requests to revalidate cached pages. ``RoutedFetcher`` picks the
+backend per domain and falls back to Jina when a direct fetch fails.
+
+Environment variables:
+    CRAWL_FETCHER: ``jina`` (default) or ``direct``.
+    CRAWL_JINA_DOMAINS: Comma separated domains always fetched through Jina,
+        e.g. sites that need JavaScript (default: none).
+    CRAWL_FETCH_FALLBACK: Retry failed direct fetches through Jina
+        (default: true).
+    CRAWL_MAX_BODY_MB: Largest page downloaded directly (default: 10).
+    CRAWL_MAX_REDIRECTS: Redirects followed by a direct fetch (default: 5).
+    CRAWL_HOST_DELAY_MS: Minimum delay between direct requests to the same
+        host (default: 250).
+    CRAWL_USER_AGENT: User-Agent of direct requests.
+    CRAWL_ALLOW_PRIVATE_HOSTS: Let direct fetches reach loopback, private,
+        link-local and other non-public addresses (default: false).
+"""
+
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+from src.config.tools import FetcherBackend
+
+from .jina_client import JinaClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; DeerFlow/0.1)"
+_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+_TEXT_TYPES = ("html", "xml", "text/plain")
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w.:-]+)""", re.I)
+_SCHEMES = ("http", "https")
+
+_sync_client: Optional[httpx.Client] = None
+_sync_client_lock = threading.Lock()
+
+
+class FetchError(Exception):
+    """A page could not be fetched."""
+
+
+@dataclass
+class FetchResult:
+    """The downloaded page of one URL."""
+
+    url: str
+    html: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # The server confirmed the cached copy is still current (HTTP 304)
+    not_modified: bool = False
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_sync_http_client() -> httpx.Client:
+    """Return the pooled HTTP client used by synchronous direct fetches."""
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                http2=http2_available(),
+                timeout=httpx.Timeout(get_int_env("CRAWL_TIMEOUT", 30)),
+            )
+        return _sync_client
+
+
+def close_sync_http_client() -> None:
+    """Close the pooled HTTP client of synchronous direct fetches, if any."""
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+class HostThrottle:
+    """Spaces out requests to the same host by a minimum delay."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_request: Dict[str, float] = {}
+
+    def reserve(self, host: str, delay: float) -> float:
+        """Reserve the next request slot for ``host``.
+
+        Returns how many seconds the caller has to wait before sending it.
+        """
+        if delay <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, 0.0))
+            self._next_request[host] = start + delay
+            return start - now
+
+
+_host_throttle = HostThrottle()
+
+
+def _decode_body(content: bytes, response: httpx.Response) -> str:
+    encoding = response.charset_encoding
+    if encoding is None:
+        match = _META_CHARSET_RE.search(content[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def _is_public_address(address: str) -> bool:
+    # Drop the zone of scoped IPv6 addresses, e.g. fe80::1%eth0
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _url_host(url: str) -> str:
+    """Return the host of ``url``, raise for schemes other than http(s)."""
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in _SCHEMES:
+        raise FetchError(f"Unsupported URL scheme {parts.scheme!r} for {url}")
+    if not parts.hostname:
+        raise FetchError(f"Missing host in {url}")
+    return parts.hostname
+
+
+class DirectFetcher:
+    """Fetch pages from this server's own network.
+
+    Unless ``allow_private_hosts`` is set, every URL, including each redirect
+    target, must resolve to public addresses only, so the LLM cannot make the
+    server request loopback, private network or cloud metadata endpoints.
+    """
+
+    name = FetcherBackend.DIRECT.value
+
+    def __init__(
+        self,
+        max_body_bytes: Optional[int] = None,
+        max_redirects: Optional[int] = None,
+        host_delay: Optional[float] = None,
+        user_agent: Optional[str] = None,
+        throttle: Optional[HostThrottle] = None,
+        allow_private_hosts: Optional[bool] = None,
+    ):
+        self.max_body_bytes = (
+            max_body_bytes
+            if max_body_bytes is not None
+            else get_int_env("CRAWL_MAX_BODY_MB", 10) * 1024 * 1024
+        )
+        self.max_redirects = (
+            max_redirects
+            if max_redirects is not None
+            else get_int_env("CRAWL_MAX_REDIRECTS", 5)
+        )
+        self.host_delay = (
+            host_delay
+            if host_delay is not None
+            else get_int_env("CRAWL_HOST_DELAY_MS", 250) / 1000
+        )
+        self.user_agent = user_agent or get_str_env(
+            "CRAWL_USER_AGENT", DEFAULT_USER_AGENT
+        )
+        self.throttle = throttle or _host_throttle
+        self.allow_private_hosts = (
+            allow_private_hosts
+            if allow_private_hosts is not None
+            else get_bool_env("CRAWL_ALLOW_PRIVATE_HOSTS", False)
+        )
+
+    def _check_addresses(self, url: str, infos: List[Any]) -> None:
+        for info in infos:
+            address = info[4][0]
+            if not _is_public_address(address):
+                raise FetchError(
+                    f"Refusing to fetch {url}: {address} is not a public address"
+                )
+
+    def _check_url(self, url: str) -> None:
+        """Raise unless ``url`` is http(s) and its host is allowed."""
+        host = _url_host(url)
+        if self.allow_private_hosts:
+            return
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except OSError as e:
+            raise FetchError(f"Cannot resolve {host}: {repr(e)}") from e
+        self._check_addresses(url, infos)
+
+    async def _acheck_url(self, url: str) -> None:
+        """Async version of ``_check_url``."""
+        host = _url_host(url)
+        if self.allow_private_hosts:
+            return
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, None, type=socket.SOCK_STREAM
+            )
+        except OSError as e:
+            raise FetchError(f"Cannot resolve {host}: {repr(e)}") from e
+        self._check_addresses(url, infos)
+
+    def _headers(
+        self, etag: Optional[str], last_modified: Optional[str]
+    ) -> Dict[str, str]:
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": _ACCEPT,
+        }
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _check_response(self, response: httpx.Response) -> Optional[FetchResult]:
+        """Return the result of a 304, raise for unusable responses."""
+        url = str(response.url)
+        if response.status_code == 304:
+            return FetchResult(
+                url=url,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                not_modified=True,
+            )
+        if response.status_code >= 400:
+            raise FetchError(f"HTTP {response.status_code} for {url}")
+        content_type = response.headers.get("content-type", "").lower()
+        if content_type and not any(t in content_type for t in _TEXT_TYPES):
+            raise FetchError(f"Unsupported content type {content_type} for {url}")
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            raise FetchError(f"Response of {url} exceeds {self.max_body_bytes} bytes")
+        return None
+
+    def _append_chunk(self, body: bytearray, chunk: bytes, url: str) -> None:
+        body.extend(chunk)
+        if len(body) > self.max_body_bytes:
+            raise FetchError(f"Response of {url} exceeds {self.max_body_bytes} bytes")
+
+    def _result(self, response: httpx.Response, body: bytearray) -> FetchResult:
+        return FetchResult(
+            url=str(response.url),
+            html=_decode_body(bytes(body), response),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+    def fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        client: Optional[httpx.Client] = None,
+    ) -> FetchResult:
+        client = client or get_sync_http_client()
+        headers = self._headers(etag, last_modified)
+        for _ in range(self.max_redirects + 1):
+            self._check_url(url)
+            time.sleep(self.throttle.reserve(urlsplit(url).netloc, self.host_delay))
+            with client.stream(
+                "GET", url, headers=headers, follow_redirects=False
+            ) as response:
+                if response.has_redirect_location:
+                    url = urljoin(str(response.url), response.headers["location"])
+                    continue
+                result = self._check_response(response)
+                if result is not None:
+                    return result
+                body = bytearray()
+                for chunk in response.iter_bytes():
+                    self._append_chunk(body, chunk, url)
+                return self._result(response, body)
+        raise FetchError(f"Too many redirects for {url}")
+
+    async def afetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> FetchResult:
+        """Async version of ``fetch`` using a (shared) httpx client."""
+        if client is None:
+            async with httpx.AsyncClient(http2=http2_available()) as own_client:
+                return await self.afetch(url, etag, last_modified, own_client)
+        headers = self._headers(etag, last_modified)
+        for _ in range(self.max_redirects + 1):
+            await self._acheck_url(url)
+            await asyncio.sleep(
+                self.throttle.reserve(urlsplit(url).netloc, self.host_delay)
+            )
+            async with client.stream(
+                "GET", url, headers=headers, follow_redirects=False
+            ) as response:
+                if response.has_redirect_location:
+                    url = urljoin(str(response.url), response.headers["location"])
+                    continue
+                result = self._check_response(response)
+                if result is not None:
+                    return result
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    self._append_chunk(body, chunk, url)
+                return self._result(response, body)
+        raise FetchError(f"Too many redirects for {url}")
+
+
+class JinaFetcher:
+    name = FetcherBackend.JINA.value
+
+    def fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        client: Optional[httpx.Client] = None,
+    ) -> FetchResult:
+        # Jina does not forward validators, pages are always downloaded again
+        html = JinaClient().crawl(url, return_format="html")
+        return FetchResult(url=url, html=html)
+
+    async def afetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> FetchResult:
+        html = await JinaClient().acrawl(url, return_format="html", client=client)
+        return FetchResult(url=url, html=html)
+
+
+def _parse_domains(value: str) -> List[str]:
+    return [d.strip().lower().lstrip(".") for d in value.split(",") if d.strip()]
+
+
+def _matches_domain(host: str, domains: List[str]) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class RoutedFetcher:
+    """Fetch pages with the backend configured for their domain."""
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        jina_domains: Optional[List[str]] = None,
+        fallback: Optional[bool] = None,
+        direct: Optional[DirectFetcher] = None,
+        jina: Optional[JinaFetcher] = None,
+    ):
+        self.backend = backend or get_str_env(
+            "CRAWL_FETCHER", FetcherBackend.JINA.value
+        )
+        self.jina_domains = (
+            jina_domains
+            if jina_domains is not None
+            else _parse_domains(get_str_env("CRAWL_JINA_DOMAINS"))
+        )
+        self.fallback = (
+            fallback
+            if fallback is not None
+            else get_bool_env("CRAWL_FETCH_FALLBACK", True)
+        )
+        self.direct = direct or DirectFetcher()
+        self.jina = jina or JinaFetcher()
+
+    def backends_for(self, url: str) -> List[Union[DirectFetcher, JinaFetcher]]:
+        """Return the backends to try for ``url``, in order."""
+        host = (urlsplit(url).hostname or "").lower()
+        if self.backend != FetcherBackend.DIRECT.value or _matches_domain(
+            host, self.jina_domains
+        ):
+            return [self.jina]
+        return [self.direct, self.jina] if self.fallback else [self.direct]
+
+    def fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> FetchResult:
+        *backends, last = self.backends_for(url)
+        for backend in backends:
+            try:
+                return backend.fetch(url, etag=etag, last_modified=last_modified)
+            except (FetchError, httpx.HTTPError) as e:
+                logger.warning(f"{backend.name} fetch of {url} failed: {repr(e)}")
+        return last.fetch(url, etag=etag, last_modified=last_modified)
+
+    async def afetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> FetchResult:
+        """Async version of ``fetch`` using a (shared) httpx client."""
+        *backends, last = self.backends_for(url)
+        for backend in backends:
+            try:
+                return await backend.afetch(
+                    url, etag=etag, last_modified=last_modified, client=client
+                )
+            except (FetchError, httpx.HTTPError) as e:
+                logger.warning(f"{backend.name} fetch of {url} failed: {repr(e)}")
+        return await last.afetch(
+            url, etag=etag, last_modified=last_modified, client=client
+        )
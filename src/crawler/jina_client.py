@@ -3,24 +3,68 @@
 
 import logging
 import os
+from typing import Optional
 
+import httpx
 import requests
 
+from src.utils.outbound import get_outbound_governor
+
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+# Name of the Jina Reader API in the outbound governor
+PROVIDER = "jina"
+
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    # The missing API key is reported once per process, not on every crawl
+    _warned_missing_key = False
+
+    def _headers(self, return_format: str) -> dict:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
         }
         if os.getenv("JINA_API_KEY"):
             headers["Authorization"] = f"Bearer {os.getenv('JINA_API_KEY')}"
-        else:
+        elif not JinaClient._warned_missing_key:
+            JinaClient._warned_missing_key = True
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
+        return headers
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
         data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+        with get_outbound_governor().limit(
+            PROVIDER, os.getenv("JINA_API_KEY")
+        ) as permit:
+            response = requests.post(
+                JINA_READER_URL, headers=self._headers(return_format), json=data
+            )
+            permit.record_response(response)
+        # Error pages of the reader must not be extracted and cached as content
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(
+        self,
+        url: str,
+        return_format: str = "html",
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> str:
+        """Async version of ``crawl`` using a (shared) httpx client."""
+        data = {"url": url}
+        if client is None:
+            async with httpx.AsyncClient() as own_client:
+                return await self.acrawl(url, return_format, own_client)
+        async with get_outbound_governor().alimit(
+            PROVIDER, os.getenv("JINA_API_KEY")
+        ) as permit:
+            response = await client.post(
+                JINA_READER_URL, headers=self._headers(return_format), json=data
+            )
+            permit.record_response(response)
+        response.raise_for_status()
         return response.text
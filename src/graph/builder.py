@@ -1,11 +1,14 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
 
-from src.prompts.planner_model import StepType
+from src.config.configuration import Configuration
+from src.prompts.planner_model import Plan, StepType
 
+from .memory_saver import BoundedMemorySaver
 from .nodes import (
     background_investigation_node,
     coder_node,
@@ -18,8 +21,46 @@ from .nodes import (
 )
 from .types import State
 
-
-def continue_to_running_research_team(state: State):
+STEP_TYPE_NODES = {
+    StepType.RESEARCH: "researcher",
+    StepType.PROCESSING: "coder",
+}
+
+
+def get_ready_step_indexes(plan: Plan) -> list[int]:
+    """Return indexes of unexecuted steps whose dependencies are all executed.
+
+    Explicit ``depends_on`` indexes set by the planner are honoured (only
+    references to earlier steps count, so a plan can never deadlock). When a
+    step has no ``depends_on``, research steps that need search are treated
+    as independent and every other step depends on all steps before it.
+    """
+    ready = []
+    for index, step in enumerate(plan.steps):
+        if step.execution_res:
+            continue
+        depends_on = getattr(step, "depends_on", None)
+        if depends_on is None:
+            if step.step_type == StepType.RESEARCH and step.need_search:
+                depends_on = []
+            else:
+                depends_on = range(index)
+        if all(plan.steps[i].execution_res for i in depends_on if 0 <= i < index):
+            ready.append(index)
+    return ready
+
+
+def _dispatch_ready_steps(state: State, plan: Plan, max_parallel_steps: int):
+    """Fan out ready steps to their agents, at most ``max_parallel_steps`` at once."""
+    sends = []
+    for index in get_ready_step_indexes(plan)[: max(1, int(max_parallel_steps))]:
+        node = STEP_TYPE_NODES.get(plan.steps[index].step_type)
+        if node:
+            sends.append(Send(node, {**state, "current_step_index": index}))
+    return sends or "planner"
+
+
+def continue_to_running_research_team(state: State, config: RunnableConfig = None):
     current_plan = state.get("current_plan")
     if not current_plan or not current_plan.steps:
         return "planner"
@@ -27,6 +68,12 @@ def continue_to_running_research_team(state: State):
     if all(step.execution_res for step in current_plan.steps):
         return "planner"
 
+    configurable = Configuration.from_runnable_config(config)
+    if configurable.enable_parallel_steps:
+        return _dispatch_ready_steps(
+            state, current_plan, configurable.max_parallel_steps
+        )
+
     # Find first incomplete step
     incomplete_step = None
     for step in current_plan.steps:
@@ -37,11 +84,7 @@ def continue_to_running_research_team(state: State):
     if not incomplete_step:
         return "planner"
 
-    if incomplete_step.step_type == StepType.RESEARCH:
-        return "researcher"
-    if incomplete_step.step_type == StepType.PROCESSING:
-        return "coder"
-    return "planner"
+    return STEP_TYPE_NODES.get(incomplete_step.step_type, "planner")
 
 
 def _build_base_graph():
@@ -68,9 +111,9 @@ def _build_base_graph():
 
 def build_graph_with_memory():
     """Build and return the agent workflow graph with memory."""
-    # use persistent memory to save conversation history
-    # TODO: be compatible with SQLite / PostgreSQL
-    memory = MemorySaver()
+    # use bounded memory to save conversation history, see BoundedMemorySaver
+    # for the per-thread, byte budget and idle TTL limits
+    memory = BoundedMemorySaver()
 
     # build state graph
     builder = _build_base_graph()
@@ -0,0 +1,364 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Bounded in-memory checkpointer.
+
+``MemorySaver`` keeps the full checkpoint history of every thread forever, so
+a long-running server slowly fills up with messages and observations of
+finished conversations. ``BoundedMemorySaver`` keeps only the most recent
+checkpoints of each thread, evicts idle threads after a TTL and the least
+recently used threads once a global byte budget is exceeded. Evicted threads
+can optionally be spilled to a SQLite file and are restored transparently on
+next access, so interrupted plans can still be resumed.
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterator, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.config.loader import get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+
+def _blob_size(value: Tuple[str, bytes]) -> int:
+    return len(value[1])
+
+
+def _checkpoint_size(value: Tuple[Tuple[str, bytes], Tuple[str, bytes], Any]) -> int:
+    return len(value[0][1]) + len(value[1][1])
+
+
+def _writes_size(writes: Dict[Any, Tuple[str, str, Tuple[str, bytes], str]]) -> int:
+    return sum(len(write[2][1]) for write in writes.values())
+
+
+class _SpillStore:
+    """SQLite file holding the serialized state of evicted threads."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spilled_threads (
+                thread_id TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                spilled_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def save(self, thread_id: str, data: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO spilled_threads VALUES (?, ?, ?)",
+            (thread_id, pickle.dumps(data), time.time()),
+        )
+        self._conn.commit()
+
+    def pop(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT data FROM spilled_threads WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.delete(thread_id)
+        return pickle.loads(row[0])
+
+    def delete(self, thread_id: str) -> None:
+        self._conn.execute(
+            "DELETE FROM spilled_threads WHERE thread_id = ?", (thread_id,)
+        )
+        self._conn.commit()
+
+    def expire(self, max_age_seconds: int) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM spilled_threads WHERE spilled_at < ?",
+            (time.time() - max_age_seconds,),
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """An in-memory checkpointer with bounded memory usage.
+
+    Environment variables:
+        CHECKPOINT_MAX_PER_THREAD: Checkpoints kept per thread and namespace
+            (default: 10, ``0`` keeps all).
+        CHECKPOINT_MEMORY_MAX_MB: Global budget for serialized checkpoint data
+            (default: 512, ``0`` disables the budget).
+        CHECKPOINT_THREAD_TTL: Seconds a thread may stay idle before it is
+            evicted (default: 3600, ``0`` disables the TTL).
+        CHECKPOINT_SPILL_PATH: SQLite file evicted threads are spilled to
+            (default: unset, evicted threads are dropped).
+        CHECKPOINT_SPILL_TTL: Seconds spilled threads are kept on disk
+            (default: 604800).
+    """
+
+    def __init__(
+        self,
+        max_checkpoints_per_thread: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        thread_ttl_seconds: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        spill_ttl_seconds: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.max_checkpoints_per_thread = (
+            max_checkpoints_per_thread
+            if max_checkpoints_per_thread is not None
+            else get_int_env("CHECKPOINT_MAX_PER_THREAD", 10)
+        )
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else get_int_env("CHECKPOINT_MEMORY_MAX_MB", 512) * 1024 * 1024
+        )
+        self.thread_ttl_seconds = (
+            thread_ttl_seconds
+            if thread_ttl_seconds is not None
+            else get_int_env("CHECKPOINT_THREAD_TTL", 3600)
+        )
+        self.spill_ttl_seconds = (
+            spill_ttl_seconds
+            if spill_ttl_seconds is not None
+            else get_int_env("CHECKPOINT_SPILL_TTL", 7 * 24 * 3600)
+        )
+        if spill_path is None:
+            spill_path = get_str_env("CHECKPOINT_SPILL_PATH")
+        self._spill = _SpillStore(spill_path) if spill_path else None
+
+        self._lock = threading.RLock()
+        # thread ID -> last access time, least recently used first
+        self._last_access: OrderedDict[str, float] = OrderedDict()
+        self._thread_bytes: Dict[str, int] = defaultdict(int)
+        self._blob_keys: Dict[str, Set[tuple]] = defaultdict(set)
+        self._write_keys: Dict[str, Set[tuple]] = defaultdict(set)
+        self.total_bytes = 0
+
+    # Bookkeeping
+
+    def _add_bytes(self, thread_id: str, size: int) -> None:
+        self._thread_bytes[thread_id] += size
+        self.total_bytes += size
+
+    def _touch(self, thread_id: str) -> None:
+        """Mark ``thread_id`` as used, restoring it from the spill file if needed."""
+        if thread_id not in self._last_access and self._spill is not None:
+            data = self._spill.pop(thread_id)
+            if data is not None:
+                self._restore_thread(thread_id, data)
+                logger.debug(f"Restored spilled checkpoints of thread {thread_id}")
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+
+    def _prune_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Drop all but the newest checkpoints of one thread namespace."""
+        limit = self.max_checkpoints_per_thread
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if limit <= 0 or len(checkpoints) <= limit:
+            return
+
+        checkpoint_ids = sorted(checkpoints.keys(), reverse=True)
+        for checkpoint_id in checkpoint_ids[limit:]:
+            self._add_bytes(
+                thread_id, -_checkpoint_size(checkpoints.pop(checkpoint_id))
+            )
+
+        # Keep the writes of parents of kept checkpoints, they carry pending sends
+        keep_writes = set(checkpoints.keys()) | {
+            parent_id for _, _, parent_id in checkpoints.values() if parent_id
+        }
+        for key in [
+            key
+            for key in self._write_keys[thread_id]
+            if key[1] == checkpoint_ns and key[2] not in keep_writes
+        ]:
+            self._write_keys[thread_id].discard(key)
+            self._add_bytes(thread_id, -_writes_size(self.writes.pop(key, {})))
+
+        referenced = set()
+        for checkpoint, _, _ in checkpoints.values():
+            channel_versions = self.serde.loads_typed(checkpoint)["channel_versions"]
+            referenced.update(channel_versions.items())
+        for key in [
+            key
+            for key in self._blob_keys[thread_id]
+            if key[1] == checkpoint_ns and (key[2], key[3]) not in referenced
+        ]:
+            self._blob_keys[thread_id].discard(key)
+            self._add_bytes(thread_id, -_blob_size(self.blobs.pop(key)))
+
+    def _remove_thread(self, thread_id: str) -> Dict[str, Any]:
+        """Remove a thread from memory and return its raw data."""
+        data = {
+            "storage": {
+                ns: dict(checkpoints)
+                for ns, checkpoints in self.storage.pop(thread_id, {}).items()
+            },
+            "writes": {
+                key: self.writes.pop(key)
+                for key in self._write_keys.pop(thread_id, set())
+                if key in self.writes
+            },
+            "blobs": {
+                key: self.blobs.pop(key)
+                for key in self._blob_keys.pop(thread_id, set())
+                if key in self.blobs
+            },
+        }
+        self.total_bytes -= self._thread_bytes.pop(thread_id, 0)
+        self._last_access.pop(thread_id, None)
+        return data
+
+    def _restore_thread(self, thread_id: str, data: Dict[str, Any]) -> None:
+        for checkpoint_ns, checkpoints in data["storage"].items():
+            self.storage[thread_id][checkpoint_ns].update(checkpoints)
+            for checkpoint in checkpoints.values():
+                self._add_bytes(thread_id, _checkpoint_size(checkpoint))
+        for key, writes in data["writes"].items():
+            self.writes[key] = writes
+            self._write_keys[thread_id].add(key)
+            self._add_bytes(thread_id, _writes_size(writes))
+        for key, blob in data["blobs"].items():
+            self.blobs[key] = blob
+            self._blob_keys[thread_id].add(key)
+            self._add_bytes(thread_id, _blob_size(blob))
+
+    def _evict_thread(self, thread_id: str, reason: str) -> None:
+        data = self._remove_thread(thread_id)
+        if self._spill is not None and data["storage"]:
+            self._spill.save(thread_id, data)
+            logger.info(f"Spilled checkpoints of thread {thread_id} ({reason})")
+        else:
+            logger.info(f"Evicted checkpoints of thread {thread_id} ({reason})")
+
+    def _enforce_limits(self, current_thread_id: str) -> None:
+        """Evict idle threads and, over the byte budget, least recently used ones."""
+        if self.thread_ttl_seconds > 0:
+            deadline = time.monotonic() - self.thread_ttl_seconds
+            for thread_id, last_access in list(self._last_access.items()):
+                if last_access >= deadline:
+                    break
+                if thread_id != current_thread_id:
+                    self._evict_thread(thread_id, "idle")
+
+        if self.max_bytes > 0:
+            for thread_id in list(self._last_access.keys()):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if thread_id != current_thread_id:
+                    self._evict_thread(thread_id, "memory budget")
+
+    def expire_spilled(self) -> int:
+        """Delete spilled threads older than the spill TTL, return their count."""
+        with self._lock:
+            if self._spill is None or self.spill_ttl_seconds <= 0:
+                return 0
+            return self._spill.expire(self.spill_ttl_seconds)
+
+    # Checkpointer API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        # Listing without a thread only covers threads held in memory
+        with self._lock:
+            if config is not None:
+                self._touch(config["configurable"]["thread_id"])
+            items = list(
+                super().list(config, filter=filter, before=before, limit=limit)
+            )
+        yield from items
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            self._touch(thread_id)
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel, version)
+                if key in self.blobs:
+                    self._add_bytes(thread_id, -_blob_size(self.blobs[key]))
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel, version)
+                self._blob_keys[thread_id].add(key)
+                self._add_bytes(thread_id, _blob_size(self.blobs[key]))
+            saved = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+            self._add_bytes(thread_id, _checkpoint_size(saved))
+
+            self._prune_thread(thread_id, checkpoint_ns)
+            self._enforce_limits(thread_id)
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            key = (thread_id, checkpoint_ns, config["configurable"]["checkpoint_id"])
+            self._touch(thread_id)
+            before = _writes_size(self.writes.get(key, {}))
+            super().put_writes(config, writes, task_id, task_path)
+            self._write_keys[thread_id].add(key)
+            self._add_bytes(thread_id, _writes_size(self.writes[key]) - before)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._remove_thread(thread_id)
+            if self._spill is not None:
+                self._spill.delete(thread_id)
+
+    def close(self) -> None:
+        """Close the spill file, if any."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
@@ -1,30 +1,48 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
 import logging
 import os
 from typing import Annotated, Literal
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.errors import GraphRecursionError
 from langgraph.types import Command, interrupt
 
 from src.agents import create_agent
+from src.agents.step_budget import (
+    COMPLETED,
+    DEADLINE,
+    RECURSION_LIMIT,
+    StepBudget,
+    StepBudgetExceeded,
+    use_step_budget,
+)
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
 from src.llms.llm import get_llm_by_type
 from src.prompts.planner_model import Plan
 from src.prompts.template import apply_prompt_template
 from src.tools import (
+    batch_crawl_tool,
     crawl_tool,
     get_retriever_tool,
     get_web_search_tool,
     python_repl_tool,
 )
+from src.tools.mcp_session_pool import get_mcp_session_pool
+from src.tools.research_registry import (
+    clear_research_registry,
+    get_research_registry,
+    use_research_registry,
+)
 from src.tools.search import LoggedTavilySearch
+from src.utils.context_compaction import compact_findings, summarize_text
 from src.utils.json_utils import repair_json_output
 
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
@@ -44,15 +62,22 @@ def handoff_to_planner(
     return
 
 
+def _get_thread_id(config: RunnableConfig) -> str | None:
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
 def background_investigation_node(state: State, config: RunnableConfig):
     logger.info("background investigation node is running.")
     configurable = Configuration.from_runnable_config(config)
     query = state.get("research_topic")
     background_investigation_results = None
+    # Record the results so research steps know about them
+    registry = get_research_registry(_get_thread_id(config))
     if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
-        searched_content = LoggedTavilySearch(
-            max_results=configurable.max_search_results
-        ).invoke(query)
+        with use_research_registry(registry):
+            searched_content = LoggedTavilySearch(
+                max_results=configurable.max_search_results
+            ).invoke(query)
         # check if the searched_content is a tuple, then we need to unpack it
         if isinstance(searched_content, tuple):
             searched_content = searched_content[0]
@@ -70,9 +95,10 @@ def background_investigation_node(state: State, config: RunnableConfig):
                 f"Tavily search returned malformed response: {searched_content}"
             )
     else:
-        background_investigation_results = get_web_search_tool(
-            configurable.max_search_results
-        ).invoke(query)
+        with use_research_registry(registry):
+            background_investigation_results = get_web_search_tool(
+                configurable.max_search_results
+            ).invoke(query)
     return {
         "background_investigation_results": json.dumps(
             background_investigation_results, ensure_ascii=False
@@ -245,6 +271,9 @@ def coordinator_node(
             "Coordinator response contains no tool calls. Terminating workflow execution."
         )
         logger.debug(f"Coordinator response: {response}")
+    if goto != "__end__":
+        # A new research run, earlier runs on this thread must not leak into it
+        clear_research_registry(_get_thread_id(config))
     messages = state.get("messages", [])
     if response.content:
         messages.append(HumanMessage(content=response.content, name="coordinator"))
@@ -254,11 +283,58 @@ def coordinator_node(
             "locale": locale,
             "research_topic": research_topic,
             "resources": configurable.resources,
+            # Counted per research run, not per thread
+            "context_tokens_saved": None,
         },
         goto=goto,
     )
 
 
+def _condense_observations(
+    observations: list[str],
+    current_plan: Plan,
+    locale: str,
+    configurable: Configuration,
+) -> list[str]:
+    """Map phase of the map-reduce reporter: condense groups of observations.
+
+    Groups are condensed concurrently into section drafts. The calls are tagged
+    ``nostream`` so only the final report is streamed to the client.
+    """
+    group_size = max(1, int(configurable.report_group_size))
+    groups = [
+        observations[i : i + group_size]
+        for i in range(0, len(observations), group_size)
+    ]
+    inputs = [
+        [
+            SystemMessage(
+                content=(
+                    "You are condensing research observations into a section draft "
+                    f"for a report on: {current_plan.title}\n\n"
+                    "Keep every fact, figure, name, date and source. List the sources "
+                    "at the end as `- [Source Title](URL)`. Do not add information "
+                    f"that is not in the observations. Write in the locale {locale}."
+                )
+            ),
+            HumanMessage(
+                content="\n\n---\n\n".join(group),
+                name="observation",
+            ),
+        ]
+        for group in groups
+    ]
+    logger.info(f"Condensing {len(observations)} observations in {len(groups)} groups")
+    responses = get_llm_by_type(AGENT_LLM_MAP["reporter"]).batch(
+        inputs,
+        config={
+            "max_concurrency": max(1, int(configurable.max_report_map_concurrency)),
+            "tags": [TAG_NOSTREAM],
+        },
+    )
+    return [response.content for response in responses]
+
+
 def reporter_node(state: State, config: RunnableConfig):
     """Reporter node that write a final report."""
     logger.info("Reporter write final report")
@@ -274,6 +350,33 @@ def reporter_node(state: State, config: RunnableConfig):
     }
     invoke_messages = apply_prompt_template("reporter", input_, configurable)
     observations = state.get("observations", [])
+    if configurable.enable_map_reduce_report and len(observations) > int(
+        configurable.report_group_size
+    ):
+        observations = _condense_observations(
+            observations,
+            current_plan,
+            state.get("locale", "en-US"),
+            configurable,
+        )
+
+    # Fit observations into the token budget, reusing the summaries cached on steps
+    step_summaries = {
+        step.execution_res: step.summary
+        for step in getattr(current_plan, "steps", [])
+        if step.execution_res and getattr(step, "summary", None)
+    }
+    compaction = compact_findings(
+        [
+            (observation, step_summaries.get(observation))
+            for observation in observations
+        ],
+        int(configurable.observations_token_budget),
+    )
+    context_tokens_saved = (
+        state.get("context_tokens_saved", 0) + compaction.saved_tokens
+    )
+    logger.info(f"Context compaction saved ~{context_tokens_saved} tokens in this run")
 
     # Add a reminder about the new report format, citation style, and table usage
     invoke_messages.append(
@@ -283,7 +386,7 @@ def reporter_node(state: State, config: RunnableConfig):
         )
     )
 
-    for observation in observations:
+    for observation in compaction.texts:
         invoke_messages.append(
             HumanMessage(
                 content=f"Below are some observations for the research task:\n\n{observation}",
@@ -294,33 +397,69 @@ def reporter_node(state: State, config: RunnableConfig):
     response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
     response_content = response.content
     logger.info(f"reporter response: {response_content}")
+    # The research run is done, a follow-up question starts a new one
+    clear_research_registry(_get_thread_id(config))
 
-    return {"final_report": response_content}
+    return {
+        "final_report": response_content,
+        "context_tokens_saved": compaction.saved_tokens,
+    }
 
 
 def research_team_node(state: State):
-    """Research team node that collaborates on tasks."""
+    """Research team node that collaborates on tasks.
+
+    When steps were executed in parallel, their results are merged back into
+    the plan and observations here, ordered by step index so the outcome does
+    not depend on which agent finished first.
+    """
     logger.info("Research team is collaborating on tasks.")
-    pass
+    pending_step_results = state.get("pending_step_results") or []
+    if not pending_step_results:
+        return None
+
+    current_plan = state.get("current_plan")
+    observations = list(state.get("observations", []))
+    for result in sorted(pending_step_results, key=lambda r: r["step_index"]):
+        step = current_plan.steps[result["step_index"]]
+        if step.execution_res:
+            continue
+        step.execution_res = result["execution_res"]
+        step.summary = result.get("summary")
+        step.end_reason = result.get("end_reason")
+        observations.append(result["execution_res"])
+    logger.info(f"Merged {len(pending_step_results)} parallel step results")
+    return {
+        "current_plan": current_plan,
+        "observations": observations,
+        "pending_step_results": None,
+    }
 
 
 async def _execute_agent_step(
-    state: State, agent, agent_name: str
+    state: State, agent, agent_name: str, config: RunnableConfig = None
 ) -> Command[Literal["research_team"]]:
     """Helper function to execute a step using the specified agent."""
+    configurable = Configuration.from_runnable_config(config)
     current_plan = state.get("current_plan")
     plan_title = current_plan.title
     observations = state.get("observations", [])
 
-    # Find the first unexecuted step
+    # A step dispatched in parallel carries its index; otherwise run the
+    # first unexecuted step
     current_step = None
     completed_steps = []
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
-            completed_steps.append(step)
+    step_index = state.get("current_step_index")
+    if step_index is not None:
+        current_step = current_plan.steps[step_index]
+        completed_steps = [step for step in current_plan.steps if step.execution_res]
+    else:
+        for step in current_plan.steps:
+            if not step.execution_res:
+                current_step = step
+                break
+            else:
+                completed_steps.append(step)
 
     if not current_step:
         logger.warning("No unexecuted step found")
@@ -328,13 +467,26 @@ async def _execute_agent_step(
 
     logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
 
-    # Format completed steps information
+    # Format completed steps information, compacted to the token budget
     completed_steps_info = ""
+    context_tokens_saved = 0
     if completed_steps:
+        compaction = compact_findings(
+            [
+                (step.execution_res, getattr(step, "summary", None))
+                for step in completed_steps
+            ],
+            int(configurable.completed_steps_token_budget),
+        )
+        context_tokens_saved = compaction.saved_tokens
+        if context_tokens_saved:
+            logger.info(
+                f"Compacted completed steps, saved ~{context_tokens_saved} tokens"
+            )
         completed_steps_info = "# Completed Research Steps\n\n"
-        for i, step in enumerate(completed_steps):
+        for i, (step, finding) in enumerate(zip(completed_steps, compaction.texts)):
             completed_steps_info += f"## Completed Step {i + 1}: {step.title}\n\n"
-            completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
+            completed_steps_info += f"<finding>\n{finding}\n</finding>\n\n"
 
     # Prepare the input for the agent with completed steps info
     agent_input = {
@@ -345,8 +497,15 @@ async def _execute_agent_step(
         ]
     }
 
+    # Searches and crawls of earlier steps are served from the thread's registry
+    registry = get_research_registry(_get_thread_id(config))
+
     # Add citation reminder for researcher agent
     if agent_name == "researcher":
+        known_sources = registry.digest() if registry is not None else ""
+        if known_sources:
+            agent_input["messages"].append(HumanMessage(content=known_sources))
+
         if state.get("resources"):
             resources_info = "**The user mentioned the following resource files:**\n\n"
             for resource in state.get("resources"):
@@ -391,16 +550,63 @@ async def _execute_agent_step(
         recursion_limit = default_recursion_limit
 
     logger.info(f"Agent input: {agent_input}")
-    result = await agent.ainvoke(
-        input=agent_input, config={"recursion_limit": recursion_limit}
-    )
+    budget = StepBudget.from_configuration(configurable)
+    try:
+        with use_research_registry(registry), use_step_budget(budget):
+            result = await asyncio.wait_for(
+                agent.ainvoke(
+                    input=agent_input, config={"recursion_limit": recursion_limit}
+                ),
+                timeout=budget.remaining(),
+            )
+        response_content = result["messages"][-1].content
+    except StepBudgetExceeded as e:
+        budget.end_reason = e.reason
+    except asyncio.TimeoutError:
+        budget.end_reason = DEADLINE
+    except GraphRecursionError:
+        budget.end_reason = RECURSION_LIMIT
+
+    if budget.end_reason != COMPLETED:
+        logger.warning(
+            f"Step '{current_step.title}' ended early ({budget.end_reason}) after "
+            f"{budget.tool_calls} tool calls and ~{budget.tokens} tokens"
+        )
+        response_content = await _finalize_agent_step(
+            agent_name, agent_input["messages"], budget
+        )
 
     # Process the result
-    response_content = result["messages"][-1].content
     logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
 
+    if step_index is not None:
+        # Parallel steps are merged by research_team_node in step order
+        logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content=response_content,
+                        name=agent_name,
+                    )
+                ],
+                "pending_step_results": [
+                    {
+                        "step_index": step_index,
+                        "execution_res": response_content,
+                        "summary": summarize_text(response_content),
+                        "end_reason": budget.end_reason,
+                    }
+                ],
+                "context_tokens_saved": context_tokens_saved,
+            },
+            goto="research_team",
+        )
+
     # Update the step with the execution result
     current_step.execution_res = response_content
+    current_step.summary = summarize_text(response_content)
+    current_step.end_reason = budget.end_reason
     logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
 
     return Command(
@@ -412,11 +618,46 @@ async def _execute_agent_step(
                 )
             ],
             "observations": observations + [response_content],
+            "context_tokens_saved": context_tokens_saved,
         },
         goto="research_team",
     )
 
 
+async def _finalize_agent_step(
+    agent_name: str, agent_input_messages: list, budget: StepBudget
+) -> str:
+    """Write the result of a step whose budget ran out from what it found."""
+    messages = budget.messages or agent_input_messages
+    messages = messages + [
+        HumanMessage(
+            content=f"The budget of this step is exhausted ({budget.end_reason}). "
+            "Do not call any more tools. Write the final result of the current "
+            "step now, using only the information gathered above, and mention "
+            "what could not be covered.",
+            name="system",
+        )
+    ]
+    llm = get_llm_by_type(AGENT_LLM_MAP[agent_name])
+    try:
+        response = await llm.ainvoke(
+            apply_prompt_template(agent_name, {"messages": messages})
+        )
+        return response.content
+    except Exception as e:
+        logger.error(f"Failed to finalize {agent_name} step: {e}")
+        findings = [
+            message.content
+            for message in messages
+            if isinstance(message, AIMessage) and message.content
+        ]
+        return (
+            findings[-1]
+            if findings
+            else (f"The step ended early ({budget.end_reason}) without findings.")
+        )
+
+
 async def _setup_and_execute_agent_step(
     state: State,
     config: RunnableConfig,
@@ -426,7 +667,7 @@ async def _setup_and_execute_agent_step(
     """Helper function to set up an agent with appropriate tools and execute a step.
 
     This function handles the common logic for both researcher_node and coder_node:
-    1. Configures MCP servers and tools based on agent type
+    1. Configures MCP servers and tools (from the shared MCP session pool) based on agent type
     2. Creates an agent with the appropriate tools or uses the default agent
     3. Executes the agent on the current step
 
@@ -460,9 +701,8 @@ async def _setup_and_execute_agent_step(
 
     # Create and execute agent with MCP tools if available
     if mcp_servers:
-        client = MultiServerMCPClient(mcp_servers)
         loaded_tools = default_tools[:]
-        all_tools = await client.get_tools()
+        all_tools = await get_mcp_session_pool().get_tools(mcp_servers)
         for tool in all_tools:
             if tool.name in enabled_tools:
                 tool.description = (
@@ -470,11 +710,11 @@ async def _setup_and_execute_agent_step(
                 )
                 loaded_tools.append(tool)
         agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
-        return await _execute_agent_step(state, agent, agent_type)
+        return await _execute_agent_step(state, agent, agent_type, config)
     else:
         # Use default tools if no MCP servers are configured
         agent = create_agent(agent_type, agent_type, default_tools, agent_type)
-        return await _execute_agent_step(state, agent, agent_type)
+        return await _execute_agent_step(state, agent, agent_type, config)
 
 
 async def researcher_node(
@@ -483,7 +723,11 @@ async def researcher_node(
     """Researcher node that do research"""
     logger.info("Researcher node is researching.")
     configurable = Configuration.from_runnable_config(config)
-    tools = [get_web_search_tool(configurable.max_search_results), crawl_tool]
+    tools = [
+        get_web_search_tool(configurable.max_search_results),
+        crawl_tool,
+        batch_crawl_tool,
+    ]
     retriever_tool = get_retriever_tool(state.get("resources", []))
     if retriever_tool:
         tools.insert(0, retriever_tool)
@@ -2,12 +2,28 @@
 # SPDX-License-Identifier: MIT
 
 
+from typing import Annotated
+
 from langgraph.graph import MessagesState
 
 from src.prompts.planner_model import Plan
 from src.rag import Resource
 
 
+def merge_step_results(left: list[dict], right: list[dict] | None) -> list[dict]:
+    """Accumulate results of steps executed in parallel; ``None`` clears them."""
+    if right is None:
+        return []
+    return (left or []) + right
+
+
+def add_or_reset(left: int, right: int | None) -> int:
+    """Sum a counter of the current research run; ``None`` resets it."""
+    if right is None:
+        return 0
+    return (left or 0) + right
+
+
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
 
@@ -22,3 +38,5 @@ class State(MessagesState):
     auto_accepted_plan: bool = False
     enable_background_investigation: bool = True
     background_investigation_results: str = None
+    pending_step_results: Annotated[list[dict], merge_step_results] = []
+    context_tokens_saved: Annotated[int, add_or_reset] = 0
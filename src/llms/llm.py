@@ -5,7 +5,6 @@ import os
 from pathlib import Path
 from typing import Any, Dict, get_args
 
-import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_deepseek import ChatDeepSeek
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -15,6 +14,7 @@ from typing import get_args
 from src.config import load_yaml_config
 from src.config.agents import LLMType
 from src.llms.providers.dashscope import ChatDashscope
+from src.utils.outbound import governed_http_clients
 
 # Cache for LLM instances
 _llm_cache: dict[LLMType, BaseChatModel] = {}
@@ -50,6 +50,17 @@ def _get_env_llm_conf(llm_type: str) -> Dict[str, Any]:
     return conf
 
 
+def _get_llm_provider(llm_type: str, conf: Dict[str, Any]) -> str:
+    """Name of the API an LLM calls, used for outbound rate limits."""
+    if "azure_endpoint" in conf or os.getenv("AZURE_OPENAI_ENDPOINT"):
+        return "azure_openai"
+    if "dashscope." in conf.get("base_url", ""):
+        return "dashscope"
+    if llm_type == "reasoning":
+        return "deepseek"
+    return "openai"
+
+
 def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> BaseChatModel:
     """Create LLM instance using configuration."""
     llm_type_config_keys = _get_llm_type_config_keys()
@@ -78,12 +89,15 @@ def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> BaseChatMod
     # Handle SSL verification settings
     verify_ssl = merged_conf.pop("verify_ssl", True)
 
-    # Create custom HTTP client if SSL verification is disabled
-    if not verify_ssl:
-        http_client = httpx.Client(verify=False)
-        http_async_client = httpx.AsyncClient(verify=False)
-        merged_conf["http_client"] = http_client
-        merged_conf["http_async_client"] = http_async_client
+    # Send requests through the outbound governor, which also disables SSL
+    # verification if configured
+    http_client, http_async_client = governed_http_clients(
+        _get_llm_provider(llm_type, merged_conf),
+        merged_conf.get("api_key"),
+        verify=verify_ssl,
+    )
+    merged_conf["http_client"] = http_client
+    merged_conf["http_async_client"] = http_async_client
 
     # Check if it's Google AI Studio platform based on configuration
     platform = merged_conf.get("platform", "").lower()
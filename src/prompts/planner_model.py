@@ -5,6 +5,7 @@ from enum import Enum
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 
 
 class StepType(str, Enum):
@@ -20,6 +21,18 @@ class Step(BaseModel):
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
+    depends_on: Optional[List[int]] = Field(
+        default=None,
+        description="Indexes of earlier steps whose results this step needs",
+    )
+    # Set while executing the plan, hidden from the planner's output schema
+    summary: SkipJsonSchema[Optional[str]] = Field(
+        default=None, description="Compact summary of the execution result"
+    )
+    end_reason: SkipJsonSchema[Optional[str]] = Field(
+        default=None,
+        description="Why the execution ended, e.g. 'completed' or 'deadline'",
+    )
 
 
 class Plan(BaseModel):
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 from src.config.tools import SELECTED_RAG_PROVIDER, RAGProvider
+from src.rag.local import LocalVectorProvider
 from src.rag.ragflow import RAGFlowProvider
 from src.rag.retriever import Retriever
 from src.rag.vikingdb_knowledge_base import VikingDBKnowledgeBaseProvider
@@ -15,6 +16,8 @@ def build_retriever() -> Retriever | None:
         return VikingDBKnowledgeBaseProvider()
     elif SELECTED_RAG_PROVIDER == RAGProvider.MILVUS.value:
         return MilvusProvider()
+    elif SELECTED_RAG_PROVIDER == RAGProvider.LOCAL.value:
+        return LocalVectorProvider()
     elif SELECTED_RAG_PROVIDER:
         raise ValueError(f"Unsupported RAG provider: {SELECTED_RAG_PROVIDER}")
     return None
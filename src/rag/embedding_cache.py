@@ -0,0 +1,272 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Persistent cache of text embeddings.
+
+Researchers ask the same questions again and again, and re-ingesting a corpus
+embeds the same unchanged chunks. Embeddings are deterministic for a given
+model, so ``CachedEmbeddings`` wraps an embedding model and looks every text up
+by (provider, model, dimension, sha256 of the normalized text) first: in a
+small in-process LRU, then in a SQLite file shared by all workers. A batch
+only sends its misses to the embedding API. Vectors are stored as compact
+float32 arrays, or float16 to halve the size at a small loss of precision.
+
+Environment variables:
+    EMBEDDING_CACHE_ENABLED: Enable the cache (default: true).
+    EMBEDDING_CACHE_PATH: SQLite file shared between processes (default:
+        unset, only the in-process LRU is used).
+    EMBEDDING_CACHE_MEMORY_SIZE: Vectors kept in the in-process LRU
+        (default: 4096).
+    EMBEDDING_CACHE_DTYPE: float32 | float16 (default: float32).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+# Keep IN (...) lookups below the SQLite host parameter limit
+_SQLITE_BATCH = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a text so trivially different spellings share an entry."""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def make_embedding_key(provider: str, model: str, dimension: int, text: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{provider.lower()}:{model}:{dimension}:{digest}"
+
+
+def _is_vector(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) and len(value) > 0
+
+
+class EmbeddingCache:
+    """In-process LRU of embeddings in front of an optional SQLite store."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_size: Optional[int] = None,
+        dtype: Optional[str] = None,
+    ):
+        self.path = path if path is not None else get_str_env("EMBEDDING_CACHE_PATH")
+        self.memory_size = (
+            memory_size
+            if memory_size is not None
+            else get_int_env("EMBEDDING_CACHE_MEMORY_SIZE", 4096)
+        )
+        self.dtype = (dtype or get_str_env("EMBEDDING_CACHE_DTYPE", "float32")).lower()
+        if self.dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding cache dtype: {self.dtype}. "
+                f"Supported dtypes: {','.join(SUPPORTED_DTYPES)}"
+            )
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    key TEXT PRIMARY KEY,
+                    dtype TEXT NOT NULL,
+                    vector BLOB NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > max(0, self.memory_size):
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for start in range(0, len(keys), _SQLITE_BATCH):
+            batch = keys[start : start + _SQLITE_BATCH]
+            rows = self._conn.execute(
+                "SELECT key, dtype, vector FROM embedding_cache WHERE key IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            for key, dtype, blob in rows:
+                # Rows keep the dtype they were written with
+                found[key] = np.frombuffer(blob, dtype=dtype)
+        return found
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return the cached vector of each key, ``None`` for misses."""
+        vectors: Dict[str, np.ndarray] = {}
+        with self._lock:
+            missing: Dict[str, None] = {}
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    vectors[key] = vector
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing[key] = None
+            if missing and self._conn is not None:
+                for key, vector in self._load(list(missing)).items():
+                    self._remember(key, vector)
+                    vectors[key] = vector
+                    self._stats["disk_hits"] += 1
+            self._stats["misses"] += sum(1 for key in missing if key not in vectors)
+        return [
+            vectors[key].astype(np.float32).tolist() if key in vectors else None
+            for key in keys
+        ]
+
+    def set_many(self, items: Sequence[Tuple[str, Sequence[float]]]) -> None:
+        """Store ``(key, vector)`` pairs."""
+        rows = []
+        with self._lock:
+            for key, vector in items:
+                array = np.asarray(vector, dtype=self.dtype)
+                self._remember(key, array)
+                rows.append((key, self.dtype, array.tobytes()))
+            if rows and self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache VALUES (?, ?, ?)", rows
+                )
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate."""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            total = hits + self._stats["misses"]
+            return {**self._stats, "hit_rate": hits / total if total else 0.0}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embedding_cache")
+                self._conn.commit()
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide embedding cache, or ``None`` if disabled."""
+    global _embedding_cache
+    if not get_bool_env("EMBEDDING_CACHE_ENABLED", True):
+        return None
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
+
+
+class CachedEmbeddings(Embeddings):
+    """Embedding model wrapper serving repeated texts from an ``EmbeddingCache``.
+
+    Args:
+        embeddings: The wrapped embedding model.
+        cache: Cache to look vectors up in and store new ones.
+        provider: Embedding provider, part of the cache key.
+        model: Embedding model name, part of the cache key.
+        dimension: Embedding dimension, part of the cache key.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        cache: EmbeddingCache,
+        provider: str,
+        model: str,
+        dimension: int,
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.provider = provider
+        self.model = model
+        self.dimension = dimension
+
+    def _lookup(
+        self, texts: List[str]
+    ) -> Tuple[List[str], List[Optional[List[float]]], Dict[str, str]]:
+        """Return the keys and cached vectors of ``texts`` and the misses."""
+        keys = [
+            make_embedding_key(self.provider, self.model, self.dimension, text)
+            for text in texts
+        ]
+        vectors = self.cache.get_many(keys)
+        # Identical texts in one batch are embedded once
+        misses: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in misses:
+                misses[key] = text
+        return keys, vectors, misses
+
+    def _fill(
+        self,
+        keys: List[str],
+        vectors: List[Optional[List[float]]],
+        misses: Dict[str, str],
+        embedded: List[List[float]],
+    ) -> List[List[float]]:
+        if len(embedded) != len(misses):
+            raise ValueError(f"Expected {len(misses)} embeddings, got {len(embedded)}")
+        computed = dict(zip(misses, embedded))
+        self.cache.set_many(
+            [(key, vector) for key, vector in computed.items() if _is_vector(vector)]
+        )
+        return [
+            vector if vector is not None else computed[key]
+            for key, vector in zip(keys, vectors)
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, vectors, misses = self._lookup(texts)
+        embedded = (
+            self.embeddings.embed_documents(list(misses.values())) if misses else []
+        )
+        return self._fill(keys, vectors, misses, embedded)
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, vectors, misses = self._lookup([text])
+        embedded = [self.embeddings.embed_query(text)] if misses else []
+        return self._fill(keys, vectors, misses, embedded)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, vectors, misses = self._lookup(texts)
+        embedded = (
+            await self.embeddings.aembed_documents(list(misses.values()))
+            if misses
+            else []
+        )
+        return self._fill(keys, vectors, misses, embedded)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, vectors, misses = self._lookup([text])
+        embedded = [await self.embeddings.aembed_query(text)] if misses else []
+        return self._fill(keys, vectors, misses, embedded)[0]
@@ -0,0 +1,234 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Lexical index and rank fusion for hybrid retrieval.
+
+Company names, case numbers and statute citations are exact-match queries that
+dense embeddings handle poorly. ``BM25Index`` is an in-process inverted index
+of the chunks stored in a vector store, scored with Okapi BM25. Hybrid
+retrieval searches it and the vector store at the same time and merges both
+rankings with ``reciprocal_rank_fusion``. Fusion only uses ranks, so the
+scores of the two searches, which are not comparable, need no calibration.
+
+Identifiers such as ``12-cv-345`` or ``U.S.C.`` are kept as one token in
+addition to their parts, and CJK text is indexed as character bigrams.
+
+With a path, the index is persisted as a JSON lines log of added and removed
+chunks, replayed when the index is opened.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.rag.ingestion import ChunkRecord
+
+logger = logging.getLogger(__name__)
+
+# Kana, CJK ideographs and Hangul
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_CJK_RE = re.compile(rf"[{_CJK}]")
+_TOKEN_RE = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+(?:[-./:][^\W_{_CJK}]+)*")
+_SEPARATOR_RE = re.compile(r"[-./:]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lowercase lexical tokens."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        token = match.group()
+        if _CJK_RE.match(token):
+            # CJK has no spaces between words, index character bigrams
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i : i + 2] for i in range(len(token) - 1))
+            continue
+        tokens.append(token)
+        parts = _SEPARATOR_RE.split(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+) -> List[Tuple[str, float]]:
+    """Merge rankings of ids with weighted reciprocal rank fusion.
+
+    Each ranking adds ``weight / (k + rank)`` to the score of its ids, with
+    ranks starting at 1.
+
+    Args:
+        rankings: Ids ordered from best to worst, one list per search.
+        weights: Weight of each ranking (default: 1 for all).
+        k: Damping constant; larger values flatten the rank differences.
+
+    Returns:
+        ``(id, score)`` pairs ordered by fused score.
+    """
+    weights = weights if weights is not None else [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """In-process inverted index of chunks scored with Okapi BM25.
+
+    Args:
+        path: JSON lines file persisting the index (default: in memory only).
+        k1: Term frequency saturation.
+        b: Document length normalization.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash
+                continue
+            if record.get("op") == "add":
+                self._index(record["row"])
+            elif record.get("op") == "remove":
+                self._unindex(record["id"])
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(
+                "".join(
+                    json.dumps(record, ensure_ascii=False) + "\n" for record in records
+                )
+            )
+
+    def _index(self, row: Dict[str, Any]) -> None:
+        chunk_id = row["id"]
+        self._unindex(chunk_id)
+        terms = Counter(tokenize(f"{row.get('title') or ''}\n{row['content']}"))
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[chunk_id] = count
+        self._rows[chunk_id] = row
+        self._lengths[chunk_id] = sum(terms.values())
+        self._total_length += self._lengths[chunk_id]
+
+    def _unindex(self, chunk_id: str) -> None:
+        row = self._rows.pop(chunk_id, None)
+        if row is None:
+            return
+        self._total_length -= self._lengths.pop(chunk_id)
+        for term in set(tokenize(f"{row.get('title') or ''}\n{row['content']}")):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, records: Iterable[ChunkRecord]) -> None:
+        """Index chunks, replacing chunks with the same id."""
+        rows = [
+            {
+                "id": record.chunk_id,
+                "doc_id": record.doc_id,
+                "title": record.title,
+                "url": record.url,
+                "content": record.content,
+            }
+            for record in records
+        ]
+        with self._lock:
+            self._append([{"op": "add", "row": row} for row in rows])
+            for row in rows:
+                self._index(row)
+
+    def remove(self, chunk_ids: Iterable[str]) -> None:
+        """Remove chunks from the index."""
+        with self._lock:
+            chunk_ids = [chunk_id for chunk_id in chunk_ids if chunk_id in self._rows]
+            self._append([{"op": "remove", "id": chunk_id} for chunk_id in chunk_ids])
+            for chunk_id in chunk_ids:
+                self._unindex(chunk_id)
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        allowed: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return the ``k`` chunks scoring highest for ``query``.
+
+        Args:
+            query: Search text.
+            k: Number of chunks to return.
+            allowed: Only consider chunks whose row it accepts.
+
+        Returns:
+            ``(row, score)`` pairs ordered by score.
+        """
+        with self._lock:
+            count = len(self._rows)
+            if not count:
+                return []
+            average_length = self._total_length / count or 1.0
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                matches = len(postings)
+                idf = math.log(1 + (count - matches + 0.5) / (matches + 0.5))
+                for chunk_id, frequency in postings.items():
+                    length = self._lengths[chunk_id] / average_length
+                    norm = 1 - self.b + self.b * length
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * (
+                        frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                    )
+            candidates = (
+                (self._rows[chunk_id], score)
+                for chunk_id, score in scores.items()
+                if allowed is None or allowed(self._rows[chunk_id])
+            )
+            return heapq.nlargest(k, candidates, key=lambda item: item[1])
+
+
+_bm25_indexes: Dict[str, BM25Index] = {}
+_bm25_indexes_lock = threading.Lock()
+
+
+def get_bm25_index(path: str) -> BM25Index:
+    """Return the process-wide lexical index persisted in ``path``."""
+    path = os.path.abspath(path)
+    with _bm25_indexes_lock:
+        if path not in _bm25_indexes:
+            _bm25_indexes[path] = BM25Index(path)
+        return _bm25_indexes[path]
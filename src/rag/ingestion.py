@@ -0,0 +1,268 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Batched ingestion of documents into a vector store.
+
+Documents are read lazily and split into chunks. Chunks are embedded in
+batches bounded by a size and a token budget (the limits of the embedding
+provider), with several batches embedded at once, and written to the store in
+large multi-row inserts. Only a bounded number of batches is in flight, so
+memory use does not grow with the size of the corpus.
+
+A document counts as ingested once all of its chunks are written. Passing an
+``IngestionProgress`` records ingested documents in a file, so an interrupted
+run can be restarted and skips what is already done.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from src.utils.context_compaction import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceDocument:
+    doc_id: str
+    content: str
+    title: str = ""
+    url: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ChunkRecord:
+    chunk_id: str
+    doc_id: str
+    content: str
+    title: str
+    url: str
+    metadata: Dict[str, Any]
+    embedding: Optional[List[float]] = None
+
+
+@dataclass
+class IngestionStats:
+    documents: int = 0
+    chunks: int = 0
+    skipped: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+class IngestionProgress:
+    """Ids of ingested documents, appended to a JSON lines file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    self._done.add(json.loads(line)["doc_id"])
+                except (ValueError, KeyError, TypeError):
+                    # A line cut short by a crash
+                    continue
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._done
+
+    def mark_done(self, doc_id: str) -> None:
+        with self._lock:
+            if doc_id in self._done:
+                return
+            self._done.add(doc_id)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"doc_id": doc_id}) + "\n")
+
+
+def split_paragraphs(content: str, chunk_size: int) -> List[str]:
+    """Split long markdown text into paragraph-based chunks of ``chunk_size``."""
+    if len(content) <= chunk_size:
+        return [content]
+
+    chunks = []
+    paragraphs = content.split("\n\n")
+    current_chunk = ""
+
+    for paragraph in paragraphs:
+        if len(current_chunk) + len(paragraph) <= chunk_size:
+            current_chunk += paragraph + "\n\n"
+        else:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = paragraph + "\n\n"
+
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def chunk_document(
+    document: SourceDocument, split: Callable[[str], List[str]]
+) -> List[ChunkRecord]:
+    """Split a document into chunks; a single chunk keeps the document id."""
+    chunks = split(document.content)
+    return [
+        ChunkRecord(
+            chunk_id=(
+                f"{document.doc_id}_chunk_{i}" if len(chunks) > 1 else document.doc_id
+            ),
+            doc_id=document.doc_id,
+            content=chunk,
+            title=document.title,
+            url=document.url,
+            metadata=document.metadata,
+        )
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def _embed_batch(
+    embed: Callable[[List[str]], List[List[float]]], batch: List[ChunkRecord]
+) -> List[ChunkRecord]:
+    embeddings = embed([record.content for record in batch])
+    if len(embeddings) != len(batch):
+        raise ValueError(f"Expected {len(batch)} embeddings, got {len(embeddings)}")
+    for record, embedding in zip(batch, embeddings):
+        record.embedding = embedding
+    return batch
+
+
+def ingest_documents(
+    documents: Iterable[SourceDocument],
+    split: Callable[[str], List[str]],
+    embed: Callable[[List[str]], List[List[float]]],
+    insert: Callable[[List[ChunkRecord]], None],
+    existing_ids: Optional[Set[str]] = None,
+    progress: Optional[IngestionProgress] = None,
+    batch_size: int = 64,
+    max_batch_tokens: int = 0,
+    max_concurrency: int = 4,
+    insert_batch_size: int = 512,
+) -> IngestionStats:
+    """Chunk, embed and insert ``documents`` in batches.
+
+    Args:
+        documents: Documents to ingest, consumed lazily.
+        split: Splits the content of a document into chunks.
+        embed: Embeds a batch of texts, one vector per text.
+        insert: Writes embedded chunks to the store in one call.
+        existing_ids: Document or chunk ids already in the store; documents
+            whose id or all of whose chunk ids are present are skipped.
+        progress: Records ingested documents for resumed runs.
+        batch_size: Chunks per embedding request.
+        max_batch_tokens: Estimated tokens per embedding request, 0 for no
+            limit.
+        max_concurrency: Embedding requests running at once.
+        insert_batch_size: Chunks per insert.
+
+    Returns:
+        Counts of ingested, skipped and failed documents.
+    """
+    existing_ids = existing_ids or set()
+    stats = IngestionStats()
+    # Chunks of each document not yet written
+    remaining: Dict[str, int] = {}
+    failed: Set[str] = set()
+    rows: List[ChunkRecord] = []
+    # Embedding requests in flight and their chunks
+    pending: Dict[Future, List[ChunkRecord]] = {}
+
+    def fail(doc_ids: Iterable[str], error: Exception) -> None:
+        for doc_id in doc_ids:
+            if doc_id not in failed:
+                logger.warning("Failed to ingest document %s: %s", doc_id, error)
+                failed.add(doc_id)
+                remaining.pop(doc_id, None)
+                stats.failed.append(doc_id)
+
+    def flush() -> None:
+        batch = [row for row in rows if row.doc_id not in failed]
+        rows.clear()
+        if not batch:
+            return
+        try:
+            insert(batch)
+        except Exception as e:
+            fail({row.doc_id for row in batch}, e)
+            return
+        stats.chunks += len(batch)
+        for row in batch:
+            if row.doc_id not in remaining:
+                continue
+            remaining[row.doc_id] -= 1
+            if remaining[row.doc_id] == 0:
+                del remaining[row.doc_id]
+                stats.documents += 1
+                if progress is not None:
+                    progress.mark_done(row.doc_id)
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            batch = pending.pop(future)
+            try:
+                rows.extend(future.result())
+            except Exception as e:
+                fail({record.doc_id for record in batch}, e)
+        if len(rows) >= insert_batch_size:
+            flush()
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, max_concurrency), thread_name_prefix="ingest"
+    ) as executor:
+
+        def submit(batch: List[ChunkRecord]) -> None:
+            # Bound the batches in flight, the corpus may not fit in memory
+            while len(pending) >= max(1, max_concurrency) * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(_embed_batch, embed, batch)] = batch
+
+        batch: List[ChunkRecord] = []
+        batch_tokens = 0
+        for document in documents:
+            if progress is not None and document.doc_id in progress:
+                stats.skipped += 1
+                continue
+            try:
+                records = chunk_document(document, split)
+            except Exception as e:
+                fail([document.doc_id], e)
+                continue
+            if not records:
+                continue
+            if document.doc_id in existing_ids or all(
+                record.chunk_id in existing_ids for record in records
+            ):
+                stats.skipped += 1
+                continue
+            remaining[document.doc_id] = remaining.get(document.doc_id, 0) + len(
+                records
+            )
+            for record in records:
+                tokens = estimate_tokens(record.content)
+                if batch and (
+                    len(batch) >= batch_size
+                    or (max_batch_tokens and batch_tokens + tokens > max_batch_tokens)
+                ):
+                    submit(batch)
+                    batch, batch_tokens = [], 0
+                batch.append(record)
+                batch_tokens += tokens
+        if batch:
+            submit(batch)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    flush()
+    return stats
@@ -0,0 +1,563 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process vector index, a RAG provider without any other service.
+
+For small and medium corpora on a single node, ``LocalVectorProvider`` keeps
+chunk embeddings in a float32 matrix file that is memory-mapped, one row per
+chunk, next to a JSON lines sidecar mapping row offsets to chunk ids, their
+document and content. Vectors are normalized when they are added, so a query
+is one matrix-vector product (cosine similarity) and ``argpartition`` picks
+the top k, without a network hop.
+
+Both files are append-only: new chunks are appended to the matrix and the
+sidecar, and deleting a document appends a tombstone to the sidecar.
+``compact`` rewrites the files without deleted rows.
+
+Environment variables:
+    LOCAL_RAG_PATH: Directory of the index (default: ./data/local_rag).
+    LOCAL_RAG_DOCS_DIR: Directory of markdown and text files kept in sync
+        with the index at startup (default: unset).
+    LOCAL_RAG_TOP_K: Chunks returned per query (default: 10).
+    LOCAL_RAG_CHUNK_SIZE: Characters per chunk (default: 4000).
+    LOCAL_RAG_EMBEDDING_PROVIDER: openai | dashscope (default: openai).
+    LOCAL_RAG_EMBEDDING_MODEL: Embedding model name.
+    LOCAL_RAG_EMBEDDING_API_KEY: Embedding API key.
+    LOCAL_RAG_EMBEDDING_BASE_URL: Embedding API base URL.
+    LOCAL_RAG_EMBEDDING_DIM: Requested embedding dimension, 0 for the model
+        default (default: 0).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from src.config.loader import get_int_env, get_str_env
+from src.config.tools import RAGProvider
+from src.rag.embedding_cache import CachedEmbeddings, get_embedding_cache
+from src.rag.ingestion import (
+    ChunkRecord,
+    IngestionProgress,
+    IngestionStats,
+    SourceDocument,
+    ingest_documents,
+    split_paragraphs,
+)
+from src.rag.milvus import DashscopeEmbeddings
+from src.rag.retriever import Chunk, Document, Resource, Retriever
+from src.utils.outbound import governed_http_clients
+
+logger = logging.getLogger(__name__)
+
+URI_PREFIX = "local://"
+
+# Files synced from LOCAL_RAG_DOCS_DIR
+_DOCUMENT_SUFFIXES = (".md", ".txt")
+
+
+def _jsonl(records: Iterable[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class LocalVectorIndex:
+    """Memory-mapped float32 matrix of chunk vectors and its row sidecar.
+
+    Args:
+        path: Directory holding ``vectors.f32`` and ``rows.jsonl``.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    ROWS_FILE = "rows.jsonl"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.path / self.VECTORS_FILE
+        self.rows_path = self.path / self.ROWS_FILE
+        self._lock = threading.RLock()
+        self.dimension: Optional[int] = None
+        # Row metadata by offset, None for rows without a sidecar entry
+        self._rows: List[Optional[Dict[str, Any]]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._doc_rows: Dict[str, List[int]] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._load()
+
+    def _load(self) -> None:
+        records = []
+        if self.rows_path.exists():
+            for line in self.rows_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+        for record in records:
+            if record.get("op") == "init":
+                self.dimension = int(record["dimension"])
+                break
+        if self.dimension is None:
+            return
+
+        # Vectors are written before their rows, extra vectors have no row
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        count = size // (4 * self.dimension)
+        self._rows = [None] * count
+        alive = np.zeros(count, dtype=bool)
+        for record in records:
+            op = record.get("op")
+            if op == "add" and record["offset"] < count:
+                offset = record["offset"]
+                self._rows[offset] = record
+                alive[offset] = True
+                self._doc_rows.setdefault(record["doc_id"], []).append(offset)
+            elif op == "delete":
+                for offset in self._doc_rows.get(record["doc_id"], []):
+                    if offset < record["before"]:
+                        alive[offset] = False
+        self._alive = alive
+        self._map(count)
+
+    def _map(self, count: int) -> None:
+        self._matrix = (
+            np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(count, self.dimension),
+            )
+            if count
+            else None
+        )
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> None:
+        with self.rows_path.open("a", encoding="utf-8") as f:
+            f.write(_jsonl(records))
+
+    @property
+    def size(self) -> int:
+        """Number of rows, including deleted ones."""
+        return len(self._rows)
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def add(self, records: List[ChunkRecord]) -> None:
+        """Append embedded chunks to the index."""
+        if not records:
+            return
+        vectors = np.asarray([record.embedding for record in records], dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Chunk embeddings must have the same dimension")
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+                self._append_records([{"op": "init", "dimension": self.dimension}])
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Expected embeddings of dimension {self.dimension}, "
+                    f"got {vectors.shape[1]}"
+                )
+            start = self.size
+            with self.vectors_path.open("ab") as f:
+                f.write(_normalize_rows(vectors).tobytes())
+            rows = [
+                {
+                    "op": "add",
+                    "offset": start + i,
+                    "id": record.chunk_id,
+                    "doc_id": record.doc_id,
+                    "title": record.title,
+                    "url": record.url,
+                    "content": record.content,
+                    "metadata": record.metadata,
+                }
+                for i, record in enumerate(records)
+            ]
+            self._append_records(rows)
+            for row in rows:
+                self._doc_rows.setdefault(row["doc_id"], []).append(row["offset"])
+            # Readers keep using the arrays they took, so replace them
+            self._rows = self._rows + rows
+            self._alive = np.concatenate([self._alive, np.ones(len(rows), dtype=bool)])
+            self._map(self.size)
+
+    def delete(self, doc_ids: Iterable[str], before: Optional[int] = None) -> int:
+        """Tombstone the rows of ``doc_ids`` added before offset ``before``.
+
+        Returns:
+            The number of rows deleted.
+        """
+        with self._lock:
+            before = self.size if before is None else before
+            alive = self._alive.copy()
+            records = []
+            for doc_id in doc_ids:
+                offsets = [
+                    offset
+                    for offset in self._doc_rows.get(doc_id, [])
+                    if offset < before and alive[offset]
+                ]
+                if offsets:
+                    alive[offsets] = False
+                    records.append({"op": "delete", "doc_id": doc_id, "before": before})
+            if not records:
+                return 0
+            self._append_records(records)
+            deleted = int(self._alive.sum() - alive.sum())
+            self._alive = alive
+            return deleted
+
+    def documents(self) -> Dict[str, Dict[str, Any]]:
+        """Return the latest row of every document that has live rows."""
+        with self._lock:
+            rows, alive = self._rows, self._alive
+            documents = {}
+            for doc_id, offsets in self._doc_rows.items():
+                live = [offset for offset in offsets if alive[offset]]
+                if live:
+                    documents[doc_id] = rows[live[-1]]
+            return documents
+
+    def search(
+        self,
+        vector: List[float],
+        k: int,
+        doc_ids: Optional[Set[str]] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return the ``k`` rows most similar to ``vector`` with their scores.
+
+        Args:
+            vector: Query embedding.
+            k: Number of rows to return.
+            doc_ids: Only consider rows of these documents.
+        """
+        with self._lock:
+            matrix, rows, mask = self._matrix, self._rows, self._alive
+            if matrix is None:
+                return []
+            if doc_ids is not None:
+                mask = mask.copy()
+                selected = np.zeros(len(mask), dtype=bool)
+                for doc_id in doc_ids:
+                    selected[self._doc_rows.get(doc_id, [])] = True
+                mask &= selected
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError(
+                f"Expected a query of dimension {self.dimension}, got {query.shape}"
+            )
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return []
+        norm = np.linalg.norm(query)
+        scores = matrix @ (query / norm if norm else query)
+        scores = np.where(mask, scores, -np.inf)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(rows[offset], float(scores[offset])) for offset in top]
+
+    def compact(self) -> None:
+        """Rewrite the index without deleted rows."""
+        with self._lock:
+            if self._matrix is None:
+                return
+            keep = np.flatnonzero(self._alive)
+            vectors_tmp = self.vectors_path.with_suffix(".tmp")
+            rows_tmp = self.rows_path.with_suffix(".tmp")
+            np.asarray(self._matrix[keep]).tofile(vectors_tmp)
+            records = [{"op": "init", "dimension": self.dimension}]
+            for new_offset, offset in enumerate(keep):
+                records.append({**self._rows[offset], "offset": new_offset})
+            rows_tmp.write_text(_jsonl(records), encoding="utf-8")
+            # Drop the map before replacing the file it maps
+            self._matrix = None
+            os.replace(vectors_tmp, self.vectors_path)
+            os.replace(rows_tmp, self.rows_path)
+            self._rows, self._doc_rows = [], {}
+            self._alive = np.zeros(0, dtype=bool)
+            self._load()
+
+
+_local_indexes: Dict[str, LocalVectorIndex] = {}
+_local_indexes_lock = threading.Lock()
+
+
+def get_local_index(path: Optional[str] = None) -> LocalVectorIndex:
+    """Return the process-wide index stored in ``path``."""
+    path = os.path.abspath(path or get_str_env("LOCAL_RAG_PATH", "./data/local_rag"))
+    with _local_indexes_lock:
+        if path not in _local_indexes:
+            _local_indexes[path] = LocalVectorIndex(path)
+        return _local_indexes[path]
+
+
+def _create_embeddings() -> Any:
+    """Create the embedding model configured by ``LOCAL_RAG_EMBEDDING_*``."""
+    provider = get_str_env("LOCAL_RAG_EMBEDDING_PROVIDER", "openai").lower()
+    model = get_str_env("LOCAL_RAG_EMBEDDING_MODEL")
+    api_key = get_str_env("LOCAL_RAG_EMBEDDING_API_KEY")
+    dimension = get_int_env("LOCAL_RAG_EMBEDDING_DIM", 0)
+    kwargs = {
+        "api_key": api_key,
+        "model": model,
+        "base_url": get_str_env("LOCAL_RAG_EMBEDDING_BASE_URL"),
+    }
+    # Embedding requests share rate limits with other calls using the key
+    http_client, http_async_client = governed_http_clients(provider, api_key)
+    if provider == "openai":
+        embeddings = OpenAIEmbeddings(
+            **kwargs,
+            dimensions=dimension or None,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+    elif provider == "dashscope":
+        embeddings = DashscopeEmbeddings(
+            **kwargs,
+            encoding_format="float",
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+    else:
+        raise ValueError(
+            f"Unsupported embedding provider: {provider}. "
+            "Supported providers: openai,dashscope"
+        )
+    cache = get_embedding_cache()
+    if cache is None:
+        return embeddings
+    return CachedEmbeddings(
+        embeddings, cache, provider=provider, model=model, dimension=dimension
+    )
+
+
+class LocalVectorProvider(Retriever):
+    """Retriever backed by an in-process ``LocalVectorIndex``.
+
+    Args:
+        index: Index to search, the one in ``LOCAL_RAG_PATH`` by default.
+        embeddings: Embedding model, configured by ``LOCAL_RAG_EMBEDDING_*``
+            by default.
+    """
+
+    def __init__(
+        self,
+        index: Optional[LocalVectorIndex] = None,
+        embeddings: Any = None,
+    ) -> None:
+        self.index = index if index is not None else get_local_index()
+        self.embeddings = embeddings if embeddings is not None else _create_embeddings()
+        self.top_k: int = get_int_env("LOCAL_RAG_TOP_K", 10)
+        self.chunk_size: int = get_int_env("LOCAL_RAG_CHUNK_SIZE", 4000)
+        # DashScope accepts at most 10 texts per embedding request
+        dashscope = get_str_env("LOCAL_RAG_EMBEDDING_PROVIDER").lower() == "dashscope"
+        self.embedding_batch_size: int = 10 if dashscope else 64
+
+    def _split_content(self, content: str) -> List[str]:
+        return split_paragraphs(content, self.chunk_size)
+
+    def add_documents(
+        self,
+        documents: Iterable[SourceDocument],
+        progress_path: Optional[str] = None,
+    ) -> IngestionStats:
+        """Chunk, embed and append documents to the index.
+
+        A document already in the index is replaced by its new chunks. A
+        document failing after some of its chunks were written is removed.
+
+        Args:
+            documents: Documents to add, consumed lazily.
+            progress_path: File recording added documents; a rerun with the
+                same file resumes where an interrupted run stopped.
+
+        Returns:
+            Counts of added, skipped and failed documents.
+        """
+        run_start = self.index.size
+        replaced: Set[str] = set()
+
+        def insert(records: List[ChunkRecord]) -> None:
+            new_doc_ids = {record.doc_id for record in records} - replaced
+            if new_doc_ids:
+                # Rows appended earlier in this run belong to the new version
+                self.index.delete(new_doc_ids, before=run_start)
+                replaced.update(new_doc_ids)
+            self.index.add(records)
+
+        stats = ingest_documents(
+            documents,
+            split=self._split_content,
+            embed=self.embeddings.embed_documents,
+            insert=insert,
+            progress=IngestionProgress(progress_path) if progress_path else None,
+            batch_size=self.embedding_batch_size,
+        )
+        # Partial rows of a failed document carry its new content hash, so
+        # sync_directory would never retry it; its old rows are gone already
+        partial = replaced.intersection(stats.failed)
+        if partial:
+            self.index.delete(partial)
+        return stats
+
+    def delete_documents(self, doc_ids: Iterable[str]) -> int:
+        """Remove documents from the index and return the rows deleted."""
+        return self.index.delete(doc_ids)
+
+    def sync_directory(self, directory: str) -> IngestionStats:
+        """Make the index match the markdown and text files of ``directory``.
+
+        New and changed files are added, unchanged ones skipped and documents
+        of files that no longer exist deleted. Files are identified by their
+        path relative to ``directory``.
+        """
+        root = Path(directory).resolve()
+        if not root.is_dir():
+            # Never treat a missing directory as every file being deleted
+            logger.warning("Local documents directory not found: %s", root)
+            return IngestionStats()
+        source = str(root)
+        indexed = {
+            doc_id: row
+            for doc_id, row in self.index.documents().items()
+            if row["metadata"].get("source_dir") == source
+        }
+        seen: Set[str] = set()
+        unchanged = 0
+
+        def changed_documents() -> Iterator[SourceDocument]:
+            nonlocal unchanged
+            for file in sorted(root.rglob("*")):
+                if not file.is_file() or file.suffix.lower() not in _DOCUMENT_SUFFIXES:
+                    continue
+                try:
+                    content = file.read_text(encoding="utf-8")
+                except Exception as e:
+                    logger.warning("Error reading %s: %s", file, e)
+                    continue
+                doc_id = file.relative_to(root).as_posix()
+                seen.add(doc_id)
+                content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                row = indexed.get(doc_id)
+                if row and row["metadata"].get("content_hash") == content_hash:
+                    unchanged += 1
+                    continue
+                yield SourceDocument(
+                    doc_id=doc_id,
+                    content=content,
+                    title=_title_from_content(content, file.stem),
+                    url=f"{URI_PREFIX}{doc_id}",
+                    metadata={"source_dir": source, "content_hash": content_hash},
+                )
+
+        stats = self.add_documents(changed_documents())
+        stats.skipped += unchanged
+        removed = set(indexed) - seen
+        if removed:
+            self.index.delete(removed)
+            logger.info("Removed %d deleted files from the local index", len(removed))
+        return stats
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        resources = []
+        for doc_id, row in self.index.documents().items():
+            title = row["title"] or doc_id
+            if query and query.lower() not in title.lower():
+                continue
+            resources.append(
+                Resource(
+                    uri=f"{URI_PREFIX}{doc_id}",
+                    title=title,
+                    description="Local vector index document",
+                )
+            )
+        return resources
+
+    async def alist_resources(self, query: str | None = None) -> list[Resource]:
+        # The index is in memory, listing it does not block
+        return self.list_resources(query)
+
+    def _selected_doc_ids(self, resources: List[Resource]) -> Optional[Set[str]]:
+        if not resources:
+            return None
+        uris = {resource.uri for resource in resources}
+        return {
+            doc_id
+            for doc_id, row in self.index.documents().items()
+            if f"{URI_PREFIX}{doc_id}" in uris or (row["url"] and row["url"] in uris)
+        }
+
+    def _search(
+        self, query_embedding: List[float], resources: List[Resource]
+    ) -> List[Document]:
+        documents: Dict[str, Document] = {}
+        for row, score in self.index.search(
+            query_embedding, self.top_k, self._selected_doc_ids(resources)
+        ):
+            doc_id = row["doc_id"]
+            if doc_id not in documents:
+                documents[doc_id] = Document(
+                    id=doc_id, url=row["url"], title=row["title"], chunks=[]
+                )
+            documents[doc_id].chunks.append(
+                Chunk(content=row["content"], similarity=score)
+            )
+        return list(documents.values())
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        try:
+            return self._search(self.embeddings.embed_query(query), resources)
+        except Exception as e:
+            raise RuntimeError(f"Failed to query the local vector index: {str(e)}")
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        # Only the embedding waits on the network, the search is in memory
+        try:
+            return self._search(await self.embeddings.aembed_query(query), resources)
+        except Exception as e:
+            raise RuntimeError(f"Failed to query the local vector index: {str(e)}")
+
+
+def _title_from_content(content: str, fallback: str) -> str:
+    for line in content.split("\n"):
+        line = line.strip()
+        if line.startswith("# "):
+            return line[2:].strip()
+    return fallback.replace("_", " ").title()
+
+
+def sync_local_documents() -> None:
+    """Sync ``LOCAL_RAG_DOCS_DIR`` into the local index if it is the provider."""
+    docs_dir = get_str_env("LOCAL_RAG_DOCS_DIR")
+    rag_provider = get_str_env("RAG_PROVIDER", "")
+    if rag_provider != RAGProvider.LOCAL.value or not docs_dir:
+        return
+    try:
+        stats = LocalVectorProvider().sync_directory(docs_dir)
+        logger.info(
+            "Synced %s into the local index: %d added, %d unchanged, %d failed",
+            docs_dir,
+            stats.documents,
+            stats.skipped,
+            len(stats.failed),
+        )
+    except Exception as e:
+        logger.error("Error syncing local documents: %s", e)
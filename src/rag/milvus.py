@@ -1,27 +1,60 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import hashlib
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from langchain_milvus.vectorstores import Milvus as LangchainMilvus
 from pymilvus import MilvusClient, CollectionSchema, FieldSchema, DataType
 from langchain_openai import OpenAIEmbeddings
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from src.rag.embedding_cache import CachedEmbeddings, get_embedding_cache
+from src.rag.hybrid import BM25Index, get_bm25_index, reciprocal_rank_fusion
+from src.rag.ingestion import (
+    ChunkRecord,
+    IngestionProgress,
+    IngestionStats,
+    SourceDocument,
+    ingest_documents,
+    split_paragraphs,
+)
 from src.rag.retriever import Chunk, Document, Resource, Retriever
-from src.config.loader import get_bool_env, get_str_env, get_int_env
+from src.config.loader import get_bool_env, get_float_env, get_int_env, get_str_env
+from src.utils.outbound import governed_http_clients
 
 logger = logging.getLogger(__name__)
 
+URI_PREFIX = "milvus://"
+
 
 class DashscopeEmbeddings:
     """OpenAI-compatible embeddings wrapper."""
 
     def __init__(self, **kwargs: Any) -> None:
         self._client: OpenAI = OpenAI(
-            api_key=kwargs.get("api_key", ""), base_url=kwargs.get("base_url", "")
+            api_key=kwargs.get("api_key", ""),
+            base_url=kwargs.get("base_url", ""),
+            http_client=kwargs.get("http_client"),
+        )
+        self._async_client: AsyncOpenAI = AsyncOpenAI(
+            api_key=kwargs.get("api_key", ""),
+            base_url=kwargs.get("base_url", ""),
+            http_client=kwargs.get("http_async_client"),
         )
         self._model: str = kwargs.get("model", "")
         self._encoding_format: str = kwargs.get("encoding_format", "float")
@@ -47,6 +80,27 @@ class DashscopeEmbeddings:
         """Return embeddings for multiple documents (LangChain interface)."""
         return self._embed(texts)
 
+    async def _aembed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Async version of ``_embed``."""
+        clean_texts = [t if isinstance(t, str) else str(t) for t in texts]
+        if not clean_texts:
+            return []
+        resp = await self._async_client.embeddings.create(
+            model=self._model,
+            input=clean_texts,
+            encoding_format=self._encoding_format,
+        )
+        return [d.embedding for d in resp.data]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Return embedding for a given text without blocking the event loop."""
+        embeddings = await self._aembed([text])
+        return embeddings[0] if embeddings else []
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Return embeddings for multiple documents (LangChain async interface)."""
+        return await self._aembed(texts)
+
 
 class MilvusRetriever(Retriever):
     """Retriever implementation backed by a Milvus vector store.
@@ -63,6 +117,26 @@ class MilvusRetriever(Retriever):
         MILVUS_EMBEDDING_DIM: Override embedding dimensionality.
         MILVUS_AUTO_LOAD_EXAMPLES: Load example *.md files if true.
         MILVUS_EXAMPLES_DIR: Folder containing example markdown files.
+        MILVUS_EMBEDDING_BATCH_SIZE: Chunks per embedding request (default:
+            256 for openai, 10 for dashscope).
+        MILVUS_EMBEDDING_BATCH_TOKENS: Estimated tokens per embedding request
+            (default: 200000).
+        MILVUS_INGEST_CONCURRENCY: Embedding requests running at once during
+            ingestion (default: 4).
+        MILVUS_INSERT_BATCH_SIZE: Rows per Milvus insert (default: 512).
+        MILVUS_HYBRID_SEARCH: Also search a BM25 index of the chunks and fuse
+            both rankings (default: false).
+        MILVUS_BM25_PATH: File persisting the BM25 index (default:
+            ./data/bm25/<collection>.jsonl).
+        MILVUS_HYBRID_VECTOR_WEIGHT: Fusion weight of the vector ranking
+            (default: 1.0).
+        MILVUS_HYBRID_LEXICAL_WEIGHT: Fusion weight of the BM25 ranking
+            (default: 1.0).
+        MILVUS_HYBRID_RRF_K: Reciprocal rank fusion constant (default: 60).
+        MILVUS_HYBRID_CANDIDATES: Chunks each search contributes to the fusion
+            (default: twice the top k).
+    Embeddings of queries and chunks are served from the embedding cache when
+    it is enabled, see src/rag/embedding_cache.py.
     """
 
     def __init__(self) -> None:
@@ -86,6 +160,7 @@ class MilvusRetriever(Retriever):
 
         # --- Embedding configuration ---
         self.embedding_model = get_str_env("MILVUS_EMBEDDING_MODEL")
+        self.embedding_model_name: str = self.embedding_model
         self.embedding_api_key = get_str_env("MILVUS_EMBEDDING_API_KEY")
         self.embedding_base_url = get_str_env("MILVUS_EMBEDDING_BASE_URL")
         self.embedding_dim: int = self._get_embedding_dimension(self.embedding_model)
@@ -97,8 +172,30 @@ class MilvusRetriever(Retriever):
         # chunk size
         self.chunk_size: int = get_int_env("MILVUS_CHUNK_SIZE", 4000)
 
+        # --- Hybrid search configuration ---
+        self.hybrid_search: bool = get_bool_env("MILVUS_HYBRID_SEARCH", False)
+        self.hybrid_vector_weight: float = get_float_env(
+            "MILVUS_HYBRID_VECTOR_WEIGHT", 1.0
+        )
+        self.hybrid_lexical_weight: float = get_float_env(
+            "MILVUS_HYBRID_LEXICAL_WEIGHT", 1.0
+        )
+        self.hybrid_rrf_k: int = get_int_env("MILVUS_HYBRID_RRF_K", 60)
+        self.hybrid_candidates: int = get_int_env("MILVUS_HYBRID_CANDIDATES", 0)
+        self.lexical_index: Optional[BM25Index] = (
+            get_bm25_index(
+                get_str_env(
+                    "MILVUS_BM25_PATH", f"./data/bm25/{self.collection_name}.jsonl"
+                )
+            )
+            if self.hybrid_search
+            else None
+        )
+        self._lexical_index_checked = False
+
         # --- Embedding model initialization ---
         self._init_embedding_model()
+        self.embedding_cache = get_embedding_cache()
 
         # Client (MilvusClient or LangchainMilvus) created lazily
         self.client: Any = None
@@ -112,15 +209,36 @@ class MilvusRetriever(Retriever):
             "encoding_format": "float",
             "dimensions": self.embedding_dim,
         }
-        if self.embedding_provider.lower() == "openai":
-            self.embedding_model = OpenAIEmbeddings(**kwargs)
-        elif self.embedding_provider.lower() == "dashscope":
-            self.embedding_model = DashscopeEmbeddings(**kwargs)
-        else:
+        provider = self.embedding_provider.lower()
+        if provider not in ("openai", "dashscope"):
             raise ValueError(
                 f"Unsupported embedding provider: {self.embedding_provider}. "
                 "Supported providers: openai,dashscope"
             )
+        # Embedding requests share rate limits with other calls using the key
+        http_client, http_async_client = governed_http_clients(
+            provider, self.embedding_api_key
+        )
+        if provider == "openai":
+            self.embedding_model = OpenAIEmbeddings(
+                **kwargs, http_client=http_client, http_async_client=http_async_client
+            )
+        else:
+            self.embedding_model = DashscopeEmbeddings(
+                **kwargs, http_client=http_client, http_async_client=http_async_client
+            )
+
+    def _embeddings(self) -> Any:
+        """Return the embedding model, behind the embedding cache if enabled."""
+        if self.embedding_cache is None:
+            return self.embedding_model
+        return CachedEmbeddings(
+            self.embedding_model,
+            self.embedding_cache,
+            provider=self.embedding_provider,
+            model=self.embedding_model_name,
+            dimension=self.embedding_dim,
+        )
 
     def _get_embedding_dimension(self, model_name: str) -> int:
         """Return embedding dimension for the supplied model name."""
@@ -224,47 +342,109 @@ class MilvusRetriever(Retriever):
             if not md_files:
                 logger.info("No markdown files found in examples directory")
                 return
-            # Check if files are already loaded
-            existing_docs = self._get_existing_document_ids()
-            loaded_count = 0
-            for md_file in md_files:
-                doc_id = self._generate_doc_id(md_file)
-
-                # Skip if already loaded
-                if doc_id in existing_docs:
-                    continue
-                try:
-                    # Read and process the file
-                    content = md_file.read_text(encoding="utf-8")
-                    title = self._extract_title_from_markdown(content, md_file.name)
-
-                    # Split content into chunks if it's too long
-                    chunks = self._split_content(content)
-
-                    # Insert each chunk
-                    for i, chunk in enumerate(chunks):
-                        chunk_id = f"{doc_id}_chunk_{i}" if len(chunks) > 1 else doc_id
-                        self._insert_document_chunk(
-                            doc_id=chunk_id,
-                            content=chunk,
-                            title=title,
-                            url=f"milvus://{self.collection_name}/{md_file.name}",
-                            metadata={"source": "examples", "file": md_file.name},
-                        )
-
-                    loaded_count += 1
-                    logger.debug("Loaded example markdown: %s", md_file.name)
-
-                except Exception as e:
-                    logger.warning("Error loading %s: %s", md_file.name, e)
 
+            stats = self.ingest_documents(self._example_documents(md_files))
             logger.info(
-                "Successfully loaded %d example files into Milvus", loaded_count
+                "Successfully loaded %d example files into Milvus",
+                stats.documents,
             )
 
         except Exception as e:
             logger.error("Error loading example files: %s", e)
 
+    def _example_documents(self, md_files: List[Path]) -> Iterator[SourceDocument]:
+        """Read example markdown files lazily as ``SourceDocument`` objects."""
+        for md_file in md_files:
+            try:
+                content = md_file.read_text(encoding="utf-8")
+            except Exception as e:
+                logger.warning("Error loading %s: %s", md_file.name, e)
+                continue
+            yield SourceDocument(
+                doc_id=self._generate_doc_id(md_file),
+                content=content,
+                title=self._extract_title_from_markdown(content, md_file.name),
+                url=f"milvus://{self.collection_name}/{md_file.name}",
+                metadata={"source": "examples", "file": md_file.name},
+            )
+
+    def ingest_documents(
+        self,
+        documents: Iterable[SourceDocument],
+        progress_path: Optional[str] = None,
+    ) -> IngestionStats:
+        """Chunk, embed and insert documents in batches.
+
+        Chunks are embedded in batches sized to the embedding provider's
+        limits, several batches at once, and written with multi-row inserts.
+        Documents already in the collection are skipped.
+
+        Args:
+            documents: Documents to ingest, consumed lazily.
+            progress_path: File recording ingested documents; a rerun with
+                the same file resumes where an interrupted run stopped.
+
+        Returns:
+            Counts of ingested, skipped and failed documents.
+        """
+        if not self.client:
+            self._connect()
+        # DashScope accepts at most 10 texts per embedding request
+        dashscope = self.embedding_provider.lower() == "dashscope"
+        default_batch_size = 10 if dashscope else 256
+        return ingest_documents(
+            documents,
+            split=self._split_content,
+            embed=self._embed_batch,
+            insert=self._insert_chunk_records,
+            existing_ids=self._get_existing_document_ids(),
+            progress=IngestionProgress(progress_path) if progress_path else None,
+            batch_size=get_int_env("MILVUS_EMBEDDING_BATCH_SIZE", default_batch_size),
+            max_batch_tokens=get_int_env("MILVUS_EMBEDDING_BATCH_TOKENS", 200000),
+            max_concurrency=get_int_env("MILVUS_INGEST_CONCURRENCY", 4),
+            insert_batch_size=get_int_env("MILVUS_INSERT_BATCH_SIZE", 512),
+        )
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Return embeddings for a batch of chunks with one request."""
+        return self._embeddings().embed_documents([text.strip() for text in texts])
+
+    def _insert_chunk_records(self, records: List[ChunkRecord]) -> None:
+        """Write embedded chunks to Milvus with one multi-row insert."""
+        if self._is_milvus_lite():
+            # Upsert so chunks of a resumed document are not duplicated
+            self.client.upsert(
+                collection_name=self.collection_name,
+                data=[
+                    {
+                        self.id_field: record.chunk_id,
+                        self.vector_field: record.embedding,
+                        self.content_field: record.content,
+                        self.title_field: record.title,
+                        self.url_field: record.url,
+                        **record.metadata,
+                    }
+                    for record in records
+                ],
+            )
+        else:
+            self.client.add_embeddings(
+                texts=[record.content for record in records],
+                embeddings=[record.embedding for record in records],
+                metadatas=[
+                    {
+                        self.id_field: record.chunk_id,
+                        self.title_field: record.title,
+                        self.url_field: record.url,
+                        **record.metadata,
+                    }
+                    for record in records
+                ],
+                batch_size=len(records),
+            )
+        if self.lexical_index is not None:
+            self.lexical_index.add(records)
+
     def _generate_doc_id(self, file_path: Path) -> str:
         """Return a stable identifier derived from name, size & mtime hash."""
         # Use file name and size for a simple but effective ID
@@ -287,25 +467,7 @@ class MilvusRetriever(Retriever):
 
     def _split_content(self, content: str) -> List[str]:
         """Split long markdown text into paragraph-based chunks."""
-        if len(content) <= self.chunk_size:
-            return [content]
-
-        chunks = []
-        paragraphs = content.split("\n\n")
-        current_chunk = ""
-
-        for paragraph in paragraphs:
-            if len(current_chunk) + len(paragraph) <= self.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-
-        return chunks
+        return split_paragraphs(content, self.chunk_size)
 
     def _get_existing_document_ids(self) -> Set[str]:
         """Return set of existing document identifiers in the collection."""
@@ -363,6 +525,19 @@ class MilvusRetriever(Retriever):
                         }
                     ],
                 )
+            if self.lexical_index is not None:
+                self.lexical_index.add(
+                    [
+                        ChunkRecord(
+                            chunk_id=doc_id,
+                            doc_id=doc_id,
+                            content=content,
+                            title=title,
+                            url=url,
+                            metadata=metadata,
+                        )
+                    ]
+                )
         except Exception as e:
             raise RuntimeError(f"Failed to insert document chunk: {str(e)}")
 
@@ -387,7 +562,7 @@ class MilvusRetriever(Retriever):
 
                 # Create LangChain client (it will handle collection creation automatically)
                 self.client = LangchainMilvus(
-                    embedding_function=self.embedding_model,
+                    embedding_function=self._embeddings(),
                     collection_name=self.collection_name,
                     connection_args=connection_args,
                     # optional (if collection already exists with different schema, be careful)
@@ -416,7 +591,7 @@ class MilvusRetriever(Retriever):
             if not text.strip():
                 raise ValueError("Text cannot be empty or only whitespace")
             # Unified embedding interface (OpenAIEmbeddings or DashscopeEmbeddings wrapper)
-            embeddings = self.embedding_model.embed_query(text=text.strip())
+            embeddings = self._embeddings().embed_query(text.strip())
 
             # Validate output
             if not isinstance(embeddings, list) or not embeddings:
@@ -478,24 +653,7 @@ class MilvusRetriever(Retriever):
                 docs: Iterable[Any] = self.client.similarity_search(
                     query, k=100, expr="source == 'examples'"  # Limit to 100 results
                 )
-                for d in docs:
-                    meta = getattr(d, "metadata", {}) or {}
-                    # check if the resource is in the list of resources
-                    if resources and any(
-                        r.uri == meta.get(self.url_field, "")
-                        or r.uri == f"milvus://{meta.get(self.id_field,'')}"
-                        for r in resources
-                    ):
-                        continue
-                    resources.append(
-                        Resource(
-                            uri=meta.get(self.url_field, "")
-                            or f"milvus://{meta.get(self.id_field,'')}",
-                            title=meta.get(self.title_field, "")
-                            or meta.get(self.id_field, "Unnamed"),
-                            description="Stored Milvus document",
-                        )
-                    )
+                resources = self._resources_from_docs(docs)
                 logger.info(
                     "Succeed listed %d resources from Milvus collection: %s",
                     len(resources),
@@ -509,6 +667,60 @@ class MilvusRetriever(Retriever):
             return self._list_local_markdown_resources()
         return resources
 
+    async def alist_resources(self, query: Optional[str] = None) -> List[Resource]:
+        """Async version of ``list_resources``.
+
+        Milvus Lite has no async client, so it is listed in a worker thread.
+        """
+        if self._is_milvus_lite():
+            return await super().alist_resources(query)
+
+        if not self.client:
+            try:
+                await asyncio.to_thread(self._connect)
+            except Exception:
+                return self._list_local_markdown_resources()
+
+        try:
+            docs = await self.client.asimilarity_search(
+                query, k=100, expr="source == 'examples'"
+            )
+            resources = self._resources_from_docs(docs)
+            logger.info(
+                "Succeed listed %d resources from Milvus collection: %s",
+                len(resources),
+                self.collection_name,
+            )
+            return resources
+        except Exception:
+            logger.warning(
+                "Failed to query Milvus for resources, falling back to local examples."
+            )
+            return self._list_local_markdown_resources()
+
+    def _resources_from_docs(self, docs: Iterable[Any]) -> List[Resource]:
+        """Convert LangChain documents into ``Resource`` objects, without duplicates."""
+        resources: List[Resource] = []
+        for d in docs:
+            meta = getattr(d, "metadata", {}) or {}
+            # check if the resource is in the list of resources
+            if resources and any(
+                r.uri == meta.get(self.url_field, "")
+                or r.uri == f"milvus://{meta.get(self.id_field,'')}"
+                for r in resources
+            ):
+                continue
+            resources.append(
+                Resource(
+                    uri=meta.get(self.url_field, "")
+                    or f"milvus://{meta.get(self.id_field,'')}",
+                    title=meta.get(self.title_field, "")
+                    or meta.get(self.id_field, "Unnamed"),
+                    description="Stored Milvus document",
+                )
+            )
+        return resources
+
     def _list_local_markdown_resources(self) -> List[Resource]:
         """Return local example markdown files as ``Resource`` objects.
 
@@ -538,16 +750,45 @@ class MilvusRetriever(Retriever):
                 continue
         return resources
 
+    def _resource_filter(
+        self, resources: List[Resource]
+    ) -> Tuple[str, Set[str], Set[str]]:
+        """Translate ``resources`` into a Milvus boolean expression.
+
+        A resource selects the chunks whose url is its URI, or whose id is its
+        URI with or without the ``milvus://`` prefix.
+
+        Returns:
+            The expression ("" without resources) and the selected urls and ids.
+        """
+        urls: Set[str] = set()
+        ids: Set[str] = set()
+        for resource in resources:
+            urls.add(resource.uri)
+            ids.add(resource.uri)
+            if resource.uri.startswith(URI_PREFIX):
+                ids.add(resource.uri[len(URI_PREFIX) :])
+        if not resources:
+            return "", urls, ids
+        expr = (
+            f"{self.url_field} in {json.dumps(sorted(urls), ensure_ascii=False)}"
+            f" or {self.id_field} in {json.dumps(sorted(ids), ensure_ascii=False)}"
+        )
+        return expr, urls, ids
+
     def query_relevant_documents(
         self, query: str, resources: Optional[List[Resource]] = None
     ) -> List[Document]:
         """Perform vector similarity search returning rich ``Document`` objects.
 
+        In hybrid mode the lexical index is searched at the same time and both
+        rankings are fused.
+
         Args:
             query: Natural language query string.
             resources: Optional subset filter of ``Resource`` objects; if
-                provided, only documents whose id/url appear in the list will
-                be included.
+                provided, only documents whose id/url appear in the list are
+                searched (the filter is part of the Milvus search).
 
         Returns:
             List of aggregated ``Document`` objects; each contains one or more
@@ -556,105 +797,230 @@ class MilvusRetriever(Retriever):
         Raises:
             RuntimeError: On underlying search errors.
         """
-        resources = resources or []
+        expr, urls, ids = self._resource_filter(resources or [])
         try:
             if not self.client:
                 self._connect()
+            if self.lexical_index is None:
+                hits = self._vector_search(query, expr, self.top_k)
+            else:
+                self._ensure_lexical_index()
+                limit = self._hybrid_candidates()
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    lexical = executor.submit(
+                        self._lexical_search, query, urls, ids, limit
+                    )
+                    vector_hits = self._vector_search(query, expr, limit)
+                    hits = self._fuse(vector_hits, lexical.result())
+            return self._documents_from_hits(hits, expr, urls, ids)
+        except Exception as e:
+            raise RuntimeError(f"Failed to query documents from Milvus: {str(e)}")
 
-            # Get embeddings for the query
-            query_embedding = self._get_embedding(query)
+    async def aquery_relevant_documents(
+        self, query: str, resources: Optional[List[Resource]] = None
+    ) -> List[Document]:
+        """Async version of ``query_relevant_documents``.
 
-            # For Milvus Lite, use MilvusClient directly
-            if self._is_milvus_lite():
-                # Perform vector search
-                search_results = self.client.search(
-                    collection_name=self.collection_name,
-                    data=[query_embedding],
-                    anns_field=self.vector_field,
-                    param={"metric_type": "IP", "params": {"nprobe": 10}},
-                    limit=self.top_k,
-                    output_fields=[
-                        self.id_field,
-                        self.content_field,
-                        self.title_field,
-                        self.url_field,
-                    ],
+        Server deployments are searched with the async Milvus client and async
+        embeddings. Milvus Lite has no async client, so it is searched in a
+        worker thread.
+        """
+        if self._is_milvus_lite():
+            return await super().aquery_relevant_documents(query, resources)
+
+        expr, urls, ids = self._resource_filter(resources or [])
+        try:
+            if not self.client:
+                await asyncio.to_thread(self._connect)
+            if self.lexical_index is None:
+                search_results = await self.client.asimilarity_search_with_score(
+                    query=query, k=self.top_k, expr=expr or None
+                )
+                hits = self._hits_from_search_results(search_results)
+            else:
+                limit = self._hybrid_candidates()
+                search_results, lexical_hits = await asyncio.gather(
+                    self.client.asimilarity_search_with_score(
+                        query=query, k=limit, expr=expr or None
+                    ),
+                    asyncio.to_thread(self._lexical_search, query, urls, ids, limit),
+                )
+                hits = self._fuse(
+                    self._hits_from_search_results(search_results), lexical_hits
                 )
+            return self._documents_from_hits(hits, expr, urls, ids)
+        except Exception as e:
+            raise RuntimeError(f"Failed to query documents from Milvus: {str(e)}")
 
-                documents = {}
-
-                for result_list in search_results:
-                    for result in result_list:
-                        entity = result.get("entity", {})
-                        doc_id = entity.get(self.id_field, "")
-                        content = entity.get(self.content_field, "")
-                        title = entity.get(self.title_field, "")
-                        url = entity.get(self.url_field, "")
-                        score = result.get("distance", 0.0)
-
-                        # Skip if resource filtering is requested and this doc is not in the list
-                        if resources:
-                            doc_in_resources = False
-                            for resource in resources:
-                                if (
-                                    url and url in resource.uri
-                                ) or doc_id in resource.uri:
-                                    doc_in_resources = True
-                                    break
-                            if not doc_in_resources:
-                                continue
-
-                        # Create or update document
-                        if doc_id not in documents:
-                            documents[doc_id] = Document(
-                                id=doc_id, url=url, title=title, chunks=[]
-                            )
-
-                        # Add chunk to document
-                        chunk = Chunk(content=content, similarity=score)
-                        documents[doc_id].chunks.append(chunk)
-
-                return list(documents.values())
+    def _vector_search(self, query: str, expr: str, limit: int) -> List[Dict[str, Any]]:
+        """Return the ``limit`` chunks nearest to ``query``, best first."""
+        # For Milvus Lite, use MilvusClient directly
+        if self._is_milvus_lite():
+            # Perform vector search, only over the selected resources
+            search_results = self.client.search(
+                collection_name=self.collection_name,
+                data=[self._get_embedding(query)],
+                anns_field=self.vector_field,
+                param={"metric_type": "IP", "params": {"nprobe": 10}},
+                limit=limit,
+                output_fields=[
+                    self.id_field,
+                    self.content_field,
+                    self.title_field,
+                    self.url_field,
+                ],
+                filter=expr,
+            )
+            hits = []
+            for result_list in search_results:
+                for result in result_list:
+                    entity = result.get("entity", {})
+                    hits.append(
+                        {
+                            "id": entity.get(self.id_field, ""),
+                            "title": entity.get(self.title_field, ""),
+                            "url": entity.get(self.url_field, ""),
+                            "content": entity.get(self.content_field, ""),
+                            "score": result.get("distance", 0.0),
+                        }
+                    )
+            return hits
 
-            else:
-                # For LangChain Milvus, use similarity search
-                search_results = self.client.similarity_search_with_score(
-                    query=query, k=self.top_k
+        # For LangChain Milvus, use similarity search
+        search_results = self.client.similarity_search_with_score(
+            query=query, k=limit, expr=expr or None
+        )
+        return self._hits_from_search_results(search_results)
+
+    def _hits_from_search_results(
+        self, search_results: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        """Convert LangChain ``(doc, score)`` results into chunk hits."""
+        hits = []
+        for doc, score in search_results:
+            metadata = doc.metadata or {}
+            hits.append(
+                {
+                    "id": metadata.get(self.id_field, ""),
+                    "title": metadata.get(self.title_field, ""),
+                    "url": metadata.get(self.url_field, ""),
+                    "content": doc.page_content,
+                    "score": score,
+                }
+            )
+        return hits
+
+    def _hybrid_candidates(self) -> int:
+        """Chunks each search contributes to the fusion in hybrid mode."""
+        return max(self.top_k, self.hybrid_candidates or 2 * self.top_k)
+
+    def _lexical_search(
+        self, query: str, urls: Set[str], ids: Set[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Return the ``limit`` chunks of the selected resources whose words
+        best match ``query``."""
+
+        def selected(row: Dict[str, Any]) -> bool:
+            return row["url"] in urls or row["id"] in ids
+
+        return [
+            {**row, "score": score}
+            for row, score in self.lexical_index.search(
+                query, limit, selected if urls or ids else None
+            )
+        ]
+
+    def _fuse(
+        self, vector_hits: List[Dict[str, Any]], lexical_hits: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Merge both rankings with reciprocal rank fusion, keeping ``top_k``.
+
+        The score of a fused hit is its fusion score.
+        """
+        hits_by_id = {hit["id"]: hit for hit in lexical_hits}
+        hits_by_id.update({hit["id"]: hit for hit in vector_hits})
+        fused = reciprocal_rank_fusion(
+            [[hit["id"] for hit in vector_hits], [hit["id"] for hit in lexical_hits]],
+            weights=[self.hybrid_vector_weight, self.hybrid_lexical_weight],
+            k=self.hybrid_rrf_k,
+        )
+        return [
+            {**hits_by_id[chunk_id], "score": score}
+            for chunk_id, score in fused[: self.top_k]
+        ]
+
+    def _documents_from_hits(
+        self, hits: Iterable[Dict[str, Any]], expr: str, urls: Set[str], ids: Set[str]
+    ) -> List[Document]:
+        """Aggregate chunk hits into ``Document`` objects."""
+        documents = {}
+
+        for hit in hits:
+            doc_id = hit["id"]
+            url = hit["url"]
+
+            # The search is already filtered, this only guards older servers
+            if expr and url not in urls and doc_id not in ids:
+                continue
+
+            # Create or update document
+            if doc_id not in documents:
+                documents[doc_id] = Document(
+                    id=doc_id, url=url, title=hit["title"], chunks=[]
                 )
 
-                documents = {}
-
-                for doc, score in search_results:
-                    metadata = doc.metadata or {}
-                    doc_id = metadata.get(self.id_field, "")
-                    title = metadata.get(self.title_field, "")
-                    url = metadata.get(self.url_field, "")
-                    content = doc.page_content
-
-                    # Skip if resource filtering is requested and this doc is not in the list
-                    if resources:
-                        doc_in_resources = False
-                        for resource in resources:
-                            if (url and url in resource.uri) or doc_id in resource.uri:
-                                doc_in_resources = True
-                                break
-                        if not doc_in_resources:
-                            continue
-
-                    # Create or update document
-                    if doc_id not in documents:
-                        documents[doc_id] = Document(
-                            id=doc_id, url=url, title=title, chunks=[]
-                        )
+            # Add chunk to document
+            chunk = Chunk(content=hit["content"], similarity=hit["score"])
+            documents[doc_id].chunks.append(chunk)
 
-                    # Add chunk to document
-                    chunk = Chunk(content=content, similarity=score)
-                    documents[doc_id].chunks.append(chunk)
+        return list(documents.values())
 
-                return list(documents.values())
+    def _documents_from_search_results(
+        self, search_results: Iterable[Any], resources: List[Resource]
+    ) -> List[Document]:
+        """Aggregate LangChain ``(doc, score)`` results into ``Document`` objects."""
+        return self._documents_from_hits(
+            self._hits_from_search_results(search_results),
+            *self._resource_filter(resources),
+        )
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to query documents from Milvus: {str(e)}")
+    def _ensure_lexical_index(self) -> None:
+        """Fill an empty lexical index from the chunks already in Milvus Lite.
+
+        Chunks are added to the lexical index as they are ingested; this covers
+        collections ingested before hybrid search was enabled. LangChain Milvus
+        offers no way to list all chunks, so remote collections are covered by
+        ingestion only.
+        """
+        if self._lexical_index_checked or len(self.lexical_index) > 0:
+            return
+        self._lexical_index_checked = True
+        if not self._is_milvus_lite():
+            return
+        results = self.client.query(
+            collection_name=self.collection_name,
+            filter="",
+            output_fields=[
+                self.id_field,
+                self.content_field,
+                self.title_field,
+                self.url_field,
+            ],
+            limit=10000,
+        )
+        self.lexical_index.add(
+            ChunkRecord(
+                chunk_id=result[self.id_field],
+                doc_id=result[self.id_field],
+                content=result.get(self.content_field, ""),
+                title=result.get(self.title_field, ""),
+                url=result.get(self.url_field, ""),
+                metadata={},
+            )
+            for result in results
+            if result.get(self.id_field)
+        )
+        logger.info("Built the lexical index from %d Milvus chunks", len(results))
 
     def create_collection(self) -> None:
         """Public hook ensuring collection exists (explicit initialization)."""
@@ -699,6 +1065,8 @@ class MilvusRetriever(Retriever):
                     self.client.delete(
                         collection_name=self.collection_name, ids=doc_ids
                     )
+                    if self.lexical_index is not None:
+                        self.lexical_index.remove(doc_ids)
                     logger.info("Cleared %d existing example documents", len(doc_ids))
             else:
                 # For LangChain Milvus, we can't easily delete by metadata
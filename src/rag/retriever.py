@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import abc
+import asyncio
 
 from pydantic import BaseModel, Field
 
@@ -62,6 +63,9 @@ class Resource(BaseModel):
 class Retriever(abc.ABC):
     """
     Define a RAG provider, which can be used to query documents and resources.
+
+    The async methods run the sync ones in a worker thread unless a provider
+    implements them natively, so they never block the event loop.
     """
 
     @abc.abstractmethod
@@ -79,3 +83,17 @@ class Retriever(abc.ABC):
         Query relevant documents from the resources.
         """
         pass
+
+    async def alist_resources(self, query: str | None = None) -> list[Resource]:
+        """
+        List resources from the rag provider without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.list_resources, query)
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        Query relevant documents without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.query_relevant_documents, query, resources)
@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -12,6 +13,11 @@ from urllib.parse import urlparse
 import requests
 
 from src.rag.retriever import Chunk, Document, Resource, Retriever
+from src.utils.outbound import get_governed_async_client
+
+PROVIDER = "vikingdb_knowledge_base"
+SEARCH_PATH = "/api/knowledge/collection/search_knowledge"
+LIST_PATH = "/api/knowledge/collection/list"
 
 
 class VikingDBKnowledgeBaseProvider(Retriever):
@@ -151,9 +157,9 @@ class VikingDBKnowledgeBaseProvider(Retriever):
 
         return headers
 
-    def _make_signed_request(
+    def _sign_request(
         self, method: str, path: str, params: dict = None, data: dict = None
-    ):
+    ) -> tuple[str, dict, dict, bytes]:
         if data is None:
             payload = b""
         else:
@@ -165,6 +171,14 @@ class VikingDBKnowledgeBaseProvider(Retriever):
         url = f"https://{self.api_url}{path}"
         headers = {}
         signed_headers = self._create_signature(method, path, params, headers, payload)
+        return url, signed_headers, params, payload
+
+    def _make_signed_request(
+        self, method: str, path: str, params: dict = None, data: dict = None
+    ):
+        url, signed_headers, params, payload = self._sign_request(
+            method, path, params, data
+        )
         try:
             response = requests.request(
                 method=method,
@@ -178,6 +192,85 @@ class VikingDBKnowledgeBaseProvider(Retriever):
         except Exception as e:
             raise ValueError(f"Request failed: {e}")
 
+    async def _amake_signed_request(
+        self, method: str, path: str, params: dict = None, data: dict = None
+    ):
+        url, signed_headers, params, payload = self._sign_request(
+            method, path, params, data
+        )
+        try:
+            return await get_governed_async_client(PROVIDER, self.api_ak).request(
+                method=method,
+                url=url,
+                headers=signed_headers,
+                params=params,
+                content=payload if payload else None,
+                timeout=30,
+            )
+        except Exception as e:
+            raise ValueError(f"Request failed: {e}")
+
+    def _parse_json(self, response) -> dict:
+        try:
+            return response.json()
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON response: {e}")
+
+    def _search_request(self, query: str, resource: Resource) -> dict:
+        resource_id, document_id = parse_uri(resource.uri)
+        request_params = {
+            "resource_id": resource_id,
+            "query": query,
+            "limit": self.retrieval_size,
+            "dense_weight": 0.5,
+            "pre_processing": {
+                "need_instruction": True,
+                "rewrite": False,
+                "return_token_usage": True,
+            },
+            "post_processing": {
+                "rerank_switch": True,
+                "chunk_diffusion_count": 0,
+                "chunk_group": True,
+                "get_attachment_link": True,
+            },
+        }
+        if document_id:
+            doc_filter = {"op": "must", "field": "doc_id", "conds": [document_id]}
+            query_param = {"doc_filter": doc_filter}
+            request_params["query_param"] = query_param
+        return request_params
+
+    def _add_documents(self, response_data: dict, all_documents: dict) -> None:
+        if response_data["code"] != 0:
+            raise ValueError(
+                f"Failed to query documents from resource: {response_data['message']}"
+            )
+
+        rsp_data = response_data.get("data", {})
+
+        if "result_list" not in rsp_data:
+            return
+
+        result_list = rsp_data["result_list"]
+
+        for item in result_list:
+            doc_info = item.get("doc_info", {})
+            doc_id = doc_info.get("doc_id")
+
+            if not doc_id:
+                continue
+
+            if doc_id not in all_documents:
+                all_documents[doc_id] = Document(
+                    id=doc_id, title=doc_info.get("doc_name"), chunks=[]
+                )
+
+            chunk = Chunk(
+                content=item.get("content", ""), similarity=item.get("score", 0.0)
+            )
+            all_documents[doc_id].chunks.append(chunk)
+
     def query_relevant_documents(
         self, query: str, resources: list[Resource] = []
     ) -> list[Document]:
@@ -189,85 +282,44 @@ class VikingDBKnowledgeBaseProvider(Retriever):
 
         all_documents = {}
         for resource in resources:
-            resource_id, document_id = parse_uri(resource.uri)
-            request_params = {
-                "resource_id": resource_id,
-                "query": query,
-                "limit": self.retrieval_size,
-                "dense_weight": 0.5,
-                "pre_processing": {
-                    "need_instruction": True,
-                    "rewrite": False,
-                    "return_token_usage": True,
-                },
-                "post_processing": {
-                    "rerank_switch": True,
-                    "chunk_diffusion_count": 0,
-                    "chunk_group": True,
-                    "get_attachment_link": True,
-                },
-            }
-            if document_id:
-                doc_filter = {"op": "must", "field": "doc_id", "conds": [document_id]}
-                query_param = {"doc_filter": doc_filter}
-                request_params["query_param"] = query_param
-
-            path = "/api/knowledge/collection/search_knowledge"
-
             # Use new signature request method
             response = self._make_signed_request(
-                method="POST", path=path, data=request_params
+                method="POST",
+                path=SEARCH_PATH,
+                data=self._search_request(query, resource),
             )
-
-            try:
-                response_data = response.json()
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Failed to parse JSON response: {e}")
-
-            if response_data["code"] != 0:
-                raise ValueError(
-                    f"Failed to query documents from resource: {response_data['message']}"
-                )
-
-            rsp_data = response_data.get("data", {})
-
-            if "result_list" not in rsp_data:
-                continue
-
-            result_list = rsp_data["result_list"]
-
-            for item in result_list:
-                doc_info = item.get("doc_info", {})
-                doc_id = doc_info.get("doc_id")
-
-                if not doc_id:
-                    continue
-
-                if doc_id not in all_documents:
-                    all_documents[doc_id] = Document(
-                        id=doc_id, title=doc_info.get("doc_name"), chunks=[]
-                    )
-
-                chunk = Chunk(
-                    content=item.get("content", ""), similarity=item.get("score", 0.0)
-                )
-                all_documents[doc_id].chunks.append(chunk)
+            self._add_documents(self._parse_json(response), all_documents)
 
         return list(all_documents.values())
 
-    def list_resources(self, query: str | None = None) -> list[Resource]:
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
         """
-        List resources (knowledge bases) from the knowledge base service
+        Query relevant documents from the knowledge base, all resources at once
         """
-        path = "/api/knowledge/collection/list"
+        if not resources:
+            return []
 
-        response = self._make_signed_request(method="POST", path=path)
+        responses = await asyncio.gather(
+            *(
+                self._amake_signed_request(
+                    method="POST",
+                    path=SEARCH_PATH,
+                    data=self._search_request(query, resource),
+                )
+                for resource in resources
+            )
+        )
+        all_documents = {}
+        for response in responses:
+            self._add_documents(self._parse_json(response), all_documents)
 
-        try:
-            response_data = response.json()
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse JSON response: {e}")
+        return list(all_documents.values())
 
+    def _parse_resources(
+        self, response_data: dict, query: str | None
+    ) -> list[Resource]:
         if response_data["code"] != 0:
             raise Exception(f"Failed to list resources: {response_data['message']}")
 
@@ -291,6 +343,20 @@ class VikingDBKnowledgeBaseProvider(Retriever):
 
         return resources
 
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        """
+        List resources (knowledge bases) from the knowledge base service
+        """
+        response = self._make_signed_request(method="POST", path=LIST_PATH)
+        return self._parse_resources(self._parse_json(response), query)
+
+    async def alist_resources(self, query: str | None = None) -> list[Resource]:
+        """
+        List resources (knowledge bases) from the knowledge base service
+        """
+        response = await self._amake_signed_request(method="POST", path=LIST_PATH)
+        return self._parse_resources(self._parse_json(response), query)
+
 
 def parse_uri(uri: str) -> tuple[str, str]:
     parsed = urlparse(uri)
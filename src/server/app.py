@@ -4,6 +4,8 @@
 import base64
 import json
 import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Annotated, Any, List, cast
 from uuid import uuid4
 
@@ -13,9 +15,6 @@ from fastapi.responses import Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, BaseMessage, ToolMessage
 from langgraph.types import Command
 from langgraph.store.memory import InMemoryStore
-from langgraph.checkpoint.mongodb import AsyncMongoDBSaver
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-from psycopg_pool import AsyncConnectionPool
 
 from src.config.configuration import get_recursion_limit
 from src.config.database import init_database, get_db
@@ -23,6 +22,8 @@ from src.config.database_service import research_db
 from src.config.loader import get_bool_env, get_str_env
 from src.config.report_style import ReportStyle
 from src.config.tools import SELECTED_RAG_PROVIDER
+from src.crawler.batch_crawler import close_http_client
+from src.crawler.fetcher import close_sync_http_client
 from src.graph.builder import build_graph_with_memory
 from src.llms.llm import get_configured_llm_models
 from src.podcast.graph.builder import build_graph as build_podcast_graph
@@ -30,8 +31,11 @@ from src.ppt.graph.builder import build_graph as build_ppt_graph
 from src.prompt_enhancer.graph.builder import build_graph as build_prompt_enhancer_graph
 from src.prose.graph.builder import build_graph as build_prose_graph
 from src.rag.builder import build_retriever
+from src.rag.embedding_cache import get_embedding_cache
+from src.rag.local import sync_local_documents
 from src.rag.milvus import load_examples
 from src.rag.retriever import Resource
+from src.server.checkpointer import open_checkpointer
 from src.server.chat_request import (
     ChatRequest,
     EnhancePromptRequest,
@@ -50,17 +54,45 @@ from src.server.rag_request import (
 )
 from src.server.research_api import router as research_router
 from src.tools import VolcengineTTS
+from src.tools.mcp_session_pool import close_mcp_session_pool
+from src.tools.search_cache import get_search_cache
+from src.tools.tavily_search.tavily_session import close_tavily_session
 from src.graph.checkpoint import chat_stream_message
 from src.utils.json_utils import sanitize_args
+from src.utils.outbound import close_governed_async_clients, get_outbound_governor
 
 logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage resources that live as long as the application."""
+    async with AsyncExitStack() as stack:
+        # Open the checkpointer pool and run its schema setup once
+        checkpointer = await open_checkpointer(stack)
+        if checkpointer is not None:
+            app.state.workflow_graph = graph.copy(
+                update={"checkpointer": checkpointer, "store": in_memory_store}
+            )
+        try:
+            yield
+        finally:
+            app.state.workflow_graph = None
+    # Shut down pooled MCP server sessions and HTTP connections
+    await close_mcp_session_pool()
+    await close_http_client()
+    close_sync_http_client()
+    await close_governed_async_clients()
+    await close_tavily_session()
+
+
 app = FastAPI(
     title="Bulldozer API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -81,6 +113,8 @@ app.add_middleware(
 
 # Load examples into Milvus if configured
 load_examples()
+# Sync LOCAL_RAG_DOCS_DIR into the local vector index if configured
+sync_local_documents()
 
 # Initialize research database
 try:
@@ -127,6 +161,7 @@ async def chat_stream(request: ChatRequest):
             request.enable_background_investigation,
             request.report_style,
             request.enable_deep_thinking,
+            request.request_timeout,
         ),
         media_type="text/event-stream",
     )
@@ -372,6 +407,7 @@ async def _astream_workflow_generator(
     enable_background_investigation: bool,
     report_style: ReportStyle,
     enable_deep_thinking: bool,
+    request_timeout: int = 0,
 ):
     # Create research project and session for persistence
     research_topic = messages[-1]["content"] if messages else "Research Session"
@@ -445,47 +481,16 @@ async def _astream_workflow_generator(
         "enable_deep_thinking": enable_deep_thinking,
         "recursion_limit": get_recursion_limit(),
     }
+    # Agent steps finish with what they found once the request budget is spent
+    if request_timeout:
+        workflow_config["request_deadline"] = time.time() + request_timeout
 
-    checkpoint_saver = get_bool_env("LANGGRAPH_CHECKPOINT_SAVER", False)
-    checkpoint_url = get_str_env("LANGGRAPH_CHECKPOINT_DB_URL", "")
-    # Handle checkpointer if configured
-    connection_kwargs = {
-        "autocommit": True,
-        "row_factory": "dict_row",
-        "prepare_threshold": 0,
-    }
-    if checkpoint_saver and checkpoint_url != "":
-        if checkpoint_url.startswith("postgresql://"):
-            logger.info("start async postgres checkpointer.")
-            async with AsyncConnectionPool(
-                checkpoint_url, kwargs=connection_kwargs
-            ) as conn:
-                checkpointer = AsyncPostgresSaver(conn)
-                await checkpointer.setup()
-                graph.checkpointer = checkpointer
-                graph.store = in_memory_store
-                async for event in _stream_graph_events(
-                    graph, workflow_input, workflow_config, thread_id, session_obj, project_obj
-                ):
-                    yield event
-
-        if checkpoint_url.startswith("mongodb://"):
-            logger.info("start async mongodb checkpointer.")
-            async with AsyncMongoDBSaver.from_conn_string(
-                checkpoint_url
-            ) as checkpointer:
-                graph.checkpointer = checkpointer
-                graph.store = in_memory_store
-                async for event in _stream_graph_events(
-                    graph, workflow_input, workflow_config, thread_id, session_obj, project_obj
-                ):
-                    yield event
-    else:
-        # Use graph without MongoDB checkpointer
-        async for event in _stream_graph_events(
-            graph, workflow_input, workflow_config, thread_id, session_obj, project_obj
-        ):
-            yield event
+    # Graph bound to the shared checkpointer, or the in-memory one if not configured
+    workflow_graph = getattr(app.state, "workflow_graph", None) or graph
+    async for event in _stream_graph_events(
+        workflow_graph, workflow_input, workflow_config, thread_id, session_obj, project_obj
+    ):
+        yield event
 
 
 def _make_event(event_type: str, data: dict[str, any]):
@@ -722,7 +727,8 @@ async def rag_resources(request: Annotated[RAGResourceRequest, Query()]):
     """Get the resources of the RAG."""
     retriever = build_retriever()
     if retriever:
-        return RAGResourcesResponse(resources=retriever.list_resources(request.query))
+        resources = await retriever.alist_resources(request.query)
+        return RAGResourcesResponse(resources=resources)
     return RAGResourcesResponse(resources=[])
 
 
@@ -734,5 +740,23 @@ async def config():
         models=get_configured_llm_models(),
     )
 
+
+@app.get("/api/outbound/stats")
+async def outbound_stats():
+    """Get call, failure and queue wait metrics of outbound API providers."""
+    return get_outbound_governor().get_stats()
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Get hit/miss metrics of the search and embedding caches."""
+    search_cache = get_search_cache()
+    embedding_cache = get_embedding_cache()
+    return {
+        "search": search_cache.get_stats() if search_cache else None,
+        "embedding": embedding_cache.get_stats() if embedding_cache else None,
+    }
+
+
 # Include research API routes
 app.include_router(research_router, prefix="/api/research", tags=["research"])
@@ -65,6 +65,9 @@ class ChatRequest(BaseModel):
     enable_deep_thinking: Optional[bool] = Field(
         False, description="Whether to enable deep thinking"
     )
+    request_timeout: Optional[int] = Field(
+        0, description="Seconds the research may take in total, 0 for no limit"
+    )
 
 
 class TTSRequest(BaseModel):
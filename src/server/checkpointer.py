@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Application-lifetime LangGraph checkpointer.
+
+The checkpointer and its connection pool are opened once when the server
+starts, the schema setup runs only then, and every chat request reuses the
+shared saver.
+
+Environment variables:
+    LANGGRAPH_CHECKPOINT_SAVER: Enable the database checkpointer.
+    LANGGRAPH_CHECKPOINT_DB_URL: ``postgresql://`` or ``mongodb://`` URL.
+    LANGGRAPH_CHECKPOINT_POOL_MIN_SIZE: Postgres connections kept open (default: 1).
+    LANGGRAPH_CHECKPOINT_POOL_MAX_SIZE: Postgres pool size limit (default: 10).
+    LANGGRAPH_CHECKPOINT_POOL_TIMEOUT: Seconds to wait for a pooled connection
+        (default: 30).
+"""
+
+import logging
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.mongodb import AsyncMongoDBSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+
+async def open_checkpointer(stack: AsyncExitStack) -> Optional[BaseCheckpointSaver]:
+    """Open the configured checkpointer, closing it when ``stack`` exits.
+
+    Returns ``None`` when no database checkpointer is configured.
+    """
+    checkpoint_saver = get_bool_env("LANGGRAPH_CHECKPOINT_SAVER", False)
+    checkpoint_url = get_str_env("LANGGRAPH_CHECKPOINT_DB_URL", "")
+    if not checkpoint_saver or checkpoint_url == "":
+        return None
+
+    if checkpoint_url.startswith("postgresql://"):
+        min_size = get_int_env("LANGGRAPH_CHECKPOINT_POOL_MIN_SIZE", 1)
+        max_size = max(min_size, get_int_env("LANGGRAPH_CHECKPOINT_POOL_MAX_SIZE", 10))
+        logger.info(
+            f"Opening postgres checkpointer pool (min_size={min_size}, "
+            f"max_size={max_size})."
+        )
+        pool = AsyncConnectionPool(
+            checkpoint_url,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=get_int_env("LANGGRAPH_CHECKPOINT_POOL_TIMEOUT", 30),
+            kwargs={
+                "autocommit": True,
+                "row_factory": dict_row,
+                "prepare_threshold": 0,
+            },
+            open=False,
+        )
+        await pool.open()
+        stack.push_async_callback(pool.close)
+        checkpointer = AsyncPostgresSaver(pool)
+        await checkpointer.setup()
+        return checkpointer
+
+    if checkpoint_url.startswith("mongodb://"):
+        logger.info("Opening mongodb checkpointer.")
+        return await stack.enter_async_context(
+            AsyncMongoDBSaver.from_conn_string(checkpoint_url)
+        )
+
+    scheme = checkpoint_url.split("://", 1)[0]
+    logger.warning(f"Unsupported checkpoint database scheme: {scheme}")
+    return None
@@ -1,29 +1,150 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
-from typing import Annotated
+from typing import Annotated, List, Optional
 
-from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import StructuredTool, tool
 
-from src.crawler import Crawler
+from src.config.configuration import Configuration
+from src.config.loader import get_int_env
+from src.crawler import Article, Crawler
+from src.crawler.batch_crawler import (
+    BatchCrawler,
+    get_extraction_executor,
+    get_http_client,
+)
 
 from .decorators import log_io
+from .research_registry import current_research_registry
 
 logger = logging.getLogger(__name__)
 
+_QUERY_DESCRIPTION = (
+    "What you are looking for in the page; the most relevant sections are kept."
+)
 
-@tool
-@log_io
-def crawl_tool(
+
+def _get_max_chars(config: Optional[RunnableConfig]) -> int:
+    return int(Configuration.from_runnable_config(config).crawl_max_chars)
+
+
+def crawl_page(
     url: Annotated[str, "The url to crawl."],
+    query: Annotated[Optional[str], _QUERY_DESCRIPTION] = None,
+    config: RunnableConfig = None,
 ) -> str:
     """Use this to crawl a url and get a readable content in markdown format."""
     try:
-        crawler = Crawler()
-        article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        registry = current_research_registry()
+        article = registry.get_page(url) if registry is not None else None
+        if article is None:
+            article = Crawler().crawl(url)
+            if registry is not None:
+                registry.record_page(url, article)
+        else:
+            logger.info(f"Research registry hit for crawl of {url}")
+        content = article.to_markdown_within_budget(_get_max_chars(config), query)
+        return {"url": url, "crawled_content": content}
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+async def acrawl_page(
+    url: Annotated[str, "The url to crawl."],
+    query: Annotated[Optional[str], _QUERY_DESCRIPTION] = None,
+    config: RunnableConfig = None,
+) -> str:
+    """Async version of ``crawl_page``, several crawls of one turn run concurrently."""
+    loop = asyncio.get_running_loop()
+    try:
+        registry = current_research_registry()
+        article = registry.get_page(url) if registry is not None else None
+        if article is None:
+            article = await Crawler().acrawl(
+                url, client=get_http_client(), executor=get_extraction_executor()
+            )
+            if registry is not None:
+                registry.record_page(url, article)
+        else:
+            logger.info(f"Research registry hit for crawl of {url}")
+        content = await loop.run_in_executor(
+            get_extraction_executor(),
+            article.to_markdown_within_budget,
+            _get_max_chars(config),
+            query,
+        )
+        return {"url": url, "crawled_content": content}
+    except Exception as e:
+        error_msg = f"Failed to crawl. Error: {repr(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
+crawl_tool = StructuredTool.from_function(
+    func=log_io(crawl_page),
+    coroutine=log_io(acrawl_page),
+    name="crawl_tool",
+    description=crawl_page.__doc__,
+)
+
+
+@tool
+@log_io
+async def batch_crawl_tool(
+    urls: Annotated[List[str], "The urls to crawl."],
+    query: Annotated[Optional[str], _QUERY_DESCRIPTION] = None,
+    config: RunnableConfig = None,
+) -> list:
+    """Use this to crawl several urls at once and get their readable content in markdown format."""
+    max_chars = _get_max_chars(config)
+    results = {}
+    loop = asyncio.get_running_loop()
+    registry = current_research_registry()
+
+    async def add_result(url: str, article: Article) -> None:
+        content = await loop.run_in_executor(
+            get_extraction_executor(),
+            article.to_markdown_within_budget,
+            max_chars,
+            query,
+        )
+        results[url] = {"url": url, "crawled_content": content}
+
+    # Pages crawled by earlier steps of the research are not fetched again
+    known = {}
+    if registry is not None:
+        for url in urls:
+            article = registry.get_page(url)
+            if article is not None:
+                known[url] = article
+        if known:
+            logger.info(f"Research registry hit for {len(known)} crawled urls")
+    crawled = BatchCrawler().crawl_many([url for url in urls if url not in known])
+    try:
+        # Return whatever finished in time rather than failing the whole batch
+        async with asyncio.timeout(get_int_env("CRAWL_BATCH_TIMEOUT", 60)):
+            for url, article in known.items():
+                await add_result(url, article)
+            async for result in crawled:
+                if result.article is None:
+                    results[result.url] = {
+                        "url": result.url,
+                        "error": f"Failed to crawl. Error: {result.error}",
+                    }
+                    continue
+                if registry is not None:
+                    registry.record_page(result.url, result.article)
+                await add_result(result.url, result.article)
+    except TimeoutError:
+        logger.warning(f"Batch crawl timed out with {len(results)} results")
+    finally:
+        await crawled.aclose()
+    return [
+        results.get(url, {"url": url, "error": "Failed to crawl. Error: timed out"})
+        for url in dict.fromkeys(urls)
+    ]
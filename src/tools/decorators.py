@@ -2,8 +2,13 @@
 # SPDX-License-Identifier: MIT
 
 import functools
+import inspect
 import logging
-from typing import Any, Callable, Type, TypeVar
+from typing import Any, Callable, ClassVar, Type, TypeVar
+
+from langchain_core.tools import BaseTool
+
+from src.utils.outbound import get_outbound_governor
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +26,30 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    func_name = func.__name__
+
+    def log_input(*args: Any, **kwargs: Any) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
         logger.info(f"Tool {func_name} called with parameters: {params}")
 
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log_input(*args, **kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func_name} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        log_input(*args, **kwargs)
+
         # Execute the function
         result = func(*args, **kwargs)
 
@@ -79,3 +99,41 @@ def create_logged_tool(base_tool_class: Type[T]) -> Type[T]:
     # Set a more descriptive name for the class
     LoggedTool.__name__ = f"Logged{base_tool_class.__name__}"
     return LoggedTool
+
+
+class GovernedToolMixin:
+    """A mixin that sends the API calls of a tool through the outbound governor."""
+
+    outbound_provider: ClassVar[str] = ""
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        with get_outbound_governor().limit(self.outbound_provider):
+            return super()._run(*args, **kwargs)
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        if super()._arun.__func__ is BaseTool._arun:
+            # The default _arun runs _run in an executor, which is governed
+            return await super()._arun(*args, **kwargs)
+        async with get_outbound_governor().alimit(self.outbound_provider):
+            return await super()._arun(*args, **kwargs)
+
+
+def create_governed_tool(base_tool_class: Type[T], provider: str) -> Type[T]:
+    """
+    Factory function to create a version of a tool class whose calls are rate
+    limited and guarded by a circuit breaker, see src/utils/outbound.py.
+
+    Args:
+        base_tool_class: The original tool class
+        provider: The name of the API the tool calls
+
+    Returns:
+        A new class with the same name that inherits from both
+        GovernedToolMixin and the base tool class
+    """
+
+    class GovernedTool(GovernedToolMixin, base_tool_class):
+        outbound_provider: ClassVar[str] = provider
+
+    GovernedTool.__name__ = base_tool_class.__name__
+    return GovernedTool
@@ -0,0 +1,330 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Federated web search over several engines.
+
+With ``SEARCH_API=federated`` the ``web_search`` tool queries the engines in
+``SEARCH_FEDERATED_ENGINES`` instead of a single provider, so a slow or failing
+provider no longer stalls research steps:
+
+- Hedged mode (default) asks the first engine and only sends the query to the
+  next one if no answer arrived within the first engine's p95 latency, or as
+  soon as an engine fails. Once the first answer arrived, engines still
+  running get a short grace window to finish, so a hedged search can fuse
+  the results of several engines.
+- Fan-out mode (``SEARCH_FEDERATED_HEDGE=false``) asks all engines at once.
+
+Results are deduplicated by canonical URL and ranked with reciprocal rank
+fusion. Whatever has arrived when the deadline expires is returned.
+
+Environment variables:
+    SEARCH_FEDERATED_ENGINES: Comma separated engines in priority order
+        (default: tavily,duckduckgo).
+    SEARCH_FEDERATED_HEDGE: Hedge requests instead of fanning out
+        (default: true).
+    SEARCH_FEDERATED_DEADLINE_MS: Latency budget of one search (default: 10000).
+    SEARCH_HEDGE_DELAY_MS: Hedge delay used until an engine has enough
+        latency samples for a p95 (default: 2000).
+    SEARCH_HEDGE_GRACE_MS: How long a hedged search keeps waiting for the
+        engines still running after the first answer (default: 300).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Type
+from urllib.parse import quote
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+from src.config.tools import SearchEngine
+from src.crawler.crawl_cache import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Rank constant of reciprocal rank fusion, 60 as in the original paper
+RRF_K = 60
+# Latency samples needed before the p95 replaces the default hedge delay
+_MIN_LATENCY_SAMPLES = 5
+
+
+class LatencyTracker:
+    """Keeps recent response times per engine."""
+
+    def __init__(self, window: int = 100):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+
+    def record(self, engine: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[engine].append(seconds)
+
+    def p95(self, engine: str) -> Optional[float]:
+        """Return the 95th percentile latency, or ``None`` without enough data."""
+        with self._lock:
+            samples = sorted(self._samples.get(engine, ()))
+        if len(samples) < _MIN_LATENCY_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+latency_tracker = LatencyTracker()
+
+
+def get_federated_engines() -> List[str]:
+    value = get_str_env(
+        "SEARCH_FEDERATED_ENGINES",
+        f"{SearchEngine.TAVILY.value},{SearchEngine.DUCKDUCKGO.value}",
+    )
+    engines = [engine.strip().lower() for engine in value.split(",") if engine.strip()]
+    return list(dict.fromkeys(engines))
+
+
+def _text_blocks(output: str, first_key: str) -> List[Dict[str, str]]:
+    """Parse ``Key: value`` blocks separated by blank lines."""
+    blocks = []
+    for block in output.split("\n\n"):
+        fields: Dict[str, str] = {}
+        key = None
+        for line in block.split("\n"):
+            name, sep, value = line.partition(": ")
+            if sep and name in ("Page", "Published", "Title", "Authors", "Summary"):
+                key = name
+                fields[key] = value
+            elif key is not None:
+                fields[key] += "\n" + line
+        if first_key in fields:
+            blocks.append(fields)
+    return blocks
+
+
+def normalize_results(engine: str, output: Any, lang: str = "en") -> List[Dict]:
+    """Convert the output of an engine's tool to ``{title, url, content}`` pages.
+
+    Raises ``ValueError`` if the output is an error message rather than results.
+    """
+    if engine == SearchEngine.TAVILY.value:
+        if not isinstance(output, list):
+            raise ValueError(f"Tavily search failed: {output}")
+        return [
+            {"title": r["title"], "url": r["url"], "content": r["content"]}
+            if r.get("type") == "page"
+            else r
+            for r in output
+        ]
+    if engine in (SearchEngine.DUCKDUCKGO.value, SearchEngine.BRAVE_SEARCH.value):
+        results = json.loads(output) if isinstance(output, str) else output
+        if not isinstance(results, list):
+            raise ValueError(f"{engine} search failed: {output}")
+        return [
+            {"title": r.get("title"), "url": r["link"], "content": r.get("snippet")}
+            for r in results
+            if r.get("link")
+        ]
+    if engine == SearchEngine.ARXIV.value:
+        if output.startswith("Arxiv exception"):
+            raise ValueError(output)
+        # The arxiv tool does not return links, search by title instead
+        return [
+            {
+                "title": block["Title"],
+                "url": "https://arxiv.org/search/?searchtype=title&query="
+                + quote(block["Title"]),
+                "content": block.get("Summary", ""),
+            }
+            for block in _text_blocks(output, "Title")
+        ]
+    if engine == SearchEngine.WIKIPEDIA.value:
+        return [
+            {
+                "title": block["Page"],
+                "url": f"https://{lang}.wikipedia.org/wiki/"
+                + quote(block["Page"].replace(" ", "_")),
+                "content": block.get("Summary", ""),
+            }
+            for block in _text_blocks(output, "Page")
+        ]
+    raise ValueError(f"Unsupported search engine: {engine}")
+
+
+def fuse_results(
+    results_by_engine: Dict[str, List[Dict]], max_results: int
+) -> List[Dict]:
+    """Merge ranked result lists with reciprocal rank fusion.
+
+    Pages are deduplicated by canonical URL, keeping the longest snippet, and
+    images (Tavily only) are appended after the pages.
+    """
+    pages: Dict[str, Dict] = {}
+    images: List[Dict] = []
+    for engine, results in results_by_engine.items():
+        rank = 0
+        for result in results:
+            if result.get("type") == "image":
+                images.append(result)
+                continue
+            rank += 1
+            key = canonicalize_url(result["url"])
+            page = pages.get(key)
+            if page is None:
+                page = pages[key] = {
+                    "type": "page",
+                    "title": result["title"],
+                    "url": result["url"],
+                    "content": result["content"] or "",
+                    "engines": [],
+                    "score": 0.0,
+                }
+            elif len(result["content"] or "") > len(page["content"]):
+                page["content"] = result["content"]
+            page["engines"].append(engine)
+            page["score"] += 1 / (RRF_K + rank)
+    ranked = sorted(pages.values(), key=lambda page: -page["score"])[:max_results]
+    for page in ranked:
+        page["score"] = round(page["score"], 6)
+    return ranked + images
+
+
+class FederatedSearchInput(BaseModel):
+    query: str = Field(description="search query to look up")
+
+
+class FederatedSearchTool(BaseTool):
+    """Search several engines with hedging and fuse their rankings."""
+
+    name: str = "web_search"
+    description: str = (
+        "A search engine aggregating several web search providers. "
+        "Useful for when you need to answer questions about current events. "
+        "Input should be a search query."
+    )
+    args_schema: Type[BaseModel] = FederatedSearchInput
+
+    # Search tools of the engines, in priority order
+    engine_tools: Dict[str, BaseTool]
+    max_results: int = 5
+    hedge: bool = Field(
+        default_factory=lambda: get_bool_env("SEARCH_FEDERATED_HEDGE", True)
+    )
+    deadline: float = Field(
+        default_factory=lambda: (
+            get_int_env("SEARCH_FEDERATED_DEADLINE_MS", 10000) / 1000
+        )
+    )
+    default_hedge_delay: float = Field(
+        default_factory=lambda: get_int_env("SEARCH_HEDGE_DELAY_MS", 2000) / 1000
+    )
+    hedge_grace: float = Field(
+        default_factory=lambda: get_int_env("SEARCH_HEDGE_GRACE_MS", 300) / 1000
+    )
+    wikipedia_lang: str = "en"
+
+    def hedge_delay(self, engine: str) -> float:
+        p95 = latency_tracker.p95(engine)
+        return p95 if p95 is not None else self.default_hedge_delay
+
+    async def _query_engine(self, engine: str, query: str) -> List[Dict]:
+        start = time.monotonic()
+        output = await self.engine_tools[engine].ainvoke(query)
+        results = normalize_results(engine, output, self.wikipedia_lang)
+        latency_tracker.record(engine, time.monotonic() - start)
+        return results
+
+    async def _search(self, query: str) -> Dict[str, List[Dict]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        waiting = list(self.engine_tools)
+        pending: Dict[asyncio.Task, str] = {}
+        results: Dict[str, List[Dict]] = {}
+        next_hedge_at = deadline
+        # Lowered to the end of the grace window once the first answer arrived
+        stop_at = deadline
+
+        def launch() -> None:
+            nonlocal next_hedge_at
+            engine = waiting.pop(0)
+            task = asyncio.create_task(self._query_engine(engine, query))
+            pending[task] = engine
+            next_hedge_at = loop.time() + self.hedge_delay(engine)
+
+        launch()
+        while not self.hedge and waiting:
+            launch()
+        try:
+            while pending and loop.time() < stop_at:
+                hedging = waiting and not results
+                wake_at = min(stop_at, next_hedge_at) if hedging else stop_at
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, wake_at - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    engine = pending.pop(task)
+                    try:
+                        results[engine] = task.result()
+                    except Exception as e:
+                        logger.warning(f"{engine} search failed: {repr(e)}")
+                        if waiting and not results:
+                            launch()
+                if self.hedge and results and stop_at == deadline:
+                    stop_at = min(deadline, loop.time() + self.hedge_grace)
+                if not done and hedging and loop.time() >= next_hedge_at:
+                    logger.info(f"Hedging search for {query!r} to {waiting[0]}")
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        if pending and stop_at < deadline:
+            logger.info(
+                f"Search grace window of {self.hedge_grace}s ended, "
+                f"skipping {', '.join(pending.values())}"
+            )
+        elif pending:
+            logger.warning(
+                f"Search deadline of {self.deadline}s hit, "
+                f"skipping {', '.join(pending.values())}"
+            )
+        return results
+
+    async def _arun(
+        self,
+        query: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> str:
+        results = await self._search(query)
+        if not results:
+            return f"Search failed: no search engine answered within {self.deadline}s"
+        # Keep the engines' priority order so ties go to the preferred engine
+        ordered = {e: results[e] for e in self.engine_tools if e in results}
+        return json.dumps(fuse_results(ordered, self.max_results), ensure_ascii=False)
+
+    def _run(
+        self,
+        query: str,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._arun(query))
+        # Called synchronously from inside an event loop, search in a thread
+        result: List[str] = []
+        thread = threading.Thread(
+            target=lambda: result.append(asyncio.run(self._arun(query)))
+        )
+        thread.start()
+        thread.join()
+        return result[0]
@@ -0,0 +1,225 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process-wide pool of warm MCP client sessions.
+
+Every research step used to build a fresh ``MultiServerMCPClient``, which for
+stdio servers means spawning the server process, running the MCP handshake and
+listing tools again. The pool keeps one live session per normalized server
+config, caches the converted LangChain tools for a TTL, pings sessions that
+have been idle for a while and restarts servers that died.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+
+from src.config.loader import get_int_env
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_connection(connection: Dict[str, Any]) -> str:
+    """Return a stable key for an MCP server connection config."""
+    return json.dumps(connection, sort_keys=True, default=str)
+
+
+class _PooledSession:
+    """A single MCP session kept open by a dedicated background task.
+
+    The MCP transports are anyio based and must be entered and exited from the
+    same task, so the session lives inside ``_run`` until ``close`` is called.
+    """
+
+    def __init__(self, connection: Dict[str, Any]):
+        self.connection = connection
+        self.loop = asyncio.get_running_loop()
+        self.lock = asyncio.Lock()
+        self.session: Optional[ClientSession] = None
+        self.tools: Optional[List[BaseTool]] = None
+        self.tools_loaded_at = 0.0
+        self.last_checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+
+    def is_alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self) -> None:
+        ready = self.loop.create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready))
+        await ready
+        self.last_checked_at = time.monotonic()
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            async with create_session(self.connection) as session:
+                await session.initialize()
+                self.session = session
+                ready.set_result(None)
+                await self._closing.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP session terminated unexpectedly: {repr(e)}")
+        finally:
+            self.session = None
+
+    async def close(self) -> None:
+        if self._closing is not None:
+            self._closing.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except BaseException as e:
+                logger.warning(f"Error closing MCP session: {repr(e)}")
+        self.session = None
+
+
+class _PooledSessionProxy:
+    """Stand-in for a ``ClientSession`` that always uses the live pooled session.
+
+    Tools are bound to the proxy rather than to a concrete session, so cached
+    tools keep working after the pool restarts a dead server.
+    """
+
+    def __init__(self, pool: "MCPSessionPool", connection: Dict[str, Any]):
+        self._pool = pool
+        self._connection = connection
+
+    async def list_tools(self, *args: Any, **kwargs: Any):
+        session = await self._pool.acquire_session(self._connection)
+        return await session.list_tools(*args, **kwargs)
+
+    async def call_tool(self, *args: Any, **kwargs: Any):
+        session = await self._pool.acquire_session(self._connection)
+        return await session.call_tool(*args, **kwargs)
+
+
+class MCPSessionPool:
+    """Share warm MCP sessions and tool schemas across research steps.
+
+    Environment variables:
+        MCP_TOOLS_CACHE_TTL: Seconds to reuse a server's tool list (default: 300).
+        MCP_HEALTH_CHECK_INTERVAL: Seconds a session may sit unchecked before it
+            is pinged on next use (default: 30).
+        MCP_HEALTH_CHECK_TIMEOUT: Seconds to wait for a ping (default: 5).
+    """
+
+    def __init__(
+        self,
+        tools_ttl_seconds: Optional[int] = None,
+        health_check_interval: Optional[int] = None,
+        health_check_timeout: Optional[int] = None,
+    ):
+        self.tools_ttl_seconds = (
+            tools_ttl_seconds
+            if tools_ttl_seconds is not None
+            else get_int_env("MCP_TOOLS_CACHE_TTL", 300)
+        )
+        self.health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else get_int_env("MCP_HEALTH_CHECK_INTERVAL", 30)
+        )
+        self.health_check_timeout = (
+            health_check_timeout
+            if health_check_timeout is not None
+            else get_int_env("MCP_HEALTH_CHECK_TIMEOUT", 5)
+        )
+        self._entries: Dict[str, _PooledSession] = {}
+
+    def _get_entry(self, connection: Dict[str, Any]) -> _PooledSession:
+        key = normalize_connection(connection)
+        entry = self._entries.get(key)
+        # Sessions are bound to the event loop that started them
+        if entry is None or entry.loop is not asyncio.get_running_loop():
+            entry = _PooledSession(connection)
+            self._entries[key] = entry
+        return entry
+
+    async def acquire_session(self, connection: Dict[str, Any]) -> ClientSession:
+        """Return a live session for ``connection``, starting it if needed."""
+        entry = self._get_entry(connection)
+        async with entry.lock:
+            if entry.is_alive() and (
+                time.monotonic() - entry.last_checked_at >= self.health_check_interval
+            ):
+                try:
+                    await asyncio.wait_for(
+                        entry.session.send_ping(), timeout=self.health_check_timeout
+                    )
+                    entry.last_checked_at = time.monotonic()
+                except Exception as e:
+                    logger.warning(f"MCP health check failed, restarting: {repr(e)}")
+                    await entry.close()
+            if not entry.is_alive():
+                logger.info(f"Starting MCP session: {connection.get('transport')}")
+                await entry.start()
+            return entry.session
+
+    async def get_server_tools(self, connection: Dict[str, Any]) -> List[BaseTool]:
+        """Return the LangChain tools of one server, cached for the TTL."""
+        entry = self._get_entry(connection)
+        if (
+            entry.tools is not None
+            and time.monotonic() - entry.tools_loaded_at < self.tools_ttl_seconds
+        ):
+            return entry.tools
+        entry.tools = await load_mcp_tools(_PooledSessionProxy(self, connection))
+        entry.tools_loaded_at = time.monotonic()
+        return entry.tools
+
+    async def get_tools(self, servers: Dict[str, Dict[str, Any]]) -> List[BaseTool]:
+        """Return copies of the tools of all ``servers``.
+
+        Copies are returned so callers can adjust descriptions without
+        touching the cached tools.
+        """
+        tools_list = await asyncio.gather(
+            *(self.get_server_tools(connection) for connection in servers.values())
+        )
+        return [copy.copy(tool) for tools in tools_list for tool in tools]
+
+    async def close(self) -> None:
+        """Close every pooled session (idempotent)."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        current_loop = asyncio.get_running_loop()
+        for entry in entries:
+            if entry.loop is current_loop:
+                await entry.close()
+
+
+_mcp_session_pool: Optional[MCPSessionPool] = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Return the process-wide MCP session pool."""
+    global _mcp_session_pool
+    if _mcp_session_pool is None:
+        _mcp_session_pool = MCPSessionPool()
+    return _mcp_session_pool
+
+
+async def close_mcp_session_pool() -> None:
+    """Close the process-wide MCP session pool, e.g. on app shutdown."""
+    global _mcp_session_pool
+    if _mcp_session_pool is not None:
+        await _mcp_session_pool.close()
+        _mcp_session_pool = None
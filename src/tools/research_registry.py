@@ -0,0 +1,186 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Searches and crawls already done within one research run.
+
+Every plan step starts a fresh agent that knows nothing about the tool calls of
+earlier steps, so steps tend to repeat the same searches and crawl the same
+pages. The registry of a thread records the search results and crawled pages
+of its steps. Search and crawl tools serve repeats from it directly, and
+``digest`` lists the known sources for the prompts of later steps.
+
+``_execute_agent_step`` activates the registry of the thread with
+``use_research_registry``; tools find it with ``current_research_registry``.
+Threads are reused for follow-up questions, so the coordinator drops the
+registry when it hands off a new research topic, and the reporter drops it
+once the run is done.
+
+Environment variables:
+    RESEARCH_REGISTRY_ENABLED: Enable the registry (default: true).
+    RESEARCH_REGISTRY_MAX_THREADS: Threads whose registry is kept in memory
+        (default: 64).
+    RESEARCH_REGISTRY_DIGEST_SOURCES: Sources listed in the digest
+        (default: 20).
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config.loader import get_bool_env, get_int_env
+from src.crawler.article import Article
+from src.crawler.crawl_cache import canonicalize_url
+from src.tools.federated_search import normalize_results
+
+logger = logging.getLogger(__name__)
+
+# Entries of each kind kept per thread
+_MAX_ENTRIES = 256
+
+
+@dataclass
+class KnownSource:
+    url: str
+    title: str
+    crawled: bool = False
+
+
+def _bounded_set(entries: OrderedDict, key: Any, value: Any) -> None:
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > _MAX_ENTRIES:
+        entries.popitem(last=False)
+
+
+def _search_sources(engine: str, result: Any) -> List[Dict]:
+    content = result[0] if isinstance(result, tuple) else result
+    try:
+        return [
+            hit
+            for hit in normalize_results(engine, content)
+            if hit.get("type", "page") == "page" and hit.get("url")
+        ]
+    except Exception:
+        # Plain text results without links still count as a searched query
+        return []
+
+
+class ResearchRegistry:
+    """Search results and crawled pages of one research thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # search cache key -> (query, result)
+        self._searches: OrderedDict[str, Tuple[str, Any]] = OrderedDict()
+        self._pages: OrderedDict[str, Article] = OrderedDict()
+        self._sources: OrderedDict[str, KnownSource] = OrderedDict()
+
+    def get_search(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(found, result)`` for a search cache key."""
+        with self._lock:
+            entry = self._searches.get(key)
+            return (True, entry[1]) if entry is not None else (False, None)
+
+    def record_search(self, engine: str, key: str, query: str, result: Any) -> None:
+        sources = _search_sources(engine, result)
+        with self._lock:
+            _bounded_set(self._searches, key, (query, result))
+            for hit in sources:
+                url = canonicalize_url(hit["url"])
+                if url not in self._sources:
+                    _bounded_set(
+                        self._sources,
+                        url,
+                        KnownSource(url=hit["url"], title=hit.get("title") or ""),
+                    )
+
+    def get_page(self, url: str) -> Optional[Article]:
+        with self._lock:
+            return self._pages.get(canonicalize_url(url))
+
+    def record_page(self, url: str, article: Article) -> None:
+        key = canonicalize_url(url)
+        with self._lock:
+            _bounded_set(self._pages, key, article)
+            source = self._sources.get(key)
+            title = article.title or (source.title if source else "")
+            _bounded_set(self._sources, key, KnownSource(url, title, crawled=True))
+
+    def queries(self) -> List[str]:
+        with self._lock:
+            return list(dict.fromkeys(query for query, _ in self._searches.values()))
+
+    def digest(self, max_sources: Optional[int] = None) -> str:
+        """Return a markdown list of the queries and sources known so far."""
+        if max_sources is None:
+            max_sources = get_int_env("RESEARCH_REGISTRY_DIGEST_SOURCES", 20)
+        queries = self.queries()
+        with self._lock:
+            sources = list(self._sources.values())
+        if not queries and not sources:
+            return ""
+        # Crawled pages first, they were worth reading
+        sources.sort(key=lambda source: not source.crawled)
+        lines = [
+            "# Already Known Sources",
+            "",
+            "Earlier steps already ran these searches and crawls. Repeating "
+            "them returns the same results, so look for new information instead.",
+            "",
+        ]
+        if queries:
+            lines += ["Searched queries: " + "; ".join(f'"{q}"' for q in queries), ""]
+        for source in sources[:max_sources]:
+            suffix = " (crawled)" if source.crawled else ""
+            lines.append(f"- [{source.title or source.url}]({source.url}){suffix}")
+        if len(sources) > max_sources:
+            lines.append(f"- ... and {len(sources) - max_sources} more")
+        return "\n".join(lines).strip()
+
+
+_registries: OrderedDict[str, ResearchRegistry] = OrderedDict()
+_registries_lock = threading.Lock()
+_current_registry: ContextVar[Optional[ResearchRegistry]] = ContextVar(
+    "research_registry", default=None
+)
+
+
+def get_research_registry(thread_id: Optional[str]) -> Optional[ResearchRegistry]:
+    """Return the registry of a thread, or ``None`` if disabled."""
+    if not thread_id or not get_bool_env("RESEARCH_REGISTRY_ENABLED", True):
+        return None
+    with _registries_lock:
+        registry = _registries.get(thread_id)
+        if registry is None:
+            registry = _registries[thread_id] = ResearchRegistry()
+        _registries.move_to_end(thread_id)
+        max_threads = max(1, get_int_env("RESEARCH_REGISTRY_MAX_THREADS", 64))
+        while len(_registries) > max_threads:
+            _registries.popitem(last=False)
+        return registry
+
+
+def clear_research_registry(thread_id: Optional[str]) -> None:
+    """Forget the searches and crawls of the thread's current research run."""
+    with _registries_lock:
+        _registries.pop(thread_id, None)
+
+
+def current_research_registry() -> Optional[ResearchRegistry]:
+    """Return the registry of the research step being executed, if any."""
+    return _current_registry.get()
+
+
+@contextmanager
+def use_research_registry(registry: Optional[ResearchRegistry]) -> Iterator[None]:
+    """Make ``registry`` visible to the tools called in this context."""
+    token = _current_registry.set(registry)
+    try:
+        yield
+    finally:
+        _current_registry.reset(token)
@@ -29,6 +29,20 @@ class RetrieverTool(BaseTool):
     retriever: Retriever = Field(default_factory=Retriever)
     resources: list[Resource] = Field(default_factory=list)
 
+    def cache_signature(self) -> str:
+        """Identify the tool by provider class and resources.
+
+        ``get_retriever_tool`` builds a new provider for every step, so the
+        provider instance must not be part of the agent cache key.
+        """
+        uris = sorted(resource.uri for resource in self.resources)
+        return f"{type(self.retriever).__qualname__}:{uris}"
+
+    def _format_documents(self, documents: list[Document]) -> list[dict] | str:
+        if not documents:
+            return "No results found from the local knowledge base."
+        return [doc.to_dict() for doc in documents]
+
     def _run(
         self,
         keywords: str,
@@ -38,16 +52,20 @@ class RetrieverTool(BaseTool):
             f"Retriever tool query: {keywords}", extra={"resources": self.resources}
         )
         documents = self.retriever.query_relevant_documents(keywords, self.resources)
-        if not documents:
-            return "No results found from the local knowledge base."
-        return [doc.to_dict() for doc in documents]
+        return self._format_documents(documents)
 
     async def _arun(
         self,
         keywords: str,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> list[Document]:
-        return self._run(keywords, run_manager.get_sync())
+        logger.info(
+            f"Retriever tool query: {keywords}", extra={"resources": self.resources}
+        )
+        documents = await self.retriever.aquery_relevant_documents(
+            keywords, self.resources
+        )
+        return self._format_documents(documents)
 
 
 def get_retriever_tool(resources: List[Resource]) -> RetrieverTool | None:
@@ -18,19 +18,43 @@ from langchain_community.utilities import (
 )
 
 from src.config import SELECTED_SEARCH_ENGINE, SearchEngine, load_yaml_config
-from src.tools.decorators import create_logged_tool
+from src.tools.decorators import create_governed_tool, create_logged_tool
+from src.tools.federated_search import FederatedSearchTool, get_federated_engines
+from src.tools.search_cache import create_cached_search_tool
 from src.tools.tavily_search.tavily_search_results_with_images import (
     TavilySearchWithImages,
 )
 
 logger = logging.getLogger(__name__)
 
-# Create logged versions of the search tools
-LoggedTavilySearch = create_logged_tool(TavilySearchWithImages)
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
-LoggedBraveSearch = create_logged_tool(BraveSearch)
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
-LoggedWikipediaSearch = create_logged_tool(WikipediaQueryRun)
+# Create logged versions of the search tools, backed by the search cache.
+# Tavily is governed per request by its HTTP session, the other engines per
+# tool call.
+LoggedTavilySearch = create_cached_search_tool(
+    create_logged_tool(TavilySearchWithImages), SearchEngine.TAVILY.value
+)
+LoggedDuckDuckGoSearch = create_cached_search_tool(
+    create_governed_tool(
+        create_logged_tool(DuckDuckGoSearchResults), SearchEngine.DUCKDUCKGO.value
+    ),
+    SearchEngine.DUCKDUCKGO.value,
+)
+LoggedBraveSearch = create_cached_search_tool(
+    create_governed_tool(
+        create_logged_tool(BraveSearch), SearchEngine.BRAVE_SEARCH.value
+    ),
+    SearchEngine.BRAVE_SEARCH.value,
+)
+LoggedArxivSearch = create_cached_search_tool(
+    create_governed_tool(create_logged_tool(ArxivQueryRun), SearchEngine.ARXIV.value),
+    SearchEngine.ARXIV.value,
+)
+LoggedWikipediaSearch = create_cached_search_tool(
+    create_governed_tool(
+        create_logged_tool(WikipediaQueryRun), SearchEngine.WIKIPEDIA.value
+    ),
+    SearchEngine.WIKIPEDIA.value,
+)
 
 
 def get_search_config():
@@ -39,11 +63,20 @@ def get_search_config():
     return search_config
 
 
-# Get the selected search tool
-def get_web_search_tool(max_search_results: int):
+def create_search_tool(
+    engine: str,
+    max_search_results: int,
+    name: str = "web_search",
+    structured_output: bool = False,
+):
+    """Create the search tool of one engine.
+
+    With ``structured_output`` DuckDuckGo returns JSON results instead of a
+    plain string, so they can be merged with the results of other engines.
+    """
     search_config = get_search_config()
 
-    if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
+    if engine == SearchEngine.TAVILY.value:
         # Only get and apply include/exclude domains for Tavily
         include_domains: Optional[List[str]] = search_config.get("include_domains", [])
         exclude_domains: Optional[List[str]] = search_config.get("exclude_domains", [])
@@ -53,7 +86,7 @@ def get_web_search_tool(max_search_results: int):
         )
 
         return LoggedTavilySearch(
-            name="web_search",
+            name=name,
             max_results=max_search_results,
             include_raw_content=True,
             include_images=True,
@@ -61,35 +94,36 @@ def get_web_search_tool(max_search_results: int):
             include_domains=include_domains,
             exclude_domains=exclude_domains,
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.DUCKDUCKGO.value:
+    elif engine == SearchEngine.DUCKDUCKGO.value:
         return LoggedDuckDuckGoSearch(
-            name="web_search",
+            name=name,
             num_results=max_search_results,
+            output_format="json" if structured_output else "string",
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.BRAVE_SEARCH.value:
+    elif engine == SearchEngine.BRAVE_SEARCH.value:
         return LoggedBraveSearch(
-            name="web_search",
+            name=name,
             search_wrapper=BraveSearchWrapper(
                 api_key=os.getenv("BRAVE_SEARCH_API_KEY", ""),
                 search_kwargs={"count": max_search_results},
             ),
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.ARXIV.value:
+    elif engine == SearchEngine.ARXIV.value:
         return LoggedArxivSearch(
-            name="web_search",
+            name=name,
             api_wrapper=ArxivAPIWrapper(
                 top_k_results=max_search_results,
                 load_max_docs=max_search_results,
                 load_all_available_meta=True,
             ),
         )
-    elif SELECTED_SEARCH_ENGINE == SearchEngine.WIKIPEDIA.value:
+    elif engine == SearchEngine.WIKIPEDIA.value:
         wiki_lang = search_config.get("wikipedia_lang", "en")
         wiki_doc_content_chars_max = search_config.get(
             "wikipedia_doc_content_chars_max", 4000
         )
         return LoggedWikipediaSearch(
-            name="web_search",
+            name=name,
             api_wrapper=WikipediaAPIWrapper(
                 lang=wiki_lang,
                 top_k_results=max_search_results,
@@ -98,4 +132,31 @@ def get_web_search_tool(max_search_results: int):
             ),
         )
     else:
-        raise ValueError(f"Unsupported search engine: {SELECTED_SEARCH_ENGINE}")
+        raise ValueError(f"Unsupported search engine: {engine}")
+
+
+def create_federated_search_tool(max_search_results: int) -> FederatedSearchTool:
+    engines = get_federated_engines()
+    if SearchEngine.FEDERATED.value in engines or not engines:
+        raise ValueError(f"Invalid federated search engines: {engines}")
+    engine_tools = {
+        engine: create_search_tool(
+            engine,
+            max_search_results,
+            name=f"{engine}_search",
+            structured_output=True,
+        )
+        for engine in engines
+    }
+    return FederatedSearchTool(
+        engine_tools=engine_tools,
+        max_results=max_search_results,
+        wikipedia_lang=get_search_config().get("wikipedia_lang", "en"),
+    )
+
+
+# Get the selected search tool
+def get_web_search_tool(max_search_results: int):
+    if SELECTED_SEARCH_ENGINE == SearchEngine.FEDERATED.value:
+        return create_federated_search_tool(max_search_results)
+    return create_search_tool(SELECTED_SEARCH_ENGINE, max_search_results)
@@ -0,0 +1,365 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+TTL cache for web search results.
+
+Research plans about the same companies and topics issue the same queries over
+and over, within a session and across users. Search tools created with
+``create_cached_search_tool`` look results up in a small in-process LRU first,
+then in a SQLite file shared by all workers, and only call the search API on a
+miss. Entries expire after a per-engine TTL. Within a research run, results
+already returned to an earlier step are served from the research registry
+(see src/tools/research_registry.py) first.
+
+Environment variables:
+    SEARCH_CACHE_ENABLED: Enable the cache (default: true).
+    SEARCH_CACHE_PATH: SQLite file shared between processes (default: unset,
+        only the in-process LRU is used).
+    SEARCH_CACHE_MEMORY_SIZE: Entries kept in the in-process LRU (default: 256).
+    SEARCH_CACHE_TTL: Default TTL in seconds (default: 3600; one week for
+        arxiv and one day for wikipedia).
+    SEARCH_CACHE_TTL_<ENGINE>: TTL override for one engine, e.g.
+        ``SEARCH_CACHE_TTL_TAVILY=600``. ``0`` disables caching for it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type, TypeVar
+
+from langchain_core.tools import BaseTool
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+from src.config.tools import SearchEngine
+from src.tools.research_registry import current_research_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Engines whose results change slowly and can be kept longer than the default
+DEFAULT_ENGINE_TTLS = {
+    SearchEngine.ARXIV.value: 7 * 24 * 3600,
+    SearchEngine.WIKIPEDIA.value: 24 * 3600,
+}
+
+# Tool and API wrapper fields that change the results of a query
+_TOOL_OPTION_FIELDS = (
+    "max_results",
+    "include_domains",
+    "exclude_domains",
+    "include_raw_content",
+    "include_images",
+    "include_image_descriptions",
+    "include_answer",
+    "search_depth",
+    "backend",
+    "output_format",
+    "keys_to_include",
+)
+_WRAPPER_OPTION_FIELDS = (
+    "top_k_results",
+    "load_max_docs",
+    "load_all_available_meta",
+    "doc_content_chars_max",
+    "lang",
+    "search_kwargs",
+    "region",
+    "safesearch",
+    "time",
+    "source",
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share an entry."""
+    return " ".join(str(query).lower().split())
+
+
+def _option_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)):
+        return sorted(str(item).strip().lower() for item in value)
+    return value
+
+
+def search_options(tool: Any) -> Dict[str, Any]:
+    """Return the options of a search tool that affect its results."""
+    options = {}
+    for name in _TOOL_OPTION_FIELDS:
+        value = getattr(tool, name, None)
+        if value is not None:
+            options[name] = _option_value(value)
+    for wrapper_name in ("api_wrapper", "search_wrapper"):
+        wrapper = getattr(tool, wrapper_name, None)
+        for name in _WRAPPER_OPTION_FIELDS:
+            value = getattr(wrapper, name, None) if wrapper is not None else None
+            if value is not None:
+                options[f"{wrapper_name}.{name}"] = _option_value(value)
+    return options
+
+
+def make_cache_key(engine: str, query: str, options: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"engine": engine, "query": normalize_query(query), "options": options},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _encode(result: Any) -> str:
+    # Tools with content_and_artifact responses return a (content, artifact) tuple
+    if isinstance(result, tuple):
+        return json.dumps({"tuple": True, "value": list(result)}, ensure_ascii=False)
+    return json.dumps({"tuple": False, "value": result}, ensure_ascii=False)
+
+
+def _decode(data: str) -> Any:
+    payload = json.loads(data)
+    return tuple(payload["value"]) if payload["tuple"] else payload["value"]
+
+
+def is_cacheable(result: Any) -> bool:
+    """Return whether a search result should be cached.
+
+    Tavily reports failures as ``(error repr, {})`` instead of raising, and
+    those must not be served from the cache.
+    """
+    if isinstance(result, tuple):
+        return len(result) == 2 and not (isinstance(result[0], str) and result[1] == {})
+    return result is not None
+
+
+class SearchCache:
+    """In-process LRU in front of an optional shared SQLite store."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_size: Optional[int] = None,
+        default_ttl: Optional[int] = None,
+    ):
+        self.path = path if path is not None else get_str_env("SEARCH_CACHE_PATH")
+        self.memory_size = (
+            memory_size
+            if memory_size is not None
+            else get_int_env("SEARCH_CACHE_MEMORY_SIZE", 256)
+        )
+        self.default_ttl = (
+            default_ttl
+            if default_ttl is not None
+            else get_int_env("SEARCH_CACHE_TTL", 3600)
+        )
+        self._lock = threading.Lock()
+        # key -> (expires_at, encoded result)
+        self._memory: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    engine TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def ttl_for(self, engine: str) -> int:
+        default = DEFAULT_ENGINE_TTLS.get(engine, self.default_ttl)
+        return get_int_env(f"SEARCH_CACHE_TTL_{engine.upper()}", default)
+
+    def _remember(self, key: str, expires_at: float, data: str) -> None:
+        self._memory[key] = (expires_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > max(0, self.memory_size):
+            self._memory.popitem(last=False)
+
+    def get(self, engine: str, key: str) -> Tuple[bool, Any]:
+        """Return ``(found, result)`` for ``key``."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._stats[engine]["memory_hits"] += 1
+                return True, _decode(entry[1])
+            self._memory.pop(key, None)
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT result, expires_at FROM search_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._remember(key, row[1], row[0])
+                    self._stats[engine]["disk_hits"] += 1
+                    return True, _decode(row[0])
+
+            self._stats[engine]["misses"] += 1
+            return False, None
+
+    def set(self, engine: str, key: str, result: Any) -> None:
+        ttl = self.ttl_for(engine)
+        if ttl <= 0:
+            return
+        try:
+            data = _encode(result)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Search result is not cacheable: {repr(e)}")
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, data)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                    (key, engine, data, expires_at),
+                )
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),)
+                )
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return hit/miss counters and hit rate per engine."""
+        with self._lock:
+            stats = {}
+            for engine, counters in self._stats.items():
+                hits = counters["memory_hits"] + counters["disk_hits"]
+                total = hits + counters["misses"]
+                stats[engine] = {
+                    **counters,
+                    "hit_rate": hits / total if total else 0.0,
+                }
+            return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._stats.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM search_cache")
+                self._conn.commit()
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the process-wide search cache, or ``None`` if disabled."""
+    global _search_cache
+    if not get_bool_env("SEARCH_CACHE_ENABLED", True):
+        return None
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
+
+
+def _query_from_args(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[str]:
+    if args:
+        return args[0]
+    return kwargs.get("query")
+
+
+class CachedSearchMixin:
+    """A mixin that serves search tool results from the search cache."""
+
+    cache_engine: ClassVar[str] = ""
+
+    def _cache_lookup(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        cache = get_search_cache()
+        registry = current_research_registry()
+        query = _query_from_args(args, kwargs)
+        if (cache is None and registry is None) or not isinstance(query, str):
+            return None, None, None
+        key = make_cache_key(self.cache_engine, query, search_options(self))
+        if registry is not None:
+            found, result = registry.get_search(key)
+            if found:
+                logger.info(
+                    f"Research registry hit for {self.cache_engine} query: {query}"
+                )
+                return cache, key, (result,)
+        if cache is not None:
+            found, result = cache.get(self.cache_engine, key)
+            if found:
+                logger.info(f"Search cache hit for {self.cache_engine} query: {query}")
+                if registry is not None:
+                    registry.record_search(self.cache_engine, key, query, result)
+                return cache, key, (result,)
+        return cache, key, None
+
+    def _cache_store(
+        self,
+        cache: Optional[SearchCache],
+        key: Optional[str],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        result: Any,
+    ):
+        if key is None or not is_cacheable(result):
+            return
+        if cache is not None:
+            cache.set(self.cache_engine, key, result)
+        registry = current_research_registry()
+        if registry is not None:
+            registry.record_search(
+                self.cache_engine, key, _query_from_args(args, kwargs), result
+            )
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        cache, key, hit = self._cache_lookup(args, kwargs)
+        if hit is not None:
+            return hit[0]
+        result = super()._run(*args, **kwargs)
+        self._cache_store(cache, key, args, kwargs, result)
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        if super()._arun.__func__ is BaseTool._arun:
+            # The default _arun runs _run in an executor, which is cached already
+            return await super()._arun(*args, **kwargs)
+        cache, key, hit = self._cache_lookup(args, kwargs)
+        if hit is not None:
+            return hit[0]
+        result = await super()._arun(*args, **kwargs)
+        self._cache_store(cache, key, args, kwargs, result)
+        return result
+
+
+def create_cached_search_tool(base_tool_class: Type[T], engine: str) -> Type[T]:
+    """
+    Factory function to create a version of a search tool class backed by the
+    search cache.
+
+    Args:
+        base_tool_class: The search tool class, usually a ``Logged*`` tool
+        engine: The search engine name, used for TTLs and metrics
+
+    Returns:
+        A new class with the same name that inherits from both
+        CachedSearchMixin and the base tool class
+    """
+
+    class CachedTool(CachedSearchMixin, base_tool_class):
+        cache_engine: ClassVar[str] = engine
+
+    CachedTool.__name__ = base_tool_class.__name__
+    return CachedTool
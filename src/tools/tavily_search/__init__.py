@@ -1,4 +1,11 @@
 from .tavily_search_api_wrapper import EnhancedTavilySearchAPIWrapper
 from .tavily_search_results_with_images import TavilySearchWithImages
+from .tavily_session import TavilySession, close_tavily_session, get_tavily_session
 
-__all__ = ["EnhancedTavilySearchAPIWrapper", "TavilySearchWithImages"]
+__all__ = [
+    "EnhancedTavilySearchAPIWrapper",
+    "TavilySearchWithImages",
+    "TavilySession",
+    "close_tavily_session",
+    "get_tavily_session",
+]
@@ -2,31 +2,30 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import json
 from typing import Dict, List, Optional
 
-import aiohttp
-import requests
 from langchain_tavily._utilities import TAVILY_API_URL
 from langchain_tavily.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from .tavily_session import get_tavily_session
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
-    def raw_results(
+    def _search_params(
         self,
         query: str,
-        max_results: Optional[int] = 5,
-        search_depth: Optional[str] = "advanced",
-        include_domains: Optional[List[str]] = [],
-        exclude_domains: Optional[List[str]] = [],
-        include_answer: Optional[bool] = False,
-        include_raw_content: Optional[bool] = False,
-        include_images: Optional[bool] = False,
-        include_image_descriptions: Optional[bool] = False,
+        max_results: Optional[int],
+        search_depth: Optional[str],
+        include_domains: Optional[List[str]],
+        exclude_domains: Optional[List[str]],
+        include_answer: Optional[bool],
+        include_raw_content: Optional[bool],
+        include_images: Optional[bool],
+        include_image_descriptions: Optional[bool],
     ) -> Dict:
-        params = {
+        return {
             "api_key": self.tavily_api_key.get_secret_value(),
             "query": query,
             "max_results": max_results,
@@ -38,11 +37,31 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
-            # type: ignore
-            f"{TAVILY_API_URL}/search",
-            json=params,
+
+    def raw_results(
+        self,
+        query: str,
+        max_results: Optional[int] = 5,
+        search_depth: Optional[str] = "advanced",
+        include_domains: Optional[List[str]] = [],
+        exclude_domains: Optional[List[str]] = [],
+        include_answer: Optional[bool] = False,
+        include_raw_content: Optional[bool] = False,
+        include_images: Optional[bool] = False,
+        include_image_descriptions: Optional[bool] = False,
+    ) -> Dict:
+        params = self._search_params(
+            query,
+            max_results,
+            search_depth,
+            include_domains,
+            exclude_domains,
+            include_answer,
+            include_raw_content,
+            include_images,
+            include_image_descriptions,
         )
+        response = get_tavily_session().post(f"{TAVILY_API_URL}/search", params)
         response.raise_for_status()
         return response.json()
 
@@ -59,31 +78,21 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
         include_image_descriptions: Optional[bool] = False,
     ) -> Dict:
         """Get results from the Tavily Search API asynchronously."""
-
-        # Function to perform the API call
-        async def fetch() -> str:
-            params = {
-                "api_key": self.tavily_api_key.get_secret_value(),
-                "query": query,
-                "max_results": max_results,
-                "search_depth": search_depth,
-                "include_domains": include_domains,
-                "exclude_domains": exclude_domains,
-                "include_answer": include_answer,
-                "include_raw_content": include_raw_content,
-                "include_images": include_images,
-                "include_image_descriptions": include_image_descriptions,
-            }
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
-
-        results_json_str = await fetch()
-        return json.loads(results_json_str)
+        params = self._search_params(
+            query,
+            max_results,
+            search_depth,
+            include_domains,
+            exclude_domains,
+            include_answer,
+            include_raw_content,
+            include_images,
+            include_image_descriptions,
+        )
+        response = await get_tavily_session().apost(f"{TAVILY_API_URL}/search", params)
+        if response.status_code != 200:
+            raise Exception(f"Error {response.status_code}: {response.reason_phrase}")
+        return response.json()
 
     def clean_results_with_images(
         self, raw_results: Dict[str, List[Dict]]
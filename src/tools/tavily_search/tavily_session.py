@@ -0,0 +1,209 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pooled HTTP session shared by all Tavily API calls.
+
+Each search used to open a new connection (and TLS session) to the Tavily
+API. ``TavilySession`` keeps keep-alive connections in one httpx client for
+synchronous calls and one per event loop for async calls, so concurrent
+searches share a bounded pool. Transient failures (connection errors,
+timeouts, 429 and 5xx responses) are retried with full-jitter exponential
+backoff, honoring ``Retry-After``. Every attempt goes through the outbound
+governor (see src/utils/outbound.py), which rate limits the API key and fails
+fast while Tavily is unhealthy.
+
+Environment variables:
+    TAVILY_MAX_CONNECTIONS: Connections per pool (default: 20).
+    TAVILY_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default: 60).
+    TAVILY_TIMEOUT: Request timeout in seconds (default: 30).
+    TAVILY_MAX_RETRIES: Retries after the first attempt (default: 2).
+    TAVILY_RETRY_BACKOFF_MS: Base backoff delay (default: 500).
+    TAVILY_RETRY_MAX_BACKOFF_MS: Longest delay between attempts (default: 8000).
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.config.loader import get_int_env
+from src.utils.outbound import get_outbound_governor
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Name of the Tavily API in the outbound governor
+PROVIDER = "tavily"
+
+
+class TavilySession:
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        keepalive_expiry: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+        transport: Optional[Any] = None,
+    ):
+        self.max_connections = max(
+            1,
+            max_connections
+            if max_connections is not None
+            else get_int_env("TAVILY_MAX_CONNECTIONS", 20),
+        )
+        self.keepalive_expiry = (
+            keepalive_expiry
+            if keepalive_expiry is not None
+            else get_int_env("TAVILY_KEEPALIVE_EXPIRY", 60)
+        )
+        self.timeout = (
+            timeout if timeout is not None else get_int_env("TAVILY_TIMEOUT", 30)
+        )
+        self.max_retries = max(
+            0,
+            max_retries
+            if max_retries is not None
+            else get_int_env("TAVILY_MAX_RETRIES", 2),
+        )
+        self.backoff = (
+            backoff
+            if backoff is not None
+            else get_int_env("TAVILY_RETRY_BACKOFF_MS", 500) / 1000
+        )
+        self.max_backoff = (
+            max_backoff
+            if max_backoff is not None
+            else get_int_env("TAVILY_RETRY_MAX_BACKOFF_MS", 8000) / 1000
+        )
+        # Only used by tests to plug in an ``httpx.MockTransport``
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        # httpx async clients cannot be shared across event loops
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _client_options(self) -> Dict[str, Any]:
+        options = {
+            "timeout": httpx.Timeout(self.timeout),
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        }
+        if self._transport is not None:
+            options["transport"] = self._transport
+        return options
+
+    def get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.Client(**self._client_options())
+            return self._client
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**self._client_options())
+            self._async_clients[loop] = client
+        return client
+
+    def retry_delay(
+        self, attempt: int, response: Optional[httpx.Response] = None
+    ) -> float:
+        """Seconds to wait before retry number ``attempt`` (starting at 0)."""
+        retry_after = response.headers.get("retry-after") if response else None
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _should_retry(self, attempt: int, response: httpx.Response) -> bool:
+        return response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries
+
+    def post(self, url: str, payload: Dict[str, Any]) -> httpx.Response:
+        """POST ``payload`` as JSON, retrying transient failures."""
+        client = self.get_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                with get_outbound_governor().limit(
+                    PROVIDER, payload.get("api_key")
+                ) as permit:
+                    response = client.post(url, json=payload)
+                    permit.record_response(response)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Tavily request failed, retrying: {repr(e)}")
+                time.sleep(self.retry_delay(attempt))
+                continue
+            if not self._should_retry(attempt, response):
+                return response
+            logger.warning(f"Tavily returned {response.status_code}, retrying")
+            time.sleep(self.retry_delay(attempt, response))
+
+    async def apost(self, url: str, payload: Dict[str, Any]) -> httpx.Response:
+        """Async version of ``post`` using the client of the running loop."""
+        client = self.get_async_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with get_outbound_governor().alimit(
+                    PROVIDER, payload.get("api_key")
+                ) as permit:
+                    response = await client.post(url, json=payload)
+                    permit.record_response(response)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Tavily request failed, retrying: {repr(e)}")
+                await asyncio.sleep(self.retry_delay(attempt))
+                continue
+            if not self._should_retry(attempt, response):
+                return response
+            logger.warning(f"Tavily returned {response.status_code}, retrying")
+            await asyncio.sleep(self.retry_delay(attempt, response))
+
+    async def aclose(self) -> None:
+        """Close the pooled connections (idempotent)."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+        clients = list(self._async_clients.values())
+        self._async_clients.clear()
+        for async_client in clients:
+            try:
+                await async_client.aclose()
+            except Exception as e:
+                # Clients of other, already closed, event loops
+                logger.debug(f"Error closing Tavily client: {repr(e)}")
+
+
+_tavily_session: Optional[TavilySession] = None
+_tavily_session_lock = threading.Lock()
+
+
+def get_tavily_session() -> TavilySession:
+    """Return the process-wide Tavily session."""
+    global _tavily_session
+    with _tavily_session_lock:
+        if _tavily_session is None:
+            _tavily_session = TavilySession()
+        return _tavily_session
+
+
+async def close_tavily_session() -> None:
+    """Close the process-wide Tavily session, if any."""
+    global _tavily_session
+    with _tavily_session_lock:
+        session, _tavily_session = _tavily_session, None
+    if session is not None:
+        await session.aclose()
@@ -12,8 +12,13 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from src.utils.outbound import get_outbound_governor
+
 logger = logging.getLogger(__name__)
 
+# Name of the TTS API in the outbound governor
+PROVIDER = "volcengine_tts"
+
 
 class VolcengineTTS:
     """
@@ -105,9 +110,11 @@ class VolcengineTTS:
         try:
             sanitized_text = text.replace("\r\n", "").replace("\n", "")
             logger.debug(f"Sending TTS request for text: {sanitized_text[:50]}...")
-            response = requests.post(
-                self.api_url, json.dumps(request_json), headers=self.header
-            )
+            with get_outbound_governor().limit(PROVIDER, self.access_token) as permit:
+                response = requests.post(
+                    self.api_url, json.dumps(request_json), headers=self.header
+                )
+                permit.record_response(response)
             response_json = response.json()
 
             if response.status_code != 200:
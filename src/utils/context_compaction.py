@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Token-budgeted compaction of research findings.
+
+Every agent step receives the findings of all previously completed steps and
+the reporter receives every observation, so prompts grow with plan length.
+These helpers fit the findings into a token budget: findings are included in
+full while they fit, and otherwise replaced by a short extractive summary,
+upgrading the most recent findings back to full text first.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+# Rough average for English text with GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Size of the per-step summaries cached on ``Step.summary``
+DEFAULT_SUMMARY_TOKENS = 300
+
+_MARKDOWN_LINK_RE = re.compile(r"\[[^\]]+\]\([^)]+\)")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Roughly estimate the number of tokens in ``text``."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def summarize_text(text: str, max_tokens: int = DEFAULT_SUMMARY_TOKENS) -> str:
+    """Return an extractive summary of a markdown finding within ``max_tokens``.
+
+    Keeps headings, the lead sentence of each paragraph and reference links,
+    which is what later steps and the reporter mostly need from a finding.
+    """
+    max_chars = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    points: List[str] = []
+    links: List[str] = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [line.strip() for line in block.strip().splitlines() if line.strip()]
+        if not lines:
+            continue
+        if lines[0].startswith("#"):
+            points.append(lines[0])
+            lines = lines[1:]
+        link_lines = [line for line in lines if _MARKDOWN_LINK_RE.search(line)]
+        if link_lines and len(link_lines) == len(lines):
+            links.extend(link_lines)
+        elif lines:
+            points.append(_SENTENCE_END_RE.split(" ".join(lines), maxsplit=1)[0])
+
+    # Reserve at most half of the budget for references
+    links_text = ""
+    for line in links:
+        candidate = f"{links_text}\n{line}" if links_text else line
+        if len(candidate) > max_chars // 2:
+            break
+        links_text = candidate
+
+    points_budget = max_chars - len(links_text) - (2 if links_text else 0)
+    points_text = "\n".join(points)
+    if len(points_text) > points_budget:
+        points_text = points_text[: max(0, points_budget - 3)].rstrip() + "..."
+    return f"{points_text}\n\n{links_text}" if links_text else points_text
+
+
+@dataclass
+class CompactionResult:
+    """Findings selected for a prompt and the tokens saved by compaction."""
+
+    texts: List[str] = field(default_factory=list)
+    full_tokens: int = 0
+    used_tokens: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.full_tokens - self.used_tokens)
+
+
+def compact_findings(
+    findings: Sequence[Tuple[str, Optional[str]]], budget_tokens: int
+) -> CompactionResult:
+    """Fit findings into ``budget_tokens``.
+
+    Args:
+        findings: ``(full_text, cached_summary)`` pairs, oldest first. Missing
+            summaries are computed on the fly.
+        budget_tokens: Token budget for all findings; ``0`` or less disables
+            compaction.
+
+    Returns:
+        A ``CompactionResult`` with one text per finding, in the same order.
+    """
+    full_texts = [full_text or "" for full_text, _ in findings]
+    full_costs = [estimate_tokens(text) for text in full_texts]
+    full_tokens = sum(full_costs)
+    if budget_tokens <= 0 or full_tokens <= budget_tokens:
+        return CompactionResult(full_texts, full_tokens, full_tokens)
+
+    texts = [
+        summary or summarize_text(full_text)
+        for full_text, (_, summary) in zip(full_texts, findings)
+    ]
+    costs = [estimate_tokens(text) for text in texts]
+    if sum(costs) > budget_tokens:
+        # Even the summaries do not fit: give each finding an equal share
+        share = budget_tokens // len(texts)
+        texts = [summarize_text(text, share) for text in texts]
+        costs = [estimate_tokens(text) for text in texts]
+
+    # Use the full text where the budget allows, most recent findings first
+    used_tokens = sum(costs)
+    for i in reversed(range(len(texts))):
+        extra = full_costs[i] - costs[i]
+        if used_tokens + extra <= budget_tokens:
+            texts[i] = full_texts[i]
+            used_tokens += extra
+
+    return CompactionResult(texts, full_tokens, used_tokens)
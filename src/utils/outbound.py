@@ -0,0 +1,565 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Rate limits and circuit breakers for outbound API calls.
+
+Search, crawl, embedding, TTS and LLM requests share one ``OutboundGovernor``.
+Calls are grouped by provider and API key, and every group gets:
+
+- a token bucket limiting requests per minute, paused by ``Retry-After`` (or
+  one second) whenever the provider answers 429, so retries of concurrent
+  callers do not pile on a throttled provider;
+- an optional cap on concurrent calls;
+- a circuit breaker that opens after consecutive failures (exceptions, 429 and
+  5xx responses) and fails fast with ``CircuitOpenError`` until a probe call
+  succeeds again. Calls cancelled by the caller, e.g. the losing engine of a
+  hedged search or a tool timeout, are not failures.
+
+Time spent waiting for a slot and a token is reported by ``get_stats``.
+
+Use ``governor.limit(provider, api_key)`` (or ``alimit`` in async code) around
+one outbound request, or ``governed_http_clients`` for SDKs that accept httpx
+clients. ``get_governed_async_client`` returns a pooled client of the running
+event loop for code calling a provider's HTTP API directly.
+
+Environment variables:
+    OUTBOUND_RPM: Default requests per minute of a provider (default: 0,
+        unlimited).
+    OUTBOUND_CONCURRENCY: Default concurrent calls of a provider (default: 0,
+        unlimited).
+    OUTBOUND_BREAKER_FAILURES: Consecutive failures opening the circuit
+        (default: 5, 0 disables the breaker).
+    OUTBOUND_BREAKER_RESET_S: Seconds before an open circuit lets a probe call
+        through (default: 30).
+    OUTBOUND_TIMEOUT_S: Timeout of the pooled async clients (default: 30).
+    OUTBOUND_<PROVIDER>_RPM, OUTBOUND_<PROVIDER>_BURST,
+    OUTBOUND_<PROVIDER>_CONCURRENCY: Overrides for one provider, e.g.
+        ``OUTBOUND_JINA_RPM=20``.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+from src.config.loader import get_int_env
+
+# Seconds a provider is paused after a 429 without a usable Retry-After
+DEFAULT_RETRY_AFTER = 1.0
+# Raised into calls abandoned by the caller rather than failed by the provider
+_CANCELLED = (asyncio.CancelledError, GeneratorExit)
+
+
+class CircuitOpenError(Exception):
+    """The provider failed repeatedly and calls are rejected for a while."""
+
+
+def _retry_after(value: Optional[str]) -> float:
+    if value and value.strip().isdigit():
+        return float(value)
+    return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second with bursts of ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self.rate > 0:
+                elapsed = now - self._updated
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated = now
+                # Tokens go negative so later callers queue behind earlier ones
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for ``seconds``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a call may go out now."""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+            # Half open: a single probe decides whether the circuit closes
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_cancelled(self) -> None:
+        """Forget a cancelled call, it says nothing about the provider.
+
+        A cancelled probe lets the next call probe the provider instead.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class Permit:
+    """A granted outbound call, used to report the provider's response."""
+
+    def __init__(self, limiter: "ProviderLimiter"):
+        self._limiter = limiter
+        self.failed = False
+
+    def record_response(self, response: Any) -> None:
+        """Inspect a ``requests`` or ``httpx`` response for throttling."""
+        status = response.status_code
+        if status == 429:
+            self._limiter.bucket.pause(
+                _retry_after(response.headers.get("retry-after"))
+            )
+        if status == 429 or status >= 500:
+            self.failed = True
+
+
+class ProviderLimiter:
+    """Rate limit, concurrency cap and circuit breaker of one provider and key."""
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        burst: int,
+        max_concurrency: int,
+        failure_threshold: int,
+        reset_timeout: float,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rpm / 60, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        # 0 leaves concurrency unlimited, e.g. for long LLM streams
+        self.max_concurrency = max(0, max_concurrency)
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._calls = 0
+        self._failures = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=200)
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            with self._cond:
+                self._rejected += 1
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+    def _has_slot(self) -> bool:
+        return not self.max_concurrency or self._active < self.max_concurrency
+
+    def _try_take_slot(self) -> bool:
+        with self._cond:
+            if self._has_slot():
+                self._active += 1
+                return True
+            return False
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._cond:
+            self._calls += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            self._recent_waits.append(seconds)
+
+    def acquire(self) -> Permit:
+        self._admit()
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            while not self._has_slot():
+                self._cond.wait()
+            self._active += 1
+            self._waiting -= 1
+        time.sleep(self.bucket.reserve())
+        self._record_wait(time.monotonic() - start)
+        return Permit(self)
+
+    async def aacquire(self) -> Permit:
+        self._admit()
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+        try:
+            # Slots are shared with threads, so they are polled instead of
+            # awaited on an asyncio primitive bound to one loop
+            delay = 0.005
+            while not self._try_take_slot():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        except BaseException:
+            self.breaker.record_cancelled()
+            raise
+        finally:
+            with self._cond:
+                self._waiting -= 1
+        try:
+            await asyncio.sleep(self.bucket.reserve())
+        except BaseException:
+            self.release(Permit(self), failed=False, cancelled=True)
+            raise
+        self._record_wait(time.monotonic() - start)
+        return Permit(self)
+
+    def release(self, permit: Permit, failed: bool, cancelled: bool = False) -> None:
+        """Free the slot of ``permit`` and report the outcome to the breaker.
+
+        A call cancelled before the provider answered counts as neither a
+        success nor a failure.
+        """
+        if permit.failed or (failed and not cancelled):
+            self.breaker.record_failure()
+            with self._cond:
+                self._failures += 1
+        elif cancelled:
+            self.breaker.record_cancelled()
+        else:
+            self.breaker.record_success()
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._recent_waits)
+            p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0
+            return {
+                "calls": self._calls,
+                "failures": self._failures,
+                "rejected": self._rejected,
+                "in_flight": self._active,
+                "waiting": self._waiting,
+                "circuit": self.breaker.state,
+                "queue_wait_avg_ms": round(
+                    self._wait_total / self._calls * 1000 if self._calls else 0, 1
+                ),
+                "queue_wait_p95_ms": round(p95 * 1000, 1),
+                "queue_wait_max_ms": round(self._wait_max * 1000, 1),
+            }
+
+
+def _key_label(api_key: Optional[str]) -> str:
+    # API keys are never logged or reported, only a short fingerprint
+    return hashlib.sha256(api_key.encode()).hexdigest()[:8] if api_key else ""
+
+
+class OutboundGovernor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+
+    def limiter(self, provider: str, api_key: Optional[str] = None) -> ProviderLimiter:
+        key = (provider, _key_label(api_key))
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = self._create_limiter(*key)
+            return limiter
+
+    def _create_limiter(self, provider: str, key_label: str) -> ProviderLimiter:
+        prefix = f"OUTBOUND_{provider.upper()}_"
+        rpm = get_int_env(f"{prefix}RPM", get_int_env("OUTBOUND_RPM", 0))
+        return ProviderLimiter(
+            name=f"{provider}:{key_label}" if key_label else provider,
+            rpm=rpm,
+            burst=get_int_env(f"{prefix}BURST", max(1, rpm // 60)),
+            max_concurrency=get_int_env(
+                f"{prefix}CONCURRENCY", get_int_env("OUTBOUND_CONCURRENCY", 0)
+            ),
+            failure_threshold=get_int_env("OUTBOUND_BREAKER_FAILURES", 5),
+            reset_timeout=get_int_env("OUTBOUND_BREAKER_RESET_S", 30),
+        )
+
+    @contextmanager
+    def limit(self, provider: str, api_key: Optional[str] = None) -> Iterator[Permit]:
+        """Wrap one outbound call; exceptions count as provider failures."""
+        limiter = self.limiter(provider, api_key)
+        permit = limiter.acquire()
+        failed, cancelled = True, False
+        try:
+            yield permit
+            failed = False
+        except _CANCELLED:
+            cancelled = True
+            raise
+        finally:
+            limiter.release(permit, failed, cancelled)
+
+    @asynccontextmanager
+    async def alimit(
+        self, provider: str, api_key: Optional[str] = None
+    ) -> AsyncIterator[Permit]:
+        """Async version of ``limit``."""
+        limiter = self.limiter(provider, api_key)
+        permit = await limiter.aacquire()
+        failed, cancelled = True, False
+        try:
+            yield permit
+            failed = False
+        except _CANCELLED:
+            cancelled = True
+            raise
+        finally:
+            limiter.release(permit, failed, cancelled)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return call, failure and queue wait metrics per provider and key."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.get_stats() for limiter in limiters}
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Keeps the permit of a streamed response until the body is closed."""
+
+    def __init__(self, stream: Any, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _once(func):
+    done = threading.Lock()
+
+    def wrapper(*args: Any) -> None:
+        if done.acquire(blocking=False):
+            func(*args)
+
+    return wrapper
+
+
+class GovernedTransport(httpx.BaseTransport):
+    """httpx transport sending every request through the governor."""
+
+    def __init__(
+        self,
+        provider: str,
+        api_key: Optional[str] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        governor: Optional[OutboundGovernor] = None,
+    ):
+        self.provider = provider
+        self.api_key = api_key
+        self._transport = transport or httpx.HTTPTransport()
+        self._governor = governor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = (self._governor or get_outbound_governor()).limiter(
+            self.provider, self.api_key
+        )
+        permit = limiter.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except _CANCELLED:
+            limiter.release(permit, failed=False, cancelled=True)
+            raise
+        except BaseException:
+            limiter.release(permit, failed=True)
+            raise
+        permit.record_response(response)
+        release = _once(lambda: limiter.release(permit, failed=False))
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncGovernedTransport(httpx.AsyncBaseTransport):
+    """Async version of ``GovernedTransport``."""
+
+    def __init__(
+        self,
+        provider: str,
+        api_key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        governor: Optional[OutboundGovernor] = None,
+    ):
+        self.provider = provider
+        self.api_key = api_key
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._governor = governor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = (self._governor or get_outbound_governor()).limiter(
+            self.provider, self.api_key
+        )
+        permit = await limiter.aacquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except _CANCELLED:
+            limiter.release(permit, failed=False, cancelled=True)
+            raise
+        except BaseException:
+            limiter.release(permit, failed=True)
+            raise
+        permit.record_response(response)
+        release = _once(lambda: limiter.release(permit, failed=False))
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def governed_http_clients(
+    provider: str, api_key: Optional[str] = None, verify: bool = True
+) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Return sync and async httpx clients whose requests are governed."""
+    return (
+        httpx.Client(
+            transport=GovernedTransport(
+                provider, api_key, httpx.HTTPTransport(verify=verify)
+            )
+        ),
+        httpx.AsyncClient(
+            transport=AsyncGovernedTransport(
+                provider, api_key, httpx.AsyncHTTPTransport(verify=verify)
+            )
+        ),
+    )
+
+
+# One pool of clients per event loop, httpx clients cannot be shared across loops
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_governed_async_client(
+    provider: str, api_key: Optional[str] = None
+) -> httpx.AsyncClient:
+    """Return the pooled governed async client of the running event loop."""
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((provider, api_key))
+    if client is None or client.is_closed:
+        client = clients[(provider, api_key)] = httpx.AsyncClient(
+            transport=AsyncGovernedTransport(provider, api_key),
+            timeout=httpx.Timeout(get_int_env("OUTBOUND_TIMEOUT_S", 30)),
+        )
+    return client
+
+
+async def close_governed_async_clients() -> None:
+    """Close the pooled async clients of the running event loop, if any."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+_outbound_governor: Optional[OutboundGovernor] = None
+_outbound_governor_lock = threading.Lock()
+
+
+def get_outbound_governor() -> OutboundGovernor:
+    """Return the process-wide outbound governor."""
+    global _outbound_governor
+    with _outbound_governor_lock:
+        if _outbound_governor is None:
+            _outbound_governor = OutboundGovernor()
+        return _outbound_governor
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark the article extractors on a corpus of saved HTML pages.
+
+Usage:
+    uv run python -m tests.benchmark.extractor_benchmark \\
+        [--corpus DIR] [--engines fast readability] [--repeat 5]
+
+For every engine it prints the extraction latency per page and the
+throughput. When the readability engine is benchmarked as well, the token
+overlap of the other engines' markdown with the readability markdown is
+reported as a quality check.
+"""
+
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from src.config.tools import ExtractorEngine
+from src.crawler import create_extractor
+
+DEFAULT_CORPUS = (
+    Path(__file__).parent.parent / "unit" / "crawler" / "fixtures" / "extractor"
+)
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"[一-鿿]|\w+", text.lower()))
+
+
+def _similarity(a: str, b: str) -> float:
+    tokens_a, tokens_b = _tokens(a), _tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return 2 * len(tokens_a & tokens_b) / (len(tokens_a) + len(tokens_b))
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run(corpus: Path, engines: List[str], repeat: int) -> None:
+    pages = {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(corpus.glob("*.html"))
+    }
+    if not pages:
+        raise SystemExit(f"No .html files found in {corpus}")
+    size = sum(len(html) for html in pages.values())
+    print(f"Corpus: {len(pages)} pages, {size / 1024:.0f} KiB, {repeat} runs\n")
+
+    markdown: Dict[str, Dict[str, str]] = {}
+    for engine in engines:
+        extractor = create_extractor(engine)
+        latencies = []
+        markdown[engine] = {}
+        for name, html in pages.items():
+            for _ in range(repeat):
+                start = time.perf_counter()
+                article = extractor.extract_article(html)
+                latencies.append(time.perf_counter() - start)
+            markdown[engine][name] = article.to_markdown(including_title=False)
+        total = sum(latencies)
+        print(
+            f"{engine:<12} mean {statistics.mean(latencies) * 1000:8.2f} ms"
+            f"  p50 {_percentile(latencies, 50) * 1000:8.2f} ms"
+            f"  p95 {_percentile(latencies, 95) * 1000:8.2f} ms"
+            f"  {len(latencies) / total:8.1f} pages/s"
+        )
+
+    reference = ExtractorEngine.READABILITY.value
+    if reference in markdown and len(markdown) > 1:
+        print(f"\nToken overlap with {reference}:")
+        for engine in engines:
+            if engine == reference:
+                continue
+            for name in pages:
+                score = _similarity(markdown[engine][name], markdown[reference][name])
+                print(f"{engine:<12} {name:<40} {score:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=[ExtractorEngine.FAST.value, ExtractorEngine.READABILITY.value],
+        choices=[engine.value for engine in ExtractorEngine],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.corpus, args.engines, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
+import asyncio
 import json
+import time
 from collections import namedtuple
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.agents.step_budget import StepBudgetExceeded, current_step_budget
 from src.graph.nodes import (
     _execute_agent_step,
     _setup_and_execute_agent_step,
@@ -11,8 +14,11 @@ from src.graph.nodes import (
     human_feedback_node,
     planner_node,
     reporter_node,
+    research_team_node,
     researcher_node,
 )
+from src.graph.types import add_or_reset
+from src.tools.research_registry import get_research_registry
 
 # 在这里 mock 掉 get_llm_by_type，避免 ValueError
 with patch("src.llms.llm.get_llm_by_type", return_value=MagicMock()):
@@ -721,6 +727,8 @@ def mock_state_reporter_with_observations():
 @pytest.fixture
 def mock_configurable_reporter():
     mock = MagicMock()
+    mock.observations_token_budget = 32000
+    mock.enable_map_reduce_report = False
     return mock
 
 
@@ -789,6 +797,54 @@ def test_reporter_node_basic(
         mock_llm.invoke.assert_called()
 
 
+def test_research_runs_on_one_thread_do_not_share_registry(
+    mock_state_coordinator,
+    patch_config_from_runnable_config_coordinator,
+    patch_apply_prompt_template_coordinator,
+    patch_handoff_to_planner,
+    patch_logger,
+    mock_state_reporter,
+    patch_config_from_runnable_config_reporter,
+    patch_apply_prompt_template_reporter,
+    patch_human_message,
+):
+    config = {"configurable": {"thread_id": "default"}}
+    get_research_registry("default").record_search(
+        "tavily", "key", "earlier topic", "results"
+    )
+    tool_calls = [{"name": "handoff_to_planner", "args": {}}]
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"coordinator": "basic"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        mock_llm = MagicMock()
+        mock_llm.bind_tools.return_value = mock_llm
+        mock_llm.invoke.return_value = make_mock_llm_response(tool_calls)
+        mock_get_llm.return_value = mock_llm
+
+        result = coordinator_node(mock_state_coordinator, config)
+
+    # Compaction savings are counted per run as well
+    assert result.update["context_tokens_saved"] is None
+    assert add_or_reset(1200, None) == 0
+    assert add_or_reset(0, 300) == 300
+    registry = get_research_registry("default")
+    assert registry.get_search("key") == (False, None)
+    assert registry.digest() == ""
+
+    registry.record_search("tavily", "key", "new topic", "results")
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"reporter": "basic"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        mock_get_llm.return_value.invoke.return_value = make_mock_llm_response_reporter(
+            "Report"
+        )
+        reporter_node(mock_state_reporter, config)
+
+    assert get_research_registry("default").queries() == []
+
+
 def test_reporter_node_with_observations(
     mock_state_reporter_with_observations,
     patch_config_from_runnable_config_reporter,
@@ -816,6 +872,43 @@ def test_reporter_node_with_observations(
         mock_llm.invoke.assert_called()
 
 
+def test_reporter_node_map_reduce(
+    mock_state_reporter_with_observations,
+    mock_configurable_reporter,
+    patch_config_from_runnable_config_reporter,
+    patch_apply_prompt_template_reporter,
+):
+    # Observation groups are condensed concurrently before the final report
+    mock_configurable_reporter.enable_map_reduce_report = True
+    mock_configurable_reporter.report_group_size = 1
+    mock_configurable_reporter.max_report_map_concurrency = 2
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"reporter": "basic"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        mock_llm = MagicMock()
+        mock_llm.batch.return_value = [
+            make_mock_llm_response_reporter("Draft 1"),
+            make_mock_llm_response_reporter("Draft 2"),
+        ]
+        mock_llm.invoke.return_value = make_mock_llm_response_reporter("Final")
+        mock_get_llm.return_value = mock_llm
+
+        result = reporter_node(mock_state_reporter_with_observations, MagicMock())
+
+    assert result["final_report"] == "Final"
+    batch_inputs, batch_kwargs = mock_llm.batch.call_args
+    assert len(batch_inputs[0]) == 2
+    assert batch_inputs[0][0][1].content == "Observation 1"
+    assert batch_kwargs["config"]["max_concurrency"] == 2
+    assert "nostream" in batch_kwargs["config"]["tags"]
+    final_messages = mock_llm.invoke.call_args[0][0]
+    contents = [m.content for m in final_messages if hasattr(m, "content")]
+    assert any("Draft 1" in c for c in contents)
+    assert any("Draft 2" in c for c in contents)
+    assert not any("Observation 1" in c for c in contents)
+
+
 def test_reporter_node_locale_default(
     patch_config_from_runnable_config_reporter,
     patch_apply_prompt_template_reporter,
@@ -1038,6 +1131,95 @@ async def test_execute_agent_step_recursion_limit_env_negative(
         )
 
 
+@pytest.mark.asyncio
+async def test_execute_agent_step_compacts_completed_steps(mock_agent):
+    # Prior findings over the token budget are replaced by their summaries
+    long_finding = "Lead sentence. " + "filler " * 400
+    completed = Step(title="Step 0", description="Desc 0", execution_res=long_finding)
+    completed.summary = "cached summary"
+    Plan = MagicMock()
+    Plan.steps = [completed, Step(title="Step 1", description="Desc 1")]
+    state = {
+        "current_plan": Plan,
+        "observations": [long_finding],
+        "locale": "en-US",
+        "resources": [],
+    }
+    captured = {}
+
+    async def ainvoke(input, config):
+        captured["content"] = input["messages"][0].content
+        return {"messages": [MagicMock(content="result content")]}
+
+    mock_agent.ainvoke = ainvoke
+    config = {"configurable": {"completed_steps_token_budget": 100}}
+    with patch(
+        "src.graph.nodes.HumanMessage",
+        side_effect=lambda content, name=None: MagicMock(content=content, name=name),
+    ):
+        result = await _execute_agent_step(state, mock_agent, "researcher", config)
+    assert "<finding>\ncached summary\n</finding>" in captured["content"]
+    assert result.update["context_tokens_saved"] > 0
+    assert Plan.steps[1].summary == "result content"
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_step_parallel_step_index(mock_agent):
+    # A step dispatched in parallel reports its result instead of mutating the plan
+    Plan = MagicMock()
+    Plan.steps = [
+        Step(title="Step 0", description="Desc 0"),
+        Step(title="Step 1", description="Desc 1"),
+    ]
+    state = {
+        "current_plan": Plan,
+        "observations": [],
+        "locale": "en-US",
+        "resources": [],
+        "current_step_index": 1,
+    }
+    with patch(
+        "src.graph.nodes.HumanMessage",
+        side_effect=lambda content, name=None: MagicMock(content=content, name=name),
+    ):
+        result = await _execute_agent_step(state, mock_agent, "researcher")
+    assert result.goto == "research_team"
+    assert "observations" not in result.update
+    assert result.update["pending_step_results"] == [
+        {
+            "step_index": 1,
+            "execution_res": "result content",
+            "summary": "result content",
+            "end_reason": "completed",
+        }
+    ]
+    assert Plan.steps[1].execution_res is None
+
+
+def test_research_team_node_merges_parallel_results_in_step_order():
+    Plan = MagicMock()
+    Plan.steps = [
+        Step(title="Step 0", description="Desc 0"),
+        Step(title="Step 1", description="Desc 1"),
+    ]
+    state = {
+        "current_plan": Plan,
+        "observations": ["earlier"],
+        "pending_step_results": [
+            {"step_index": 1, "execution_res": "second"},
+            {"step_index": 0, "execution_res": "first"},
+        ],
+    }
+    result = research_team_node(state)
+    assert result["observations"] == ["earlier", "first", "second"]
+    assert result["pending_step_results"] is None
+    assert [step.execution_res for step in Plan.steps] == ["first", "second"]
+
+
+def test_research_team_node_without_pending_results():
+    assert research_team_node({"observations": []}) is None
+
+
 @pytest.fixture
 def mock_configurable_with_mcp():
     mock = MagicMock()
@@ -1091,7 +1273,7 @@ def patch_create_agent():
 
 @pytest.fixture
 def patch_execute_agent_step():
-    async def fake_execute_agent_step(state, agent, agent_type):
+    async def fake_execute_agent_step(state, agent, agent_type, config=None):
         return "EXECUTED"
 
     with patch(
@@ -1102,29 +1284,21 @@ def patch_execute_agent_step():
 
 @pytest.fixture
 def patch_multiserver_mcp_client():
-    # Patch MultiServerMCPClient as async context manager
+    # Patch the shared MCP session pool
     class FakeTool:
         def __init__(self, name, description="desc"):
             self.name = name
             self.description = description
 
-    class FakeClient:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            pass
-
-        async def get_tools(self):
+    class FakePool:
+        async def get_tools(self, servers):
             return [
                 FakeTool("toolA", "descA"),
                 FakeTool("toolB", "descB"),
                 FakeTool("toolC", "descC"),
             ]
 
-    with patch(
-        "src.graph.nodes.MultiServerMCPClient", return_value=FakeClient()
-    ) as mock:
+    with patch("src.graph.nodes.get_mcp_session_pool", return_value=FakePool()) as mock:
         yield mock
 
 
@@ -1236,23 +1410,17 @@ async def test_setup_and_execute_agent_step_with_mcp_tools_description_update(
     default_tools = [MagicMock(name="default_tool")]
     agent_type = "researcher"
 
-    # Patch MultiServerMCPClient to check description update
+    # Patch the MCP session pool to check description update
     class FakeTool:
         def __init__(self, name, description="desc"):
             self.name = name
             self.description = description
 
-    class FakeClient:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            pass
-
-        async def get_tools(self):
+    class FakePool:
+        async def get_tools(self, servers):
             return [FakeTool("toolA", "descA")]
 
-    with patch("src.graph.nodes.MultiServerMCPClient", return_value=FakeClient()):
+    with patch("src.graph.nodes.get_mcp_session_pool", return_value=FakePool()):
         await _setup_and_execute_agent_step(
             mock_state_with_steps,
             mock_config,
@@ -1385,3 +1553,53 @@ async def test_researcher_node_without_resources(
     tools = args[3]
     assert patch_get_web_search_tool.return_value in tools
     assert result == "RESEARCHER_RESULT"
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_step_finalizes_when_budget_is_spent(
+    mock_state_with_steps,
+):
+    agent = MagicMock()
+
+    async def ainvoke(input, config):
+        budget = current_step_budget()
+        budget.observe(input["messages"])
+        raise StepBudgetExceeded("tool_calls")
+
+    agent.ainvoke = ainvoke
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content="partial result"))
+
+    with patch("src.graph.nodes.get_llm_by_type", return_value=llm):
+        result = await _execute_agent_step(mock_state_with_steps, agent, "coder")
+
+    assert result.update["observations"][-1] == "partial result"
+    step = mock_state_with_steps["current_plan"].steps[1]
+    assert step.execution_res == "partial result"
+    assert step.end_reason == "tool_calls"
+    final_prompt = llm.ainvoke.call_args[0][0]
+    assert "budget of this step is exhausted (tool_calls)" in (final_prompt[-1].content)
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_step_deadline(mock_state_with_steps):
+    agent = MagicMock()
+
+    async def ainvoke(input, config):
+        await asyncio.sleep(5)
+
+    agent.ainvoke = ainvoke
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(side_effect=RuntimeError("llm down"))
+    config = {"configurable": {"request_deadline": time.time() + 0.05}}
+
+    with patch("src.graph.nodes.get_llm_by_type", return_value=llm):
+        result = await _execute_agent_step(
+            mock_state_with_steps, agent, "coder", config
+        )
+
+    step = mock_state_with_steps["current_plan"].steps[1]
+    assert step.end_reason == "deadline"
+    assert result.update["observations"][-1] == (
+        "The step ended early (deadline) without findings."
+    )
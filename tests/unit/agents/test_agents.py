@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.tools import tool
+
+import src.agents.agents as agents_mod
+from src.rag import Resource, Retriever
+from src.tools.retriever import get_retriever_tool
+
+
+@tool
+def tool_a(query: str) -> str:
+    """Tool A."""
+    return query
+
+
+@tool
+def tool_b(query: str) -> str:
+    """Tool B."""
+    return query
+
+
+class StubRetriever(Retriever):
+    def list_resources(self, query=None):
+        return []
+
+    def query_relevant_documents(self, query, resources=[]):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def patched_agent_factory():
+    agents_mod.clear_agent_cache()
+    llm = MagicMock()
+    with (
+        patch("src.agents.agents.get_llm_by_type", return_value=llm),
+        patch(
+            "src.agents.agents.create_react_agent",
+            side_effect=lambda **kwargs: MagicMock(),
+        ) as mock_create,
+    ):
+        yield mock_create
+    agents_mod.clear_agent_cache()
+
+
+def test_create_agent_reuses_compiled_agent(patched_agent_factory):
+    first = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+    second = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+    assert first is second
+    assert patched_agent_factory.call_count == 1
+
+
+def test_create_agent_builds_tool_node_only_on_cache_miss(patched_agent_factory):
+    with patch("src.agents.agents.ConcurrentToolNode") as mock_node:
+        agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+        agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+
+    assert mock_node.call_count == 1
+
+
+def test_create_agent_rebuilds_when_tool_settings_change(
+    monkeypatch, patched_agent_factory
+):
+    first = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+    monkeypatch.setenv("AGENT_TOOL_TIMEOUT", "5")
+    second = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+
+    assert first is not second
+
+
+def test_create_agent_rebuilds_when_tools_change(patched_agent_factory):
+    first = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+    second = agents_mod.create_agent(
+        "researcher", "researcher", [tool_a, tool_b], "researcher"
+    )
+    assert first is not second
+    assert patched_agent_factory.call_count == 2
+
+
+def test_create_agent_cache_is_bounded(monkeypatch, patched_agent_factory):
+    monkeypatch.setenv("AGENT_CACHE_SIZE", "1")
+    first = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+    agents_mod.create_agent("coder", "coder", [tool_b], "coder")
+    again = agents_mod.create_agent("researcher", "researcher", [tool_a], "researcher")
+    assert again is not first
+    assert len(agents_mod._agent_cache) == 1
+
+
+def test_create_agent_reuses_agent_for_same_retriever_resources(
+    patched_agent_factory,
+):
+    resources = [Resource(uri="rag://dataset/a", title="A")]
+    with patch("src.tools.retriever.build_retriever", side_effect=StubRetriever):
+        first_tool = get_retriever_tool(resources)
+        second_tool = get_retriever_tool(list(resources))
+        other_tool = get_retriever_tool([Resource(uri="rag://dataset/b", title="B")])
+
+    assert first_tool.retriever is not second_tool.retriever
+    first = agents_mod.create_agent(
+        "researcher", "researcher", [first_tool], "researcher"
+    )
+    second = agents_mod.create_agent(
+        "researcher", "researcher", [second_tool], "researcher"
+    )
+    other = agents_mod.create_agent(
+        "researcher", "researcher", [other_tool], "researcher"
+    )
+    assert first is second
+    assert other is not first
+    assert patched_agent_factory.call_count == 2
@@ -0,0 +1,89 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.agents.step_budget import (
+    StepBudget,
+    StepBudgetExceeded,
+    step_budget_hook,
+    use_step_budget,
+)
+from src.config.configuration import Configuration
+
+MESSAGES = [
+    HumanMessage(content="research acme"),
+    AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "web_search", "args": {"query": "acme"}, "id": "1"},
+            {"name": "crawl_tool", "args": {"url": "https://acme.com"}, "id": "2"},
+        ],
+        usage_metadata={"input_tokens": 90, "output_tokens": 10, "total_tokens": 100},
+    ),
+    ToolMessage(content="results", tool_call_id="1"),
+    ToolMessage(content="page", tool_call_id="2"),
+    AIMessage(content="x" * 40),
+]
+
+
+def test_deadline_is_the_earlier_of_step_and_request():
+    now = time.time()
+
+    budget = StepBudget.from_configuration(
+        Configuration(step_timeout=60, request_deadline=now + 10)
+    )
+    assert budget.deadline == pytest.approx(now + 10)
+
+    budget = StepBudget.from_configuration(Configuration(step_timeout=60))
+    assert budget.deadline == pytest.approx(now + 60, abs=1)
+    assert budget.max_tool_calls == 20
+
+    budget = StepBudget.from_configuration(Configuration(step_timeout=0))
+    assert budget.deadline is None
+    assert budget.remaining() is None
+
+
+def test_observe_counts_tool_calls_and_tokens():
+    budget = StepBudget(max_tool_calls=3, max_tokens=200)
+
+    budget.observe(MESSAGES)
+
+    assert budget.tool_calls == 2
+    # Reported usage, or an estimate of the output without it
+    assert budget.tokens == 110
+    assert budget.exhausted() is None
+    assert StepBudget(max_tool_calls=2).exhausted() is None
+
+    budget.max_tokens = 100
+    assert budget.exhausted() == "tokens"
+    budget.max_tool_calls = 2
+    assert budget.exhausted() == "tool_calls"
+    budget.deadline = time.time() - 1
+    assert budget.exhausted() == "deadline"
+
+
+def test_hook_raises_when_budget_is_spent():
+    budget = StepBudget(max_tool_calls=2)
+
+    assert step_budget_hook({"messages": MESSAGES}) == {"llm_input_messages": MESSAGES}
+    with use_step_budget(budget):
+        with pytest.raises(StepBudgetExceeded) as exc_info:
+            step_budget_hook({"messages": MESSAGES})
+
+    assert exc_info.value.reason == "tool_calls"
+    assert budget.messages == MESSAGES
+
+
+def test_hook_finalizes_before_the_recursion_limit():
+    budget = StepBudget()
+
+    with use_step_budget(budget):
+        step_budget_hook({"messages": MESSAGES, "remaining_steps": 10})
+        with pytest.raises(StepBudgetExceeded) as exc_info:
+            step_budget_hook({"messages": MESSAGES, "remaining_steps": 2})
+
+    assert exc_info.value.reason == "recursion_limit"
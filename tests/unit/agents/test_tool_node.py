@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from src.agents.tool_node import ConcurrentToolNode
+
+running = []
+peak = []
+
+
+@tool
+async def slow_search(query: str, seconds: float) -> str:
+    """Search slowly."""
+    running.append(query)
+    peak.append(len(running))
+    await asyncio.sleep(seconds)
+    running.remove(query)
+    return f"results for {query}"
+
+
+@tool
+def sync_lookup(query: str) -> str:
+    """Look up synchronously."""
+    time.sleep(0.1)
+    return f"lookup {query}"
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    running.clear()
+    peak.clear()
+
+
+def _turn(*calls):
+    return {
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": args, "id": f"call-{i}"}
+                    for i, (name, args) in enumerate(calls)
+                ],
+            )
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently():
+    node = ConcurrentToolNode([slow_search, sync_lookup], max_concurrency=4)
+
+    start = time.monotonic()
+    result = await node.ainvoke(
+        _turn(
+            ("slow_search", {"query": "a", "seconds": 0.1}),
+            ("slow_search", {"query": "b", "seconds": 0.1}),
+            ("sync_lookup", {"query": "c"}),
+        )
+    )
+
+    assert time.monotonic() - start < 0.25
+    assert [m.content for m in result["messages"]] == [
+        "results for a",
+        "results for b",
+        "lookup c",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap():
+    node = ConcurrentToolNode([slow_search], max_concurrency=2)
+
+    await node.ainvoke(
+        _turn(*[("slow_search", {"query": q, "seconds": 0.02}) for q in "abcde"])
+    )
+
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_returns_error():
+    node = ConcurrentToolNode([slow_search], timeout=0.1)
+
+    result = await node.ainvoke(
+        _turn(
+            ("slow_search", {"query": "fast", "seconds": 0}),
+            ("slow_search", {"query": "stuck", "seconds": 5}),
+        )
+    )
+
+    fast, stuck = result["messages"]
+    assert fast.content == "results for fast"
+    assert stuck.status == "error"
+    assert stuck.tool_call_id == "call-1"
+    assert "did not finish within 0.1s" in stuck.content
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("AGENT_TOOL_CONCURRENCY", "1")
+    monkeypatch.setenv("AGENT_TOOL_TIMEOUT", "30")
+
+    node = ConcurrentToolNode([sync_lookup])
+
+    assert (node.max_concurrency, node.timeout) == (1, 30)
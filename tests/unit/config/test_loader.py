@@ -4,7 +4,12 @@
 import os
 import tempfile
 
-from src.config.loader import load_yaml_config, process_dict, replace_env_vars
+from src.config.loader import (
+    get_float_env,
+    load_yaml_config,
+    process_dict,
+    replace_env_vars,
+)
 
 
 def test_replace_env_vars_with_env(monkeypatch):
@@ -25,6 +30,15 @@ def test_replace_env_vars_regular_string():
     assert replace_env_vars("no_env") == "no_env"
 
 
+def test_get_float_env(monkeypatch):
+    monkeypatch.setenv("TEST_FLOAT", " 0.25 ")
+    assert get_float_env("TEST_FLOAT") == 0.25
+    monkeypatch.setenv("TEST_FLOAT", "heavy")
+    assert get_float_env("TEST_FLOAT", 1.0) == 1.0
+    monkeypatch.delenv("TEST_FLOAT")
+    assert get_float_env("TEST_FLOAT", 2.5) == 2.5
+
+
 def test_process_dict_nested(monkeypatch):
     monkeypatch.setenv("FOO", "bar")
     config = {"a": "$FOO", "b": {"c": "$FOO", "d": 42, "e": "$NOT_SET_ENV"}}
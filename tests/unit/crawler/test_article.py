@@ -71,3 +71,70 @@ def test_to_message_handles_empty_html():
     result = article.to_message()
     assert isinstance(result, list)
     assert result[0]["type"] == "text"
+
+
+def _long_article():
+    html = (
+        "<div><h1>Overview</h1>"
+        + "<p>"
+        + "Unrelated preamble text. " * 200
+        + "</p>"
+        + "<div><h2>Union election</h2>"
+        + "<p>The NLRB certified the union election at Acme.</p></div>"
+        + "<ul><li>first</li><li>second</li></ul></div>"
+    )
+    return Article("Report", html)
+
+
+def test_to_markdown_within_budget_returns_everything_that_fits():
+    article = _long_article()
+    assert article.to_markdown_within_budget(100_000) == article.to_markdown()
+
+
+def test_to_markdown_within_budget_respects_budget():
+    result = _long_article().to_markdown_within_budget(300)
+    assert len(result) <= 300
+    assert result.startswith("# Report")
+    assert "Overview" in result
+
+
+def test_to_markdown_within_budget_keeps_query_matches_first():
+    result = _long_article().to_markdown_within_budget(300, query="NLRB election")
+    assert len(result) <= 300
+    assert "The NLRB certified the union election at Acme." in result
+    # Selected blocks stay in document order
+    assert result.index("Overview") < result.index("Union election")
+
+
+def test_to_markdown_within_budget_keeps_lead_on_heading_dense_pages():
+    html = "<p>Lead paragraph of the story.</p>" + "".join(
+        f"<h3>Section {i}</h3>" for i in range(100)
+    )
+    result = Article("News", html).to_markdown_within_budget(80)
+    assert len(result) <= 80
+    assert "Lead paragraph of the story." in result
+    assert "Section 99" not in result
+
+
+def test_to_markdown_within_budget_does_not_convert_whole_page(monkeypatch):
+    converted = []
+    import src.crawler.article as article_module
+
+    original_md = article_module.md
+
+    def counting_md(html, **kwargs):
+        converted.append(len(html))
+        return original_md(html, **kwargs)
+
+    monkeypatch.setattr(article_module, "md", counting_md)
+    article = Article("Big", "<div>" + "<p>paragraph text</p>" * 5000 + "</div>")
+
+    result = article.to_markdown_within_budget(200)
+
+    assert len(result) <= 200
+    assert len(converted) < 20
+
+
+def test_to_markdown_within_budget_uses_cached_markdown():
+    article = Article("Title", "<p>Body</p>", markdown="# Title\n\ncached")
+    assert article.to_markdown_within_budget(1000) == "# Title\n\ncached"
@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.crawler.article import Article
+from src.crawler.batch_crawler import (
+    BatchCrawler,
+    close_http_client,
+    get_http_client,
+)
+from src.crawler.crawler import Crawler
+
+
+class FakeCrawler:
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = fail
+        self.active = 0
+        self.max_active = 0
+        self.active_by_host = {}
+        self.max_active_by_host = {}
+        self.calls = []
+
+    async def acrawl(self, url, client=None, executor=None):
+        host = url.split("/")[2]
+        self.calls.append(url)
+        self.active += 1
+        self.active_by_host[host] = self.active_by_host.get(host, 0) + 1
+        self.max_active = max(self.max_active, self.active)
+        self.max_active_by_host[host] = max(
+            self.max_active_by_host.get(host, 0), self.active_by_host[host]
+        )
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.01))
+            if url in self.fail:
+                raise ValueError("boom")
+            article = Article(title=url, html_content="<p>content</p>")
+            article.url = url
+            return article
+        finally:
+            self.active -= 1
+            self.active_by_host[host] -= 1
+
+
+async def _collect(crawler, urls):
+    return [result async for result in crawler.crawl_many(urls)]
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_limits_global_and_per_host_concurrency():
+    fake = FakeCrawler()
+    urls = [f"https://a.com/{i}" for i in range(6)] + [
+        f"https://b{i}.com/" for i in range(6)
+    ]
+    crawler = BatchCrawler(max_concurrency=4, max_per_host=2, timeout=5, crawler=fake)
+
+    results = await _collect(crawler, urls)
+
+    assert sorted(result.url for result in results) == sorted(urls)
+    assert all(result.article is not None for result in results)
+    assert fake.max_active <= 4
+    assert fake.max_active_by_host["a.com"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_yields_results_as_they_finish():
+    fake = FakeCrawler(delays={"https://slow.com/": 0.2, "https://fast.com/": 0.01})
+    crawler = BatchCrawler(max_concurrency=2, max_per_host=1, timeout=5, crawler=fake)
+
+    results = await _collect(crawler, ["https://slow.com/", "https://fast.com/"])
+
+    assert [result.url for result in results] == [
+        "https://fast.com/",
+        "https://slow.com/",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_reports_timeouts_and_errors():
+    fake = FakeCrawler(delays={"https://slow.com/": 1}, fail=("https://bad.com/",))
+    crawler = BatchCrawler(timeout=0.1, crawler=fake)
+
+    results = {
+        result.url: result
+        for result in await _collect(
+            crawler, ["https://slow.com/", "https://bad.com/", "https://ok.com/"]
+        )
+    }
+
+    assert "Timed out" in results["https://slow.com/"].error
+    assert "boom" in results["https://bad.com/"].error
+    assert results["https://ok.com/"].article.url == "https://ok.com/"
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_deduplicates_urls():
+    fake = FakeCrawler()
+    crawler = BatchCrawler(crawler=fake)
+
+    results = await _collect(crawler, ["https://a.com/", "https://a.com/"])
+
+    assert len(results) == 1
+    assert fake.calls == ["https://a.com/"]
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_per_loop():
+    client = get_http_client()
+
+    assert get_http_client() is client
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_crawler_acrawl_extracts_in_executor(monkeypatch):
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+    calls = {}
+
+    class DummyJinaClient:
+        async def acrawl(self, url, return_format=None, client=None):
+            calls["jina"] = (url, return_format, client)
+            return "<html>dummy</html>"
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            calls["extractor"] = html
+            return Article(title="Dummy", html_content="<p>dummy</p>")
+
+    monkeypatch.setattr("src.crawler.fetcher.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+
+    article = await Crawler().acrawl("http://example.com", client="client")
+
+    assert article.url == "http://example.com"
+    assert calls["jina"] == ("http://example.com", "html", "client")
+    assert calls["extractor"] == "<html>dummy</html>"
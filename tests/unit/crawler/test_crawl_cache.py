@@ -0,0 +1,168 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import httpx
+import pytest
+import requests
+
+from src.crawler.article import Article
+from src.crawler.crawl_cache import CrawlCache, canonicalize_url
+from src.crawler.crawler import Crawler
+from src.utils.outbound import OutboundGovernor
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Example.COM:443/a/?b=2&a=1#frag", "https://example.com/a?a=1&b=2"),
+        ("https://example.com", "https://example.com/"),
+        (
+            "http://example.com:8080/x?utm_source=news&id=3",
+            "http://example.com:8080/x?id=3",
+        ),
+        ("https://example.com/?fbclid=abc", "https://example.com/"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def _article(title="Title", body="<p>Body</p>"):
+    return Article(title=title, html_content=body)
+
+
+def test_put_and_get_round_trip():
+    cache = CrawlCache(path="", ttl_seconds=60, max_bytes=0)
+    content_hash = cache.put(
+        "https://example.com/a?utm_source=x", "<html>a</html>", _article(), etag='"v1"'
+    )
+    cache.put_markdown(content_hash, "# Title\n\nBody")
+
+    page = cache.get_fresh("https://EXAMPLE.com/a")
+
+    assert page.html == "<html>a</html>"
+    assert page.etag == '"v1"'
+    article = page.to_article()
+    assert article.title == "Title"
+    assert article.to_markdown() == "# Title\n\nBody"
+
+
+def test_identical_content_is_stored_once():
+    cache = CrawlCache(path="", ttl_seconds=60, max_bytes=0)
+    first = cache.put("https://a.com/", "<html>same</html>", _article())
+    size = cache.total_bytes()
+
+    second = cache.put("https://b.com/", "<html>same</html>", _article())
+
+    assert first == second
+    assert cache.total_bytes() == size
+    assert cache.get("https://b.com/").html == "<html>same</html>"
+
+
+def test_stale_entries_are_kept_for_revalidation(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.crawler.crawl_cache.time.time", lambda: now[0])
+    cache = CrawlCache(path="", ttl_seconds=60, max_bytes=0)
+    cache.put("https://a.com/", "<html>a</html>", _article(), last_modified="Mon")
+
+    now[0] += 120
+
+    assert cache.get_fresh("https://a.com/") is None
+    assert cache.get("https://a.com/").last_modified == "Mon"
+    cache.touch("https://a.com/")
+    assert cache.get_fresh("https://a.com/") is not None
+
+
+def test_evicts_least_recently_used_content(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.crawler.crawl_cache.time.time", lambda: now[0])
+    cache = CrawlCache(path="", ttl_seconds=600, max_bytes=0)
+    for name in ("a", "b", "c"):
+        now[0] += 1
+        html = f"<html>{name * 2000}</html>"
+        cache.put(f"https://{name}.com/", html, _article(body=html))
+    now[0] += 1
+    cache.get("https://a.com/")
+    cache.max_bytes = cache.total_bytes() - 1
+
+    now[0] += 1
+    cache.put("https://d.com/", "<html>d</html>", _article(body="d"))
+
+    assert cache.get("https://b.com/") is None
+    assert cache.get("https://a.com/") is not None
+    assert cache.get("https://c.com/") is not None
+    assert cache.get("https://d.com/") is not None
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_persists_on_disk(tmp_path):
+    path = str(tmp_path / "crawl.db")
+    CrawlCache(path=path).put("https://a.com/", "<html>a</html>", _article())
+
+    assert CrawlCache(path=path).get_fresh("https://a.com/").html == "<html>a</html>"
+
+
+def test_crawler_serves_repeated_urls_from_cache(monkeypatch):
+    cache = CrawlCache(path="", ttl_seconds=60, max_bytes=0)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_cache", lambda: cache)
+    calls = []
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            calls.append(url)
+            return "<html><body><h1>Title</h1><p>Body text</p></body></html>"
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article(title="Title", html_content="<p>Body text</p>")
+
+    monkeypatch.setattr("src.crawler.fetcher.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+
+    markdown = Crawler().crawl("https://example.com/page").to_markdown()
+    cached = Crawler().crawl("https://example.com/page/")
+
+    assert calls == ["https://example.com/page"]
+    assert cached.url == "https://example.com/page/"
+    assert cached.to_markdown() == markdown
+    assert cache.get("https://example.com/page").markdown == markdown
+
+
+@pytest.fixture
+def jina_rate_limited(monkeypatch):
+    cache = CrawlCache(path="", ttl_seconds=60, max_bytes=0)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_cache", lambda: cache)
+    monkeypatch.setattr(
+        "src.crawler.jina_client.get_outbound_governor", OutboundGovernor
+    )
+    monkeypatch.delenv("CRAWL_FETCHER", raising=False)
+    return cache
+
+
+def test_jina_errors_are_not_cached(jina_rate_limited, monkeypatch):
+    def post(url, headers=None, json=None):
+        response = requests.Response()
+        response.status_code = 429
+        response.url = url
+        response._content = b'{"detail": "Rate limit exceeded"}'
+        return response
+
+    monkeypatch.setattr("src.crawler.jina_client.requests.post", post)
+
+    with pytest.raises(requests.HTTPError):
+        Crawler().crawl("https://example.com/page")
+    assert jina_rate_limited.get("https://example.com/page") is None
+
+
+@pytest.mark.asyncio
+async def test_async_jina_errors_are_not_cached(jina_rate_limited):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(503, text="Service unavailable")
+    )
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await Crawler().acrawl("https://example.com/page", client=client)
+    assert jina_rate_limited.get("https://example.com/page") is None
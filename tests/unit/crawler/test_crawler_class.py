@@ -1,9 +1,16 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import pytest
+
 import src.crawler as crawler_module
 
 
+@pytest.fixture(autouse=True)
+def disable_crawl_cache(monkeypatch):
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+
+
 def test_crawler_sets_article_url(monkeypatch):
     """Test that the crawler sets the article.url field correctly."""
 
@@ -22,7 +29,7 @@ def test_crawler_sets_article_url(monkeypatch):
         def extract_article(self, html):
             return DummyArticle()
 
-    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr("src.crawler.fetcher.JinaClient", DummyJinaClient)
     monkeypatch.setattr(
         "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
     )
@@ -55,7 +62,7 @@ def test_crawler_calls_dependencies(monkeypatch):
 
             return DummyArticle()
 
-    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr("src.crawler.fetcher.JinaClient", DummyJinaClient)
     monkeypatch.setattr(
         "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
     )
@@ -68,3 +75,26 @@ def test_crawler_calls_dependencies(monkeypatch):
     assert calls["jina"][1] == "html"
     assert "extractor" in calls
     assert calls["extractor"] == "<html>dummy</html>"
+
+
+def test_crawler_uses_configured_extractor(monkeypatch):
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            return "<html><body><p>Fast engine content, long enough.</p></body></html>"
+
+    monkeypatch.setattr("src.crawler.fetcher.JinaClient", DummyJinaClient)
+    monkeypatch.setenv("CRAWL_EXTRACTOR", "fast")
+
+    article = crawler_module.Crawler().crawl("http://example.com")
+
+    assert "Fast engine content" in article.html_content
+
+
+def test_create_extractor():
+    assert isinstance(
+        crawler_module.create_extractor("fast"), crawler_module.FastExtractor
+    )
+    assert isinstance(
+        crawler_module.create_extractor("unknown"),
+        crawler_module.ReadabilityExtractor,
+    )
@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Quality parity suite for the article extractors.
+
+Every extractor must keep the article body of the saved pages in
+``fixtures/extractor`` and drop their navigation, sidebars, comments and
+footers. When Readability.js is installed, the fast extractor is also compared
+with the readability extractor on the same pages.
+"""
+
+import os
+import re
+from pathlib import Path
+
+import pytest
+import readabilipy
+
+from src.crawler.fast_extractor import FastExtractor
+from src.crawler.readability_extractor import ReadabilityExtractor
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "extractor"
+
+# fixture -> (title, snippets the markdown must contain, snippets it must not)
+EXPECTATIONS = {
+    "news_article.html": (
+        "Acme Corp reports record third-quarter revenue",
+        [
+            "revenue for the third quarter rose 18 percent",
+            "Guidance raised",
+            "raised its full-year outlook",
+            "broad-based strength across every region",
+            "![Acme headquarters](https://cdn.example.com/acme-hq.jpg)",
+        ],
+        [
+            "Most read",
+            "Fed holds rates steady",
+            "Related",
+            "Comments are closed",
+            "All rights reserved",
+            "We use cookies",
+            "Share on X",
+        ],
+    ),
+    "blog_post.html": (
+        "Notes on scaling Postgres connection pools",
+        [
+            "Every request to our API used to open a fresh connection",
+            "Sizing the pool",
+            "AsyncConnectionPool(url, min_size=4, max_size=20, timeout=30)",
+            "| 10 | 9 ms | 41 ms |",
+            "Latency dropped by a factor of four",
+        ],
+        [
+            "Archives",
+            "Subscribe to our newsletter",
+            "Great write-up",
+            "pgbouncer",
+            "Powered by",
+        ],
+    ),
+    "press_release.html": (
+        "Globex announces acquisition of Initech",
+        [
+            "definitive agreement to acquire Initech",
+            "expected to close in the second half of 2025",
+            "About Globex",
+            "Media contact: press@globex.example",
+        ],
+        ["Careers", "Forward-looking statements"],
+    ),
+    "chinese_news.html": (
+        "新能源汽车销量再创新高",
+        [
+            "9月新能源汽车产销量分别达到150万辆和148万辆",
+            "市场渗透率已经超过50%",
+            "全年新能源汽车销量有望突破1500万辆",
+        ],
+        ["热点新闻", "A股三大指数集体收涨", "版权所有"],
+    ),
+    "docs_page.html": (
+        "Configuring retries",
+        [
+            "Transient network errors",
+            "Backoff",
+            "exponential backoff and full jitter",
+            "RetryTransport(retries=3, backoff_factor=0.5, max_backoff=10)",
+            "Retry-After header",
+            "503 Service Unavailable",
+        ],
+        ["Introduction", "GitHub", "Copyright 2025"],
+    ),
+}
+
+
+def _load(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def _tokens(text: str) -> set:
+    # CJK text has no spaces, compare it character by character
+    return set(re.findall(r"[一-鿿]|\w+", text.lower()))
+
+
+def _similarity(a: str, b: str) -> float:
+    tokens_a, tokens_b = _tokens(a), _tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    overlap = len(tokens_a & tokens_b)
+    return 2 * overlap / (len(tokens_a) + len(tokens_b))
+
+
+def _has_readability_js() -> bool:
+    # readabilipy runs ``npm install`` on first use without its node modules
+    javascript_dir = Path(readabilipy.__file__).parent / "javascript"
+    return os.path.isdir(javascript_dir / "node_modules")
+
+
+def test_every_fixture_has_expectations():
+    assert sorted(p.name for p in FIXTURES_DIR.glob("*.html")) == sorted(EXPECTATIONS)
+
+
+@pytest.mark.parametrize("fixture", sorted(EXPECTATIONS))
+def test_fast_extractor_keeps_article_and_drops_boilerplate(fixture):
+    title, included, excluded = EXPECTATIONS[fixture]
+
+    article = FastExtractor().extract_article(_load(fixture))
+    markdown = article.to_markdown()
+
+    assert article.title == title
+    for snippet in included:
+        assert snippet in markdown
+    for snippet in excluded:
+        assert snippet not in markdown
+    # The headline is rendered once, from the title
+    assert markdown.count(title) == 1
+
+
+@pytest.mark.skipif(not _has_readability_js(), reason="Readability.js not installed")
+@pytest.mark.parametrize("fixture", sorted(EXPECTATIONS))
+def test_fast_extractor_parity_with_readability(fixture):
+    html = _load(fixture)
+    _, included, _ = EXPECTATIONS[fixture]
+
+    fast = FastExtractor().extract_article(html).to_markdown(including_title=False)
+    reference = ReadabilityExtractor().extract_article(html)
+    reference_markdown = reference.to_markdown(including_title=False)
+
+    assert _similarity(fast, reference_markdown) >= 0.8
+    missed_by_fast = [
+        snippet
+        for snippet in included
+        if snippet in reference_markdown and snippet not in fast
+    ]
+    assert missed_by_fast == []
+
+
+@pytest.mark.parametrize("html", ["", "   ", "<html></html>"])
+def test_fast_extractor_empty_documents(html):
+    article = FastExtractor().extract_article(html)
+
+    assert article.title is None
+    assert article.to_markdown(including_title=False).strip() == ""
+
+
+def test_fast_extractor_strips_attributes_and_resolves_lazy_images():
+    html = (
+        "<html><body><div class='post' style='color: red'>"
+        "<p onclick='x()'>First paragraph of the story, with enough text.</p>"
+        "<p>Second paragraph of the story, with some more text.</p>"
+        "<img data-src='/a.png' alt='chart'></div></body></html>"
+    )
+
+    content = FastExtractor().extract_article(html).html_content
+
+    assert "onclick" not in content
+    assert "style" not in content
+    assert 'src="/a.png"' in content
+
+
+def test_fast_extractor_drops_hidden_elements():
+    html = (
+        "<html><body><article>"
+        "<p>Visible paragraph of the article, long enough to be scored.</p>"
+        "<p style='display: none'>Hidden tracking paragraph.</p>"
+        "<div hidden>Hidden block.</div>"
+        "</article></body></html>"
+    )
+
+    markdown = FastExtractor().extract_article(html).to_markdown()
+
+    assert "Visible paragraph" in markdown
+    assert "Hidden" not in markdown
@@ -0,0 +1,338 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import gzip
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.crawler.article import Article
+from src.crawler.crawl_cache import CrawlCache
+from src.crawler.crawler import Crawler
+from src.crawler.fetcher import (
+    DirectFetcher,
+    FetchError,
+    FetchResult,
+    HostThrottle,
+    RoutedFetcher,
+    close_sync_http_client,
+)
+
+PAGE = "<html><head><title>Page</title></head><body><p>Hello</p></body></html>"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if "Content-Length" not in (headers or {}):
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StubHandler.requests.append((self.path, dict(self.headers)))
+        if self.path == "/page":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, headers={"ETag": '"v1"'})
+                return
+            self._send(
+                200,
+                PAGE.encode(),
+                {
+                    "Content-Type": "text/html; charset=utf-8",
+                    "ETag": '"v1"',
+                    "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT",
+                },
+            )
+        elif self.path == "/redirect":
+            self._send(302, headers={"Location": "/page"})
+        elif self.path == "/loop":
+            self._send(302, headers={"Location": "/loop"})
+        elif self.path == "/big":
+            self._send(200, b"x" * 5000, {"Content-Type": "text/html"})
+        elif self.path == "/big-streamed":
+            # No Content-Length, the limit is enforced while reading
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for _ in range(10):
+                self.wfile.write(b"x" * 500)
+            self.close_connection = True
+        elif self.path == "/gzip":
+            self._send(
+                200,
+                gzip.compress(PAGE.encode()),
+                {"Content-Type": "text/html", "Content-Encoding": "gzip"},
+            )
+        elif self.path == "/gbk":
+            body = '<html><head><meta charset="gbk"></head><body>新闻</body></html>'
+            self._send(200, body.encode("gbk"), {"Content-Type": "text/html"})
+        elif self.path == "/pdf":
+            self._send(200, b"%PDF-1.4", {"Content-Type": "application/pdf"})
+        else:
+            self._send(403, b"Forbidden", {"Content-Type": "text/html"})
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    close_sync_http_client()
+
+
+@pytest.fixture(autouse=True)
+def clear_requests():
+    StubHandler.requests.clear()
+
+
+def _fetcher(**kwargs):
+    kwargs.setdefault("host_delay", 0)
+    # The stub server listens on loopback
+    kwargs.setdefault("allow_private_hosts", True)
+    return DirectFetcher(throttle=HostThrottle(), **kwargs)
+
+
+def test_direct_fetch(server):
+    result = _fetcher(user_agent="TestAgent/1.0").fetch(f"{server}/page")
+
+    assert result.html == PAGE
+    assert result.etag == '"v1"'
+    assert result.last_modified == "Wed, 01 Oct 2025 00:00:00 GMT"
+    assert not result.not_modified
+    assert StubHandler.requests[0][1]["User-Agent"] == "TestAgent/1.0"
+
+
+def test_direct_fetch_revalidates_with_validators(server):
+    result = _fetcher().fetch(
+        f"{server}/page", etag='"v1"', last_modified="Wed, 01 Oct 2025 00:00:00 GMT"
+    )
+
+    assert result.not_modified
+    assert result.html == ""
+    headers = StubHandler.requests[0][1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+
+
+def test_direct_fetch_follows_redirects(server):
+    result = _fetcher().fetch(f"{server}/redirect")
+
+    assert result.url == f"{server}/page"
+    assert result.html == PAGE
+
+
+def test_direct_fetch_limits_redirects(server):
+    with pytest.raises(FetchError, match="Too many redirects"):
+        _fetcher(max_redirects=2).fetch(f"{server}/loop")
+
+    assert len(StubHandler.requests) == 3
+
+
+@pytest.mark.parametrize("path", ["/big", "/big-streamed"])
+def test_direct_fetch_limits_body_size(server, path):
+    with pytest.raises(FetchError, match="exceeds 1000 bytes"):
+        _fetcher(max_body_bytes=1000).fetch(f"{server}{path}")
+
+
+def test_direct_fetch_decodes_gzip_and_charsets(server):
+    assert _fetcher().fetch(f"{server}/gzip").html == PAGE
+    assert "新闻" in _fetcher().fetch(f"{server}/gbk").html
+
+
+@pytest.mark.parametrize("path", ["/pdf", "/forbidden"])
+def test_direct_fetch_rejects_unusable_responses(server, path):
+    with pytest.raises(FetchError):
+        _fetcher().fetch(f"{server}{path}")
+
+
+@pytest.mark.asyncio
+async def test_direct_afetch(server):
+    assert (await _fetcher().afetch(f"{server}/redirect")).html == PAGE
+
+    async with httpx.AsyncClient() as client:
+        result = await _fetcher().afetch(f"{server}/page", etag='"v1"', client=client)
+    assert result.not_modified
+
+
+def test_host_throttle_spaces_requests_per_host(server):
+    throttle = HostThrottle()
+    assert throttle.reserve("a.com", 1.0) == 0
+    assert throttle.reserve("a.com", 1.0) == pytest.approx(1.0, abs=0.05)
+    assert throttle.reserve("a.com", 1.0) == pytest.approx(2.0, abs=0.05)
+    assert throttle.reserve("b.com", 1.0) == 0
+
+    fetcher = DirectFetcher(
+        host_delay=0.2, throttle=HostThrottle(), allow_private_hosts=True
+    )
+    start = time.monotonic()
+    fetcher.fetch(f"{server}/page")
+    fetcher.fetch(f"{server}/page")
+    assert time.monotonic() - start >= 0.19
+
+
+ADDRESSES = {"public.test": "93.184.216.34", "localhost": "127.0.0.1"}
+
+
+@pytest.fixture
+def fake_dns(monkeypatch):
+    def getaddrinfo(host, port, *args, **kwargs):
+        address = ADDRESSES.get(host, host)
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        return [(family, socket.SOCK_STREAM, 6, "", (address, 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1:8000/api/config",
+        "http://localhost:8000/api/config",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.8/",
+        "http://[::1]/",
+        "http://[::ffff:192.168.0.1]/",
+        "file:///etc/passwd",
+        "ftp://public.test/file",
+    ],
+)
+def test_direct_fetch_blocks_non_public_targets(fake_dns, url):
+    with pytest.raises(FetchError):
+        DirectFetcher(host_delay=0).fetch(url)
+
+
+def test_direct_fetch_checks_each_redirect(fake_dns):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(
+            302, headers={"Location": "http://169.254.169.254/latest/meta-data/"}
+        )
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(FetchError, match="169.254.169.254"):
+        DirectFetcher(host_delay=0).fetch("https://public.test/page", client=client)
+    assert requested == ["https://public.test/page"]
+
+
+@pytest.mark.asyncio
+async def test_direct_afetch_blocks_non_public_targets(fake_dns):
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    ) as client:
+        with pytest.raises(FetchError):
+            await DirectFetcher(host_delay=0).afetch(
+                "http://localhost:8000/api/config", client=client
+            )
+
+
+def test_private_hosts_can_be_allowed(server, monkeypatch):
+    monkeypatch.setenv("CRAWL_ALLOW_PRIVATE_HOSTS", "true")
+
+    fetcher = DirectFetcher(host_delay=0, throttle=HostThrottle())
+
+    assert fetcher.fetch(f"{server}/page").html == PAGE
+    with pytest.raises(FetchError, match="scheme"):
+        fetcher.fetch("file:///etc/passwd")
+
+
+class FakeJina:
+    name = "jina"
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, url, etag=None, last_modified=None):
+        self.calls.append(url)
+        return FetchResult(url=url, html="<p>from jina</p>")
+
+    async def afetch(self, url, etag=None, last_modified=None, client=None):
+        return self.fetch(url)
+
+
+def test_routed_fetcher_falls_back_to_jina(server):
+    jina = FakeJina()
+    fetcher = RoutedFetcher(
+        backend="direct", jina_domains=[], fallback=True, direct=_fetcher(), jina=jina
+    )
+
+    assert fetcher.fetch(f"{server}/page").html == PAGE
+    assert fetcher.fetch(f"{server}/forbidden").html == "<p>from jina</p>"
+    assert jina.calls == [f"{server}/forbidden"]
+
+
+@pytest.mark.asyncio
+async def test_routed_fetcher_async_fallback(server):
+    fetcher = RoutedFetcher(
+        backend="direct", jina_domains=[], direct=_fetcher(), jina=FakeJina()
+    )
+
+    result = await fetcher.afetch(f"{server}/pdf")
+
+    assert result.html == "<p>from jina</p>"
+
+
+def test_routed_fetcher_without_fallback_raises(server):
+    fetcher = RoutedFetcher(
+        backend="direct", jina_domains=[], fallback=False, direct=_fetcher()
+    )
+
+    with pytest.raises(FetchError):
+        fetcher.fetch(f"{server}/forbidden")
+
+
+def test_routed_fetcher_backends(monkeypatch):
+    monkeypatch.setenv("CRAWL_JINA_DOMAINS", "twitter.com, .x.com")
+    monkeypatch.delenv("CRAWL_FETCHER", raising=False)
+    assert [b.name for b in RoutedFetcher().backends_for("https://a.com")] == ["jina"]
+
+    fetcher = RoutedFetcher(backend="direct")
+    assert [b.name for b in fetcher.backends_for("https://a.com")] == [
+        "direct",
+        "jina",
+    ]
+    assert [b.name for b in fetcher.backends_for("https://m.twitter.com/x")] == ["jina"]
+    assert [b.name for b in fetcher.backends_for("https://x.com/y")] == ["jina"]
+
+
+def test_crawler_revalidates_stale_pages(server, monkeypatch):
+    cache = CrawlCache(path="", ttl_seconds=0, max_bytes=0)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_cache", lambda: cache)
+    extracted = []
+
+    class Extractor:
+        def extract_article(self, html):
+            extracted.append(html)
+            return Article(title="Page", html_content="<p>Hello</p>")
+
+    crawler = Crawler(
+        extractor=Extractor(),
+        fetcher=RoutedFetcher(backend="direct", fallback=False, direct=_fetcher()),
+    )
+
+    first = crawler.crawl(f"{server}/page")
+    fetched_at = cache.get(f"{server}/page").fetched_at
+    second = crawler.crawl(f"{server}/page")
+
+    assert extracted == [PAGE]
+    assert second.to_markdown() == first.to_markdown()
+    assert StubHandler.requests[1][1]["If-None-Match"] == '"v1"'
+    assert cache.get(f"{server}/page").fetched_at >= fetched_at
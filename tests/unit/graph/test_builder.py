@@ -100,7 +100,7 @@ def test_build_base_graph_adds_nodes_and_edges(MockStateGraph):
 
 
 @patch("src.graph.builder._build_base_graph")
-@patch("src.graph.builder.MemorySaver")
+@patch("src.graph.builder.BoundedMemorySaver")
 def test_build_graph_with_memory_uses_memory(MockMemorySaver, mock_build_base_graph):
     mock_builder = MagicMock()
     mock_build_base_graph.return_value = mock_builder
@@ -131,3 +131,48 @@ def test_graph_is_compiled():
         # reload the module to re-run the graph assignment
         importlib.reload(sys.modules["src.graph.builder"])
         assert builder_mod.graph is not None
+
+
+def _plan_step(execution_res=None, step_type=None, need_search=True, depends_on=None):
+    step = MagicMock()
+    step.execution_res = execution_res
+    step.step_type = step_type
+    step.need_search = need_search
+    step.depends_on = depends_on
+    return step
+
+
+def test_get_ready_step_indexes_infers_independent_research_steps(mock_state):
+    Plan = mock_state["Plan"]
+    steps = [
+        _plan_step(step_type=builder_mod.StepType.RESEARCH),
+        _plan_step(step_type=builder_mod.StepType.RESEARCH),
+        _plan_step(step_type=builder_mod.StepType.PROCESSING, need_search=False),
+    ]
+    assert builder_mod.get_ready_step_indexes(Plan(steps=steps)) == [0, 1]
+
+
+def test_get_ready_step_indexes_honours_explicit_dependencies(mock_state):
+    Plan = mock_state["Plan"]
+    steps = [
+        _plan_step(execution_res="done", step_type=builder_mod.StepType.RESEARCH),
+        _plan_step(step_type=builder_mod.StepType.RESEARCH, depends_on=[2]),
+        _plan_step(step_type=builder_mod.StepType.RESEARCH, depends_on=[1]),
+        _plan_step(step_type=builder_mod.StepType.PROCESSING, depends_on=[0]),
+    ]
+    # Forward references are ignored, so step 1 is ready while step 2 waits
+    assert builder_mod.get_ready_step_indexes(Plan(steps=steps)) == [1, 3]
+
+
+def test_continue_to_running_research_team_parallel_dispatch(mock_state):
+    Plan = mock_state["Plan"]
+    steps = [
+        _plan_step(step_type=builder_mod.StepType.RESEARCH),
+        _plan_step(step_type=builder_mod.StepType.RESEARCH),
+        _plan_step(step_type=builder_mod.StepType.RESEARCH),
+    ]
+    state = {"current_plan": Plan(steps=steps)}
+    config = {"configurable": {"enable_parallel_steps": True, "max_parallel_steps": 2}}
+    sends = builder_mod.continue_to_running_research_team(state, config)
+    assert [send.node for send in sends] == ["researcher", "researcher"]
+    assert [send.arg["current_step_index"] for send in sends] == [0, 1]
@@ -0,0 +1,137 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from src.graph.memory_saver import BoundedMemorySaver
+
+
+class _State(TypedDict):
+    items: Annotated[list, operator.add]
+
+
+def _build(saver, steps=5, with_interrupt=False):
+    builder = StateGraph(_State)
+    previous = START
+    for i in range(steps):
+        builder.add_node(f"step_{i}", lambda state, i=i: {"items": [f"item {i}" * 50]})
+        builder.add_edge(previous, f"step_{i}")
+        previous = f"step_{i}"
+    if with_interrupt:
+        builder.add_node("ask", lambda state: {"items": [interrupt("continue?")]})
+        builder.add_edge(previous, "ask")
+        previous = "ask"
+    builder.add_edge(previous, END)
+    return builder.compile(checkpointer=saver)
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _recount(saver):
+    """Recompute the serialized size held in memory from scratch."""
+    size = sum(len(blob[1]) for blob in saver.blobs.values())
+    size += sum(
+        len(write[2][1])
+        for writes in saver.writes.values()
+        for write in writes.values()
+    )
+    size += sum(
+        len(cp[0][1]) + len(cp[1][1])
+        for namespaces in saver.storage.values()
+        for checkpoints in namespaces.values()
+        for cp in checkpoints.values()
+    )
+    return size
+
+
+def _saver(**kwargs):
+    defaults = dict(
+        max_checkpoints_per_thread=3,
+        max_bytes=0,
+        thread_ttl_seconds=0,
+        spill_path="",
+    )
+    return BoundedMemorySaver(**{**defaults, **kwargs})
+
+
+def test_caps_checkpoints_per_thread_and_keeps_latest_state():
+    saver = _saver()
+    graph = _build(saver, steps=8)
+    graph.invoke({"items": []}, _config("t1"))
+
+    assert len(saver.storage["t1"][""]) == 3
+    assert len(graph.get_state(_config("t1")).values["items"]) == 8
+    assert saver.total_bytes == _recount(saver)
+
+
+def test_unbounded_when_cap_disabled():
+    saver = _saver(max_checkpoints_per_thread=0)
+    _build(saver, steps=8).invoke({"items": []}, _config("t1"))
+
+    assert len(saver.storage["t1"][""]) > 3
+
+
+def test_evicts_least_recently_used_thread_over_budget():
+    saver = _saver()
+    graph = _build(saver)
+    graph.invoke({"items": []}, _config("old"))
+    graph.invoke({"items": []}, _config("new"))
+    # Reading a thread makes it recently used
+    graph.get_state(_config("old"))
+    saver.max_bytes = saver.total_bytes + saver._thread_bytes["old"] // 2
+
+    graph.invoke({"items": []}, _config("newest"))
+
+    assert "new" not in saver.storage
+    assert "old" in saver.storage
+    assert graph.get_state(_config("newest")).values["items"]
+    assert saver.total_bytes <= saver.max_bytes
+    assert saver.total_bytes == _recount(saver)
+
+
+def test_evicts_idle_threads(monkeypatch):
+    saver = _saver(thread_ttl_seconds=60)
+    graph = _build(saver)
+    now = [1000.0]
+    monkeypatch.setattr("src.graph.memory_saver.time.monotonic", lambda: now[0])
+
+    graph.invoke({"items": []}, _config("idle"))
+    now[0] += 120
+    graph.invoke({"items": []}, _config("active"))
+
+    assert "idle" not in saver.storage
+    assert "active" in saver.storage
+
+
+def test_spilled_thread_resumes_after_interrupt(tmp_path):
+    saver = _saver(spill_path=str(tmp_path / "spill.db"))
+    graph = _build(saver, with_interrupt=True)
+    graph.invoke({"items": []}, _config("interrupted"))
+    assert graph.get_state(_config("interrupted")).next == ("ask",)
+
+    saver.max_bytes = 1
+    graph.invoke({"items": []}, _config("other"))
+    assert "interrupted" not in saver.storage
+
+    result = graph.invoke(Command(resume="yes"), _config("interrupted"))
+
+    assert result["items"][-1] == "yes"
+    assert len(result["items"]) == 6
+
+
+def test_delete_thread_releases_memory_and_spill(tmp_path):
+    saver = _saver(spill_path=str(tmp_path / "spill.db"))
+    graph = _build(saver)
+    graph.invoke({"items": []}, _config("t1"))
+    saver._evict_thread("t1", "test")
+
+    saver.delete_thread("t1")
+
+    assert saver.total_bytes == 0
+    assert graph.get_state(_config("t1")).values == {}
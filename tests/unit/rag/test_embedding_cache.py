@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.rag import embedding_cache
+from src.rag.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    get_embedding_cache,
+    make_embedding_key,
+)
+
+
+class _Model:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 0.5]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+
+def _cached(cache, model=None, dimension=2):
+    return CachedEmbeddings(
+        model or _Model(), cache, provider="openai", model="m", dimension=dimension
+    )
+
+
+def test_key_depends_on_model_and_normalized_text():
+    key = make_embedding_key("OpenAI", "m", 2, "Acme  revenue\n")
+
+    assert key == make_embedding_key("openai", "m", 2, "Acme revenue")
+    assert key != make_embedding_key("openai", "m", 3, "Acme revenue")
+    assert key != make_embedding_key("openai", "other", 2, "Acme revenue")
+    assert key != make_embedding_key("openai", "m", 2, "acme revenue")
+
+
+def test_only_misses_are_embedded():
+    model = _Model()
+    embeddings = _cached(EmbeddingCache(memory_size=16), model)
+
+    embeddings.embed_documents(["a", "bb"])
+    result = embeddings.embed_documents(["bb", "ccc", "ccc", "a"])
+
+    assert result == [[2.0, 0.5], [3.0, 0.5], [3.0, 0.5], [1.0, 0.5]]
+    assert model.calls == [["a", "bb"], ["ccc"]]
+    assert embeddings.embed_query("a") == [1.0, 0.5]
+    assert len(model.calls) == 2
+    assert embeddings.cache.get_stats()["misses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_async_lookups_share_the_cache():
+    model = _Model()
+    embeddings = _cached(EmbeddingCache(memory_size=16), model)
+
+    assert await embeddings.aembed_query("query") == [5.0, 0.5]
+    assert await embeddings.aembed_documents(["query", "x"]) == [
+        [5.0, 0.5],
+        [1.0, 0.5],
+    ]
+    assert model.calls == [["query"], ["x"]]
+
+
+def test_empty_embeddings_are_not_cached():
+    model = _Model()
+    model.embed_query = lambda text: []
+    embeddings = _cached(EmbeddingCache(memory_size=16), model)
+
+    assert embeddings.embed_query("a") == []
+    assert embeddings.cache.get_many([make_embedding_key("openai", "m", 2, "a")]) == [
+        None
+    ]
+
+
+def test_vectors_persist_on_disk(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.db")
+    _cached(EmbeddingCache(path=path, memory_size=1)).embed_documents(["a", "bb"])
+
+    model = _Model()
+    embeddings = _cached(EmbeddingCache(path=path, memory_size=1), model)
+
+    assert embeddings.embed_documents(["a", "bb"]) == [[1.0, 0.5], [2.0, 0.5]]
+    assert model.calls == []
+    assert embeddings.cache.get_stats()["disk_hits"] == 2
+
+
+def test_float16_storage(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(path=path, memory_size=0, dtype="float16")
+    cache.set_many([("k", [0.1, 0.2, 0.3])])
+
+    (vector,) = cache.get_many(["k"])
+    (blob_size,) = cache._conn.execute(
+        "SELECT length(vector) FROM embedding_cache"
+    ).fetchone()
+
+    assert vector == pytest.approx([0.1, 0.2, 0.3], abs=1e-3)
+    assert blob_size == 6
+    # Rows written as float16 are still read after switching to float32
+    assert EmbeddingCache(path=path, dtype="float32").get_many(["k"])[0] == vector
+
+
+def test_invalid_dtype():
+    with pytest.raises(ValueError):
+        EmbeddingCache(dtype="int8")
+
+
+def test_get_embedding_cache_respects_env(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "_embedding_cache", None)
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+    assert get_embedding_cache() is None
+
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "true")
+    monkeypatch.setenv("EMBEDDING_CACHE_DTYPE", "float16")
+    cache = get_embedding_cache()
+    assert cache is get_embedding_cache()
+    assert cache.dtype == "float16"
@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.rag.hybrid import BM25Index, reciprocal_rank_fusion, tokenize
+from src.rag.ingestion import ChunkRecord
+
+
+def _record(chunk_id, content, url="", title=""):
+    return ChunkRecord(
+        chunk_id=chunk_id,
+        doc_id=chunk_id,
+        content=content,
+        title=title,
+        url=url,
+        metadata={},
+    )
+
+
+CHUNKS = [
+    _record("c1", "Acme Corp reported record revenue this quarter."),
+    _record("c2", "The court docketed case 12-cv-345 in March.", url="u2"),
+    _record("c3", "Revenue recognition rules for software companies."),
+    _record("c4", "阿里巴巴集团发布财报", title="财报"),
+]
+
+
+def test_tokenize_keeps_identifiers_and_splits_cjk():
+    assert tokenize("Case 12-CV-345, 42 U.S.C. 1983.") == [
+        "case",
+        "12-cv-345",
+        "12",
+        "cv",
+        "345",
+        "42",
+        "u.s.c",
+        "u",
+        "s",
+        "c",
+        "1983",
+    ]
+    assert tokenize("发布财报") == ["发布", "布财", "财报"]
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=1)
+
+    assert [key for key, _ in fused] == ["c", "a", "b", "d"]
+    assert fused[0][1] == pytest.approx(1 / 4 + 1 / 2)
+
+    weighted = reciprocal_rank_fusion([["a", "b"], ["b", "a"]], weights=[1.0, 3.0])
+    assert [key for key, _ in weighted] == ["b", "a"]
+
+
+def test_bm25_ranks_exact_matches():
+    index = BM25Index()
+    index.add(CHUNKS)
+
+    assert [row["id"] for row, _ in index.search("case 12-cv-345", 3)] == ["c2"]
+    ranked = index.search("acme revenue", 3)
+    assert [row["id"] for row, _ in ranked] == ["c1", "c3"]
+    assert ranked[0][1] > ranked[1][1] > 0
+    assert index.search("财报", 3)[0][0]["id"] == "c4"
+    selected = index.search("revenue", 3, allowed=lambda row: row["id"] == "c3")
+    assert [row["id"] for row, _ in selected] == ["c3"]
+
+
+def test_bm25_replaces_removes_and_persists(tmp_path):
+    path = str(tmp_path / "bm25" / "index.jsonl")
+    index = BM25Index(path)
+    index.add(CHUNKS)
+    index.add([_record("c1", "Globex acquired a competitor.")])
+    index.remove(["c2", "missing"])
+
+    reopened = BM25Index(path)
+
+    assert len(reopened) == 3
+    assert reopened.search("acme", 3) == []
+    assert reopened.search("12-cv-345", 3) == []
+    assert reopened.search("globex", 3)[0][0]["id"] == "c1"
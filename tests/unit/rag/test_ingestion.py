@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+import time
+
+from src.rag.ingestion import IngestionProgress, SourceDocument, ingest_documents
+
+
+def _split(content):
+    return content.split("|")
+
+
+def _documents(count, chunks=2):
+    for i in range(count):
+        yield SourceDocument(
+            doc_id=f"doc{i}",
+            content="|".join(f"d{i}c{j}" for j in range(chunks)),
+            title=f"Doc {i}",
+            metadata={"source": "test"},
+        )
+
+
+class _Store:
+    def __init__(self, fail_on=None):
+        self.embed_calls = []
+        self.inserts = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def embed(self, texts):
+        with self.lock:
+            self.embed_calls.append(list(texts))
+        if self.fail_on and self.fail_on in texts:
+            raise RuntimeError("embedding failed")
+        return [[float(len(text))] for text in texts]
+
+    def insert(self, records):
+        self.inserts.append([record.chunk_id for record in records])
+
+
+def test_chunks_are_embedded_in_batches_and_inserted_in_bulk():
+    store = _Store()
+
+    stats = ingest_documents(
+        _documents(5),
+        _split,
+        store.embed,
+        store.insert,
+        batch_size=4,
+        insert_batch_size=100,
+    )
+
+    assert stats.documents == 5
+    assert stats.chunks == 10
+    assert sorted(len(call) for call in store.embed_calls) == [2, 4, 4]
+    # One insert with every chunk, chunk ids derived from the document id
+    assert len(store.inserts) == 1
+    assert sorted(store.inserts[0])[:2] == ["doc0_chunk_0", "doc0_chunk_1"]
+
+
+def test_batches_respect_token_budget():
+    store = _Store()
+
+    ingest_documents(
+        [SourceDocument(doc_id="big", content="x" * 400 + "|" + "y" * 400)],
+        _split,
+        store.embed,
+        store.insert,
+        batch_size=10,
+        max_batch_tokens=150,
+    )
+
+    assert [len(call) for call in store.embed_calls] == [1, 1]
+    # A single chunk keeps the document id
+    ingest_documents(
+        [SourceDocument(doc_id="small", content="short")],
+        _split,
+        store.embed,
+        store.insert,
+    )
+    assert store.inserts[-1] == ["small"]
+
+
+def test_batches_are_embedded_concurrently():
+    running = []
+    peak = []
+
+    def slow_embed(texts):
+        running.append(1)
+        peak.append(len(running))
+        time.sleep(0.05)
+        running.pop()
+        return [[0.0] for _ in texts]
+
+    start = time.monotonic()
+    stats = ingest_documents(
+        _documents(8, chunks=1),
+        _split,
+        slow_embed,
+        lambda records: None,
+        batch_size=1,
+        max_concurrency=4,
+    )
+
+    assert stats.documents == 8
+    assert max(peak) == 4
+    assert time.monotonic() - start < 0.3
+
+
+def test_failed_documents_are_reported_and_others_ingested():
+    store = _Store(fail_on="d1c0")
+
+    stats = ingest_documents(
+        _documents(3), _split, store.embed, store.insert, batch_size=2
+    )
+
+    assert stats.failed == ["doc1"]
+    assert stats.documents == 2
+    assert all(not chunk_id.startswith("doc1") for chunk_id in store.inserts[0])
+
+
+def test_existing_documents_are_skipped():
+    store = _Store()
+
+    stats = ingest_documents(
+        _documents(3),
+        _split,
+        store.embed,
+        store.insert,
+        existing_ids={"doc0", "doc1_chunk_0", "doc1_chunk_1", "doc2_chunk_0"},
+    )
+
+    # doc2 is only partially stored, so it is ingested again
+    assert stats.skipped == 2
+    assert store.inserts == [["doc2_chunk_0", "doc2_chunk_1"]]
+
+
+def test_progress_resumes_interrupted_run(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    store = _Store(fail_on="d2c1")
+
+    first = ingest_documents(
+        _documents(4),
+        _split,
+        store.embed,
+        store.insert,
+        progress=IngestionProgress(str(path)),
+        batch_size=2,
+        insert_batch_size=2,
+    )
+    assert first.documents == 3
+    assert first.failed == ["doc2"]
+
+    # A torn last line from a crash is ignored
+    with path.open("a") as f:
+        f.write('{"doc_id": "do')
+    retry = _Store()
+    second = ingest_documents(
+        _documents(4),
+        _split,
+        retry.embed,
+        retry.insert,
+        progress=IngestionProgress(str(path)),
+    )
+
+    assert second.skipped == 3
+    assert second.documents == 1
+    assert retry.inserts == [["doc2_chunk_0", "doc2_chunk_1"]]
@@ -0,0 +1,234 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+import pytest
+
+import src.rag.builder as builder_mod
+from src.rag.ingestion import ChunkRecord, SourceDocument
+from src.rag.local import LocalVectorIndex, LocalVectorProvider
+from src.rag.retriever import Resource
+
+VOCABULARY = ["acme", "revenue", "weather", "python"]
+
+
+class KeywordEmbeddings:
+    """Embeds a text as the counts of a few keywords."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _vector(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) + 0.01 for word in VOCABULARY]
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+    async def aembed_query(self, text):
+        return self._vector(text)
+
+
+def _record(chunk_id, doc_id, vector):
+    return ChunkRecord(
+        chunk_id=chunk_id,
+        doc_id=doc_id,
+        content=chunk_id,
+        title=doc_id,
+        url="",
+        metadata={},
+        embedding=vector,
+    )
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_RAG_CHUNK_SIZE", "30")
+    provider = LocalVectorProvider(
+        index=LocalVectorIndex(str(tmp_path / "index")),
+        embeddings=KeywordEmbeddings(),
+    )
+    provider.add_documents(
+        [
+            SourceDocument(
+                doc_id="acme", content="acme revenue grew", title="Acme report"
+            ),
+            SourceDocument(
+                doc_id="weather",
+                content="weather is sunny today\n\nweather turns rainy tomorrow",
+                title="Weather",
+            ),
+            SourceDocument(doc_id="python", content="python release notes"),
+        ]
+    )
+    return provider
+
+
+def test_index_search_ranks_by_cosine_similarity(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add(
+        [
+            _record("a", "doc1", [1.0, 0.0]),
+            _record("b", "doc1", [0.7, 0.7]),
+            _record("c", "doc2", [0.0, 3.0]),
+        ]
+    )
+
+    hits = index.search([2.0, 0.1], k=2)
+
+    assert [row["id"] for row, _ in hits] == ["a", "b"]
+    assert hits[0][1] == pytest.approx(0.9988, abs=1e-3)
+    assert [row["id"] for row, _ in index.search([1.0, 0.0], 5, {"doc2"})] == ["c"]
+    with pytest.raises(ValueError):
+        index.add([_record("d", "doc3", [1.0, 0.0, 0.0])])
+
+
+def test_index_persists_appends_and_tombstones(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add([_record("a", "doc1", [1.0, 0.0]), _record("b", "doc2", [0.0, 1.0])])
+    index.add([_record("c", "doc3", [1.0, 1.0])])
+    assert index.delete(["doc1"]) == 1
+
+    reopened = LocalVectorIndex(str(tmp_path))
+
+    assert isinstance(reopened._matrix, np.memmap)
+    assert reopened.size == 3 and len(reopened) == 2
+    assert set(reopened.documents()) == {"doc2", "doc3"}
+    assert [row["id"] for row, _ in reopened.search([1.0, 0.0], 3)] == ["c", "b"]
+
+
+def test_index_ignores_vectors_without_rows(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add([_record("a", "doc1", [1.0, 0.0])])
+    # A crash between writing the vectors and their rows
+    with open(index.vectors_path, "ab") as f:
+        f.write(np.ones(2, dtype=np.float32).tobytes())
+
+    reopened = LocalVectorIndex(str(tmp_path))
+    reopened.add([_record("b", "doc2", [0.0, 1.0])])
+
+    assert len(LocalVectorIndex(str(tmp_path))) == 2
+    assert [row["id"] for row, _ in reopened.search([0.0, 1.0], 5)] == ["b", "a"]
+
+
+def test_compact_drops_deleted_rows(tmp_path):
+    index = LocalVectorIndex(str(tmp_path))
+    index.add([_record("a", "doc1", [1.0, 0.0]), _record("b", "doc2", [0.0, 1.0])])
+    index.delete(["doc1"])
+
+    index.compact()
+
+    assert index.size == 1
+    assert index.vectors_path.stat().st_size == 2 * 4
+    reopened = LocalVectorIndex(str(tmp_path))
+    assert [row["id"] for row, _ in reopened.search([0.0, 1.0], 5)] == ["b"]
+
+
+def test_query_relevant_documents(provider):
+    documents = provider.query_relevant_documents("weather tomorrow")
+
+    assert documents[0].id == "weather"
+    assert len(documents[0].chunks) == 2
+    assert documents[0].chunks[0].similarity >= documents[0].chunks[1].similarity
+
+    selected = provider.query_relevant_documents(
+        "weather", [Resource(uri="local://acme", title="Acme report")]
+    )
+    assert [doc.id for doc in selected] == ["acme"]
+
+
+@pytest.mark.asyncio
+async def test_async_interface(provider):
+    documents = await provider.aquery_relevant_documents("acme revenue")
+    resources = await provider.alist_resources("acme")
+
+    assert documents[0].id == "acme"
+    assert [resource.uri for resource in resources] == ["local://acme"]
+
+
+def test_list_resources(provider):
+    resources = provider.list_resources()
+
+    assert {resource.uri for resource in resources} == {
+        "local://acme",
+        "local://weather",
+        "local://python",
+    }
+    assert provider.list_resources("WEATHER")[0].title == "Weather"
+
+
+def test_re_adding_a_document_replaces_it(provider):
+    provider.add_documents(
+        [SourceDocument(doc_id="acme", content="acme python sdk", title="Acme")]
+    )
+
+    documents = provider.query_relevant_documents("acme revenue")
+
+    acme = next(doc for doc in documents if doc.id == "acme")
+    assert [chunk.content for chunk in acme.chunks] == ["acme python sdk"]
+    assert provider.delete_documents(["acme"]) == 1
+    assert "acme" not in provider.index.documents()
+
+
+def test_failed_document_leaves_no_partial_rows(provider, monkeypatch):
+    add = provider.index.add
+    inserts = []
+
+    def failing_add(records):
+        inserts.append(len(records))
+        if len(inserts) == 2:
+            raise OSError("disk full")
+        add(records)
+
+    monkeypatch.setattr(provider.index, "add", failing_add)
+    content = "\n\n".join(["weather is sunny today"] * 600)
+
+    stats = provider.add_documents([SourceDocument(doc_id="weather", content=content)])
+
+    assert stats.failed == ["weather"]
+    assert len(inserts) == 2
+    # The rows of the first batch are not left live with the new content
+    assert "weather" not in provider.index.documents()
+    assert "acme" in provider.index.documents()
+
+
+def test_sync_directory(tmp_path, provider):
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "a.md").write_text("# Acme\n\nacme revenue", encoding="utf-8")
+    (docs / "sub" / "b.txt").write_text("python notes", encoding="utf-8")
+    (docs / "image.png").write_bytes(b"\x89PNG")
+
+    first = provider.sync_directory(str(docs))
+    assert first.documents == 2
+    assert provider.index.documents()["a.md"]["title"] == "Acme"
+
+    (docs / "a.md").write_text("# Acme\n\nacme weather", encoding="utf-8")
+    (docs / "sub" / "b.txt").unlink()
+    provider.embeddings.calls.clear()
+    second = provider.sync_directory(str(docs))
+
+    assert (second.documents, second.skipped) == (1, 0)
+    assert provider.embeddings.calls == [["# Acme\n\nacme weather"]]
+    assert "sub/b.txt" not in provider.index.documents()
+    assert provider.sync_directory(str(docs)).skipped == 1
+    # A missing directory never deletes what was synced from it
+    assert provider.sync_directory(str(tmp_path / "missing")).documents == 0
+
+
+def test_build_retriever_local(monkeypatch, tmp_path):
+    monkeypatch.setattr(builder_mod, "SELECTED_RAG_PROVIDER", "local")
+    monkeypatch.setenv("LOCAL_RAG_PATH", str(tmp_path))
+    monkeypatch.setenv("LOCAL_RAG_EMBEDDING_MODEL", "text-embedding-3-small")
+    monkeypatch.setenv("LOCAL_RAG_EMBEDDING_API_KEY", "key")
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+
+    retriever = builder_mod.build_retriever()
+
+    assert isinstance(retriever, LocalVectorProvider)
+    assert retriever.index.path == tmp_path
+    assert retriever.embeddings.model == "text-embedding-3-small"
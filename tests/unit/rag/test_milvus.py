@@ -2,12 +2,15 @@
 # SPDX-License-Identifier: MIT
 
 from __future__ import annotations
+import threading
 from uuid import uuid4
 from types import SimpleNamespace
 from pathlib import Path
 import pytest
 
 import src.rag.milvus as milvus_mod
+from src.rag import embedding_cache
+from src.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
 from src.rag.milvus import MilvusProvider
 from src.rag.retriever import Resource
 
@@ -31,6 +34,8 @@ def patch_embeddings(monkeypatch):
     monkeypatch.setenv("MILVUS_EMBEDDING_MODEL", "text-embedding-ada-002")
     monkeypatch.setenv("MILVUS_COLLECTION", "documents")
     monkeypatch.setenv("MILVUS_URI", "./milvus_demo.db")  # default lite
+    # Tests stub the embedding model, keep vectors out of the shared cache
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
     monkeypatch.setattr(milvus_mod, "OpenAIEmbeddings", DummyEmbedding)
     monkeypatch.setattr(milvus_mod, "DashscopeEmbeddings", DummyEmbedding)
     yield
@@ -252,11 +257,14 @@ def test_query_relevant_documents_lite_success(monkeypatch):
     # Provide deterministic embedding output
     retriever.embedding_model.embed_query = lambda text: [0.1, 0.2, 0.3]  # type: ignore
 
+    searches = []
+
     class DummyMilvusLite:
         def search(
-            self, collection_name, data, anns_field, param, limit, output_fields
+            self, collection_name, data, anns_field, param, limit, output_fields, filter
         ):  # noqa: D401
-            # Simulate two result entries
+            searches.append(filter)
+            # Simulate two result entries, one outside the filter
             return [
                 [
                     {
@@ -286,6 +294,11 @@ def test_query_relevant_documents_lite_success(monkeypatch):
         "question", resources=[Resource(uri="milvus://d2", title="", description="")]
     )
     assert len(docs) == 1 and docs[0].id == "d2" and docs[0].chunks[0].similarity == 0.8
+    # The resource filter is part of the search
+    assert searches == ['url in ["milvus://d2"] or id in ["d2", "milvus://d2"]']
+
+    docs = retriever.query_relevant_documents("question")
+    assert searches[-1] == "" and len(docs) == 2
 
 
 def test_query_relevant_documents_remote_success(monkeypatch):
@@ -299,8 +312,11 @@ def test_query_relevant_documents_remote_success(monkeypatch):
             self.page_content = content
             self.metadata = meta
 
+    searches = []
+
     class RemoteClient:
-        def similarity_search_with_score(self, query, k):  # noqa: D401
+        def similarity_search_with_score(self, query, k, expr):  # noqa: D401
+            searches.append(expr)
             return [
                 (
                     DocObj(
@@ -332,6 +348,165 @@ def test_query_relevant_documents_remote_success(monkeypatch):
         "q", resources=[Resource(uri="milvus://d1", title="", description="")]
     )
     assert len(docs) == 1 and docs[0].id == "d1" and docs[0].chunks[0].similarity == 0.7
+    assert searches == ['url in ["milvus://d1"] or id in ["d1", "milvus://d1"]']
+
+
+@pytest.mark.asyncio
+async def test_aquery_relevant_documents_remote_uses_async_search(monkeypatch):
+    monkeypatch.setenv("MILVUS_URI", "http://remote")
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+
+    class RemoteClient:
+        def similarity_search_with_score(self, query, k, expr):  # noqa: D401
+            raise AssertionError("sync search called")
+
+        async def asimilarity_search_with_score(self, query, k, expr):  # noqa: D401
+            searches.append(expr)
+            doc = SimpleNamespace(
+                page_content="c1",
+                metadata={retriever.id_field: "d1", retriever.url_field: "u1"},
+            )
+            return [(doc, 0.7)]
+
+    searches = []
+    retriever.client = RemoteClient()
+    docs = await retriever.aquery_relevant_documents("q")
+    assert [(d.id, d.chunks[0].content) for d in docs] == [("d1", "c1")]
+
+    docs = await retriever.aquery_relevant_documents(
+        "q", resources=[Resource(uri="u1", title="")]
+    )
+    assert len(docs) == 1
+    assert searches == [None, 'url in ["u1"] or id in ["u1"]']
+
+
+@pytest.mark.asyncio
+async def test_aquery_relevant_documents_lite_runs_in_thread(monkeypatch):
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    calls = []
+
+    def query_relevant_documents(query, resources=None):
+        calls.append(threading.current_thread())
+        return []
+
+    monkeypatch.setattr(retriever, "query_relevant_documents", query_relevant_documents)
+    assert await retriever.aquery_relevant_documents("q") == []
+    assert calls and calls[0] is not threading.main_thread()
+
+
+def _enable_hybrid(monkeypatch, tmp_path):
+    monkeypatch.setenv("MILVUS_HYBRID_SEARCH", "true")
+    monkeypatch.setenv("MILVUS_BM25_PATH", str(tmp_path / "bm25.jsonl"))
+    monkeypatch.setenv("MILVUS_HYBRID_LEXICAL_WEIGHT", "1.5")
+    monkeypatch.setenv("MILVUS_TOP_K", "2")
+
+
+def _chunk(chunk_id, content, url=""):
+    return milvus_mod.ChunkRecord(
+        chunk_id=chunk_id,
+        doc_id=chunk_id,
+        content=content,
+        title="",
+        url=url,
+        metadata={},
+    )
+
+
+def test_hybrid_query_fuses_vector_and_lexical_rankings(monkeypatch, tmp_path):
+    _enable_hybrid(monkeypatch, tmp_path)
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    searches = []
+
+    class DummyMilvusLite:
+        def upsert(self, collection_name, data):  # noqa: D401
+            pass
+
+        def search(self, limit, filter, **kwargs):  # noqa: D401
+            searches.append((limit, filter))
+            return [
+                [
+                    {
+                        "entity": {
+                            retriever.id_field: chunk_id,
+                            retriever.content_field: f"content {chunk_id}",
+                            retriever.url_field: "",
+                        },
+                        "distance": distance,
+                    }
+                    for chunk_id, distance in (("v1", 0.9), ("v2", 0.8), ("v3", 0.7))
+                ]
+            ]
+
+    retriever.client = DummyMilvusLite()
+    retriever._insert_chunk_records(
+        [_chunk("v2", "quarterly revenue"), _chunk("case", "docket 12-cv-345")]
+    )
+
+    docs = retriever.query_relevant_documents("status of 12-cv-345")
+
+    # The exact match only the lexical search finds outranks the vector hits
+    assert [doc.id for doc in docs] == ["case", "v1"]
+    assert docs[0].chunks[0].content == "docket 12-cv-345"
+    assert docs[0].chunks[0].similarity == pytest.approx(1.5 / 61)
+    # Each search contributes twice the top k
+    assert searches == [(4, "")]
+    assert retriever.lexical_index is milvus_mod.get_bm25_index(
+        str(tmp_path / "bm25.jsonl")
+    )
+
+
+def test_hybrid_query_builds_lexical_index_from_lite(monkeypatch, tmp_path):
+    _enable_hybrid(monkeypatch, tmp_path)
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+
+    class DummyMilvusLite:
+        def query(self, **kwargs):  # noqa: D401
+            return [
+                {retriever.id_field: "a", retriever.content_field: "alpha notes"},
+                {
+                    retriever.id_field: "b",
+                    retriever.content_field: "beta 42 U.S.C. 1983",
+                    retriever.url_field: "ub",
+                },
+            ]
+
+        def search(self, filter, **kwargs):  # noqa: D401
+            return [[]]
+
+    retriever.client = DummyMilvusLite()
+    docs = retriever.query_relevant_documents(
+        "42 U.S.C. 1983", resources=[Resource(uri="ub", title="")]
+    )
+
+    assert len(retriever.lexical_index) == 2
+    assert [(doc.id, doc.url) for doc in docs] == [("b", "ub")]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_aquery_searches_concurrently(monkeypatch, tmp_path):
+    monkeypatch.setenv("MILVUS_URI", "http://remote")
+    _enable_hybrid(monkeypatch, tmp_path)
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    retriever.lexical_index.add([_chunk("lex", "acme corp filing", url="u-lex")])
+
+    class RemoteClient:
+        async def asimilarity_search_with_score(self, query, k, expr):  # noqa: D401
+            doc = SimpleNamespace(
+                page_content="c1",
+                metadata={retriever.id_field: "vec", retriever.url_field: "u-vec"},
+            )
+            return [(doc, 0.7)]
+
+    retriever.client = RemoteClient()
+    docs = await retriever.aquery_relevant_documents("acme corp")
+
+    assert {doc.id for doc in docs} == {"vec", "lex"}
+    assert docs[0].id == "lex"
 
 
 def test_get_embedding_dimension_explicit(monkeypatch):
@@ -459,6 +634,129 @@ def test_insert_document_chunk_remote(monkeypatch):
     assert added["meta"][0][retriever.id_field] == "idx"
 
 
+def test_ingest_documents_batches_embeddings_and_inserts(monkeypatch):
+    _patch_init(monkeypatch)
+    monkeypatch.setenv("MILVUS_EMBEDDING_BATCH_SIZE", "2")
+    retriever = MilvusProvider()
+    retriever.chunk_size = 5
+    embed_calls = []
+    upserts = []
+
+    def embed_documents(texts):
+        embed_calls.append(texts)
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    class DummyMilvusLite:
+        def query(self, **kwargs):  # noqa: D401
+            return []
+
+        def upsert(self, collection_name, data):  # noqa: D401
+            upserts.append(data)
+
+    retriever.embedding_model.embed_documents = embed_documents  # type: ignore
+    retriever.client = DummyMilvusLite()
+    documents = [
+        milvus_mod.SourceDocument(
+            doc_id=f"doc{i}",
+            content="aaaa\n\nbbbb",
+            title="T",
+            url="u",
+            metadata={"source": "examples"},
+        )
+        for i in range(3)
+    ]
+
+    stats = retriever.ingest_documents(documents)
+
+    assert stats.documents == 3
+    assert sorted(len(texts) for texts in embed_calls) == [2, 2, 2]
+    assert len(upserts) == 1 and len(upserts[0]) == 6
+    row = next(r for r in upserts[0] if r[retriever.id_field] == "doc0_chunk_1")
+    assert row[retriever.content_field] == "bbbb"
+    assert row["source"] == "examples"
+
+
+def test_embeddings_are_served_from_cache(monkeypatch):
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    retriever.embedding_cache = EmbeddingCache(memory_size=16)
+    queries = []
+    batches = []
+
+    def embed_query(text):
+        queries.append(text)
+        return [0.5, 0.25]
+
+    def embed_documents(texts):
+        batches.append(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    retriever.embedding_model.embed_query = embed_query  # type: ignore
+    retriever.embedding_model.embed_documents = embed_documents  # type: ignore
+
+    assert retriever._get_embedding(" acme revenue ") == [0.5, 0.25]
+    assert retriever._get_embedding("acme revenue") == [0.5, 0.25]
+    assert queries == ["acme revenue"]
+
+    # Re-ingested chunks only embed what is new
+    retriever._embed_batch(["aa", "bbb"])
+    assert retriever._embed_batch(["bbb", "cccc", "aa"]) == [
+        [3.0, 1.0],
+        [4.0, 1.0],
+        [2.0, 1.0],
+    ]
+    assert batches == [["aa", "bbb"], ["cccc"]]
+
+
+def test_connect_remote_uses_cached_embeddings(monkeypatch):
+    monkeypatch.setenv("MILVUS_URI", "http://remote")
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "true")
+    monkeypatch.setattr(embedding_cache, "_embedding_cache", None)
+    _patch_init(monkeypatch)
+    created = {}
+
+    class FakeLangchainMilvus:
+        def __init__(self, **kwargs):  # noqa: D401
+            created.update(kwargs)
+
+    monkeypatch.setattr(milvus_mod, "LangchainMilvus", FakeLangchainMilvus)
+    retriever = MilvusProvider()
+    retriever._connect()
+
+    embeddings = created["embedding_function"]
+    assert isinstance(embeddings, CachedEmbeddings)
+    assert embeddings.embeddings is retriever.embedding_model
+    assert embeddings.model == "text-embedding-ada-002"
+
+
+def test_insert_chunk_records_remote(monkeypatch):
+    _patch_init(monkeypatch)
+    monkeypatch.setenv("MILVUS_URI", "http://remote")
+    retriever = MilvusProvider()
+    added = {}
+
+    class RemoteClient:
+        def add_embeddings(self, texts, embeddings, metadatas, batch_size):
+            added.update(texts=texts, embeddings=embeddings, metadatas=metadatas)
+
+    retriever.client = RemoteClient()
+    record = milvus_mod.ChunkRecord(
+        chunk_id="c1",
+        doc_id="d1",
+        content="ct",
+        title="Title",
+        url="u",
+        metadata={"k": 2},
+        embedding=[0.5],
+    )
+    retriever._insert_chunk_records([record])
+
+    assert added["texts"] == ["ct"]
+    assert added["embeddings"] == [[0.5]]
+    assert added["metadatas"][0][retriever.id_field] == "c1"
+    assert added["metadatas"][0]["k"] == 2
+
+
 def test_connect_lite_and_error(monkeypatch):
     # patch MilvusClient to a dummy
     class FakeMilvusClient:
@@ -761,24 +1059,28 @@ def test_load_example_files_loads_and_skips_existing(monkeypatch):
     monkeypatch.setattr(retriever, "_split_content", lambda content: ["part1", "part2"])
 
     calls = []
+    inserts = []
 
-    def record_insert(doc_id, content, title, url, metadata):
-        calls.append(
+    def record_insert(records):
+        inserts.append(len(records))
+        calls.extend(
             {
-                "doc_id": doc_id,
-                "content": content,
-                "title": title,
-                "url": url,
-                "metadata": metadata,
+                "doc_id": record.chunk_id,
+                "content": record.content,
+                "title": record.title,
+                "url": record.url,
+                "metadata": record.metadata,
             }
+            for record in records
         )
 
-    monkeypatch.setattr(retriever, "_insert_document_chunk", record_insert)
+    monkeypatch.setattr(retriever, "_insert_chunk_records", record_insert)
+    retriever.client = object()
 
     retriever._load_example_files()
 
-    # Only file2 processed -> two chunk inserts
-    assert len(calls) == 2
+    # Only file2 processed -> two chunks written by one insert
+    assert inserts == [2]
     expected_ids = {f"{doc_id_file2}_chunk_0", f"{doc_id_file2}_chunk_1"}
     assert {c["doc_id"] for c in calls} == expected_ids
     assert all(c["metadata"]["file"] == "file2.md" for c in calls)
@@ -809,12 +1111,14 @@ def test_load_example_files_single_chunk_no_suffix(monkeypatch):
 
     captured = {}
 
-    def capture(doc_id, content, title, url, metadata):
-        captured["doc_id"] = doc_id
-        captured["title"] = title
-        captured["metadata"] = metadata
+    def capture(records):
+        (record,) = records
+        captured["doc_id"] = record.chunk_id
+        captured["title"] = record.title
+        captured["metadata"] = record.metadata
 
-    monkeypatch.setattr(retriever, "_insert_document_chunk", capture)
+    monkeypatch.setattr(retriever, "_insert_chunk_records", capture)
+    retriever.client = object()
 
     retriever._load_example_files()
 
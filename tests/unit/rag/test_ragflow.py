@@ -1,8 +1,10 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import json
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from src.rag.ragflow import RAGFlowProvider, parse_uri
@@ -163,3 +165,40 @@ def test_list_resources_error(mock_get, monkeypatch):
     mock_get.return_value = mock_response
     with pytest.raises(Exception):
         provider.list_resources()
+
+
+@pytest.mark.asyncio
+async def test_aquery_relevant_documents_uses_async_client(monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "doc_aggs": [{"doc_id": "d1", "doc_name": "Doc 1"}],
+                    "chunks": [
+                        {"document_id": "d1", "content": "c1", "similarity": 0.9}
+                    ],
+                }
+            },
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with (
+        patch("src.rag.ragflow.get_governed_async_client", return_value=client),
+        patch("src.rag.ragflow.requests.post") as mock_post,
+    ):
+        docs = await provider.aquery_relevant_documents(
+            "q", [DummyResource("rag://dataset/123#abc")]
+        )
+
+    mock_post.assert_not_called()
+    assert json.loads(requests_seen[0].content)["dataset_ids"] == ["123"]
+    assert requests_seen[0].headers["Authorization"] == "Bearer key"
+    assert docs[0].id == "d1"
+    assert docs[0].chunks[0].content == "c1"
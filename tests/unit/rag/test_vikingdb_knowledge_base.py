@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -8,6 +9,7 @@ import os
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from src.rag.vikingdb_knowledge_base import VikingDBKnowledgeBaseProvider, parse_uri
@@ -441,6 +443,64 @@ class TestVikingDBKnowledgeBaseProviderQueryRelevantDocuments:
         assert len(doc1.chunks) == 2
         assert len(doc2.chunks) == 1
 
+    @pytest.mark.asyncio
+    async def test_aquery_relevant_documents_queries_resources_concurrently(
+        self, provider
+    ):
+        """Test async querying signs one request per resource and runs them at once"""
+        in_flight = []
+        peak = []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            resource_id = json.loads(request.content)["resource_id"]
+            return httpx.Response(
+                200,
+                json={
+                    "code": 0,
+                    "data": {
+                        "result_list": [
+                            {
+                                "doc_info": {"doc_id": f"doc-{resource_id}"},
+                                "content": resource_id,
+                                "score": 0.5,
+                            }
+                        ]
+                    },
+                },
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch(
+            "src.rag.vikingdb_knowledge_base.get_governed_async_client",
+            return_value=client,
+        ):
+            result = await provider.aquery_relevant_documents(
+                "test query",
+                [MockResource("rag://dataset/123"), MockResource("rag://dataset/456")],
+            )
+
+        assert max(peak) == 2
+        assert [doc.id for doc in result] == ["doc-123", "doc-456"]
+
+    @pytest.mark.asyncio
+    async def test_alist_resources_request_failure(self, provider):
+        """Test async listing wraps transport errors"""
+
+        def handler(request):
+            raise httpx.ConnectError("Network error")
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch(
+            "src.rag.vikingdb_knowledge_base.get_governed_async_client",
+            return_value=client,
+        ):
+            with pytest.raises(ValueError, match="Request failed: Network error"):
+                await provider.alist_resources()
+
 
 class TestVikingDBKnowledgeBaseProviderListResources:
     @pytest.fixture
@@ -3,7 +3,9 @@
 
 import base64
 import os
-from unittest.mock import MagicMock, mock_open, patch
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, mock_open, patch
 
 import pytest
 from fastapi import HTTPException
@@ -12,7 +14,10 @@ from langchain_core.messages import AIMessageChunk, ToolMessage
 from langgraph.types import Command
 
 from src.config.report_style import ReportStyle
+from src.rag.embedding_cache import EmbeddingCache
 from src.server.app import _astream_workflow_generator, _make_event, app
+from src.tools.search_cache import SearchCache
+from src.utils.outbound import OutboundGovernor
 
 
 @pytest.fixture
@@ -361,7 +366,8 @@ class TestRAGEndpoints:
     @patch("src.server.app.build_retriever")
     def test_rag_resources_with_retriever(self, mock_build_retriever, client):
         mock_retriever = MagicMock()
-        mock_retriever.list_resources.return_value = [
+        mock_retriever.alist_resources = AsyncMock()
+        mock_retriever.alist_resources.return_value = [
             {
                 "uri": "test_uri",
                 "title": "Test Resource",
@@ -544,6 +550,38 @@ class TestAstreamWorkflowGenerator:
         # Check for the actual agent name that appears in the output
         assert '"agent": "a"' in events[0]
 
+    @pytest.mark.asyncio
+    @patch("src.server.app.graph")
+    async def test_astream_workflow_generator_request_deadline(self, mock_graph):
+        configs = []
+
+        async def mock_astream(*args, **kwargs):
+            configs.append(kwargs["config"])
+            return
+            yield
+
+        mock_graph.astream = mock_astream
+
+        generator = _astream_workflow_generator(
+            messages=[{"role": "user", "content": "Hello"}],
+            thread_id="test_thread",
+            resources=[],
+            max_plan_iterations=3,
+            max_step_num=10,
+            max_search_results=5,
+            auto_accepted_plan=True,
+            interrupt_feedback="",
+            mcp_settings={},
+            enable_background_investigation=False,
+            report_style=ReportStyle.BULLDOZER,
+            enable_deep_thinking=False,
+            request_timeout=300,
+        )
+        async for _ in generator:
+            pass
+
+        assert configs[0]["request_deadline"] == pytest.approx(time.time() + 300, abs=5)
+
     @pytest.mark.asyncio
     @patch("src.server.app.graph")
     async def test_astream_workflow_generator_with_interrupt_feedback(self, mock_graph):
@@ -833,3 +871,102 @@ class TestGenerateProseEndpoint:
         response = client.post("/api/prose/generate", json=request_data)
         assert response.status_code == 500
         assert response.json()["detail"] == "Internal Server Error"
+
+
+class TestLifespanCheckpointer:
+    @pytest.mark.asyncio
+    async def test_lifespan_binds_shared_checkpointer_without_mutating_graph(self):
+        app_module = sys.modules["src.server.app"]
+
+        saver = MagicMock()
+        original_checkpointer = app_module.graph.checkpointer
+
+        async def fake_open_checkpointer(stack):
+            return saver
+
+        with patch(
+            "src.server.app.open_checkpointer", side_effect=fake_open_checkpointer
+        ):
+            async with app_module.lifespan(app):
+                workflow_graph = app.state.workflow_graph
+                assert workflow_graph.checkpointer is saver
+                assert workflow_graph.store is app_module.in_memory_store
+                assert app_module.graph.checkpointer is original_checkpointer
+
+        assert app.state.workflow_graph is None
+
+    @pytest.mark.asyncio
+    @patch("src.server.app.graph")
+    async def test_astream_workflow_generator_uses_shared_graph(self, mock_graph):
+        shared_graph = MagicMock()
+
+        async def mock_astream(*args, **kwargs):
+            yield ("agent1", "messages", (AIMessageChunk(content="Hi", id="m1"), {}))
+
+        shared_graph.astream = mock_astream
+        mock_graph.astream = MagicMock(side_effect=AssertionError("not shared"))
+        app.state.workflow_graph = shared_graph
+        try:
+            events = [
+                event
+                async for event in _astream_workflow_generator(
+                    messages=[{"role": "user", "content": "Hello"}],
+                    thread_id="test_thread",
+                    resources=[],
+                    max_plan_iterations=1,
+                    max_step_num=1,
+                    max_search_results=1,
+                    auto_accepted_plan=True,
+                    interrupt_feedback="",
+                    mcp_settings={},
+                    enable_background_investigation=False,
+                    report_style=ReportStyle.BULLDOZER,
+                    enable_deep_thinking=False,
+                )
+            ]
+        finally:
+            app.state.workflow_graph = None
+
+        assert len(events) == 1
+        assert "Hi" in events[0]
+
+
+class TestOutboundStatsEndpoint:
+    def test_outbound_stats(self, client):
+        governor = OutboundGovernor()
+        with governor.limit("tavily"):
+            pass
+
+        with patch("src.server.app.get_outbound_governor", return_value=governor):
+            response = client.get("/api/outbound/stats")
+
+        assert response.status_code == 200
+        assert response.json()["tavily"]["calls"] == 1
+
+
+class TestCacheStatsEndpoint:
+    def test_cache_stats(self, client):
+        search_cache = SearchCache(memory_size=8)
+        search_cache.get("tavily", "k")
+        embedding_cache = EmbeddingCache(memory_size=8)
+        embedding_cache.set_many([("k", [0.1])])
+        embedding_cache.get_many(["k"])
+
+        with (
+            patch("src.server.app.get_search_cache", return_value=search_cache),
+            patch("src.server.app.get_embedding_cache", return_value=embedding_cache),
+        ):
+            response = client.get("/api/cache/stats")
+
+        assert response.status_code == 200
+        assert response.json()["search"]["tavily"]["misses"] == 1
+        assert response.json()["embedding"]["memory_hits"] == 1
+
+    def test_cache_stats_disabled(self, client):
+        with (
+            patch("src.server.app.get_search_cache", return_value=None),
+            patch("src.server.app.get_embedding_cache", return_value=None),
+        ):
+            response = client.get("/api/cache/stats")
+
+        assert response.json() == {"search": None, "embedding": None}
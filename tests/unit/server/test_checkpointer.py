@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from contextlib import AsyncExitStack, asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.checkpointer import open_checkpointer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "env",
+    [
+        {},
+        {"LANGGRAPH_CHECKPOINT_SAVER": "false", "LANGGRAPH_CHECKPOINT_DB_URL": "x"},
+        {"LANGGRAPH_CHECKPOINT_SAVER": "true", "LANGGRAPH_CHECKPOINT_DB_URL": ""},
+        {
+            "LANGGRAPH_CHECKPOINT_SAVER": "true",
+            "LANGGRAPH_CHECKPOINT_DB_URL": "redis://h",
+        },
+    ],
+)
+async def test_open_checkpointer_not_configured(monkeypatch, env):
+    monkeypatch.delenv("LANGGRAPH_CHECKPOINT_SAVER", raising=False)
+    monkeypatch.delenv("LANGGRAPH_CHECKPOINT_DB_URL", raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+
+    async with AsyncExitStack() as stack:
+        assert await open_checkpointer(stack) is None
+
+
+@pytest.mark.asyncio
+@patch("src.server.checkpointer.AsyncPostgresSaver")
+@patch("src.server.checkpointer.AsyncConnectionPool")
+async def test_open_checkpointer_postgres_pool(
+    mock_pool_cls, mock_saver_cls, monkeypatch
+):
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_SAVER", "true")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_DB_URL", "postgresql://localhost/db")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_POOL_MIN_SIZE", "2")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_POOL_MAX_SIZE", "8")
+    pool = MagicMock(open=AsyncMock(), close=AsyncMock())
+    mock_pool_cls.return_value = pool
+    saver = MagicMock(setup=AsyncMock())
+    mock_saver_cls.return_value = saver
+
+    async with AsyncExitStack() as stack:
+        assert await open_checkpointer(stack) is saver
+        pool.open.assert_awaited_once()
+        saver.setup.assert_awaited_once()
+        pool.close.assert_not_awaited()
+
+    pool.close.assert_awaited_once()
+    kwargs = mock_pool_cls.call_args.kwargs
+    assert kwargs["min_size"] == 2
+    assert kwargs["max_size"] == 8
+    assert kwargs["open"] is False
+    mock_saver_cls.assert_called_once_with(pool)
+
+
+@pytest.mark.asyncio
+@patch("src.server.checkpointer.AsyncMongoDBSaver")
+async def test_open_checkpointer_mongodb(mock_saver_cls, monkeypatch):
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_SAVER", "true")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_DB_URL", "mongodb://localhost:27017/")
+    saver = MagicMock()
+    closed = []
+
+    @asynccontextmanager
+    async def from_conn_string(url):
+        yield saver
+        closed.append(url)
+
+    mock_saver_cls.from_conn_string = from_conn_string
+
+    async with AsyncExitStack() as stack:
+        assert await open_checkpointer(stack) is saver
+        assert closed == []
+
+    assert closed == ["mongodb://localhost:27017/"]
@@ -1,6 +1,11 @@
+import asyncio
 from unittest.mock import Mock, patch
 
-from src.tools.crawl import crawl_tool
+import pytest
+
+from src.crawler.article import Article
+from src.crawler.batch_crawler import CrawlResult
+from src.tools.crawl import batch_crawl_tool, crawl_tool
 
 
 class TestCrawlTool:
@@ -8,10 +13,7 @@ class TestCrawlTool:
     def test_crawl_tool_success(self, mock_crawler_class):
         # Arrange
         mock_crawler = Mock()
-        mock_article = Mock()
-        mock_article.to_markdown.return_value = (
-            "# Test Article\nThis is test content." * 100
-        )
+        mock_article = Article("Test Article", "<p>This is test content.</p>" * 100)
         mock_crawler.crawl.return_value = mock_article
         mock_crawler_class.return_value = mock_crawler
 
@@ -25,9 +27,23 @@ class TestCrawlTool:
         assert result["url"] == url
         assert "crawled_content" in result
         assert len(result["crawled_content"]) <= 1000
+        assert result["crawled_content"].startswith("# Test Article")
         mock_crawler_class.assert_called_once()
         mock_crawler.crawl.assert_called_once_with(url)
-        mock_article.to_markdown.assert_called_once()
+
+    @patch("src.tools.crawl.Crawler")
+    def test_crawl_tool_uses_configured_budget_and_query(self, mock_crawler_class):
+        mock_article = Mock()
+        mock_article.to_markdown_within_budget.return_value = "content"
+        mock_crawler_class.return_value.crawl.return_value = mock_article
+
+        result = crawl_tool.invoke(
+            {"url": "https://example.com", "query": "union"},
+            config={"configurable": {"crawl_max_chars": 300}},
+        )
+
+        assert result["crawled_content"] == "content"
+        mock_article.to_markdown_within_budget.assert_called_once_with(300, "union")
 
     @patch("src.tools.crawl.Crawler")
     def test_crawl_tool_short_content(self, mock_crawler_class):
@@ -35,7 +51,7 @@ class TestCrawlTool:
         mock_crawler = Mock()
         mock_article = Mock()
         short_content = "Short content"
-        mock_article.to_markdown.return_value = short_content
+        mock_article.to_markdown_within_budget.return_value = short_content
         mock_crawler.crawl.return_value = mock_article
         mock_crawler_class.return_value = mock_crawler
 
@@ -93,7 +109,9 @@ class TestCrawlTool:
         # Arrange
         mock_crawler = Mock()
         mock_article = Mock()
-        mock_article.to_markdown.side_effect = Exception("Markdown conversion error")
+        mock_article.to_markdown_within_budget.side_effect = Exception(
+            "Markdown conversion error"
+        )
         mock_crawler.crawl.return_value = mock_article
         mock_crawler_class.return_value = mock_crawler
 
@@ -107,3 +125,59 @@ class TestCrawlTool:
         assert "Failed to crawl" in result
         assert "Markdown conversion error" in result
         mock_logger.error.assert_called_once()
+
+
+class TestBatchCrawlTool:
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.BatchCrawler")
+    async def test_batch_crawl_tool_returns_results_in_input_order(
+        self, mock_batch_crawler_class
+    ):
+        article = Article("Title", "<p>" + "x" * 2000 + "</p>")
+
+        async def crawl_many(urls):
+            yield CrawlResult(url="https://b.com", error="ValueError('boom')")
+            yield CrawlResult(url="https://a.com", article=article)
+
+        mock_batch_crawler_class.return_value.crawl_many = crawl_many
+
+        result = await batch_crawl_tool.ainvoke(
+            {"urls": ["https://a.com", "https://b.com"]}
+        )
+
+        assert [item["url"] for item in result] == ["https://a.com", "https://b.com"]
+        assert 900 < len(result[0]["crawled_content"]) <= 1000
+        assert result[0]["crawled_content"].startswith("# Title")
+        assert "boom" in result[1]["error"]
+
+    @pytest.mark.asyncio
+    @patch.dict("os.environ", {"CRAWL_BATCH_TIMEOUT": "0"})
+    @patch("src.tools.crawl.BatchCrawler")
+    async def test_batch_crawl_tool_returns_partial_results_on_timeout(
+        self, mock_batch_crawler_class
+    ):
+        async def crawl_many(urls):
+            await asyncio.sleep(1)
+            yield CrawlResult(url="https://a.com", error="late")
+
+        mock_batch_crawler_class.return_value.crawl_many = crawl_many
+
+        result = await batch_crawl_tool.ainvoke({"urls": ["https://a.com"]})
+
+        assert result == [
+            {"url": "https://a.com", "error": "Failed to crawl. Error: timed out"}
+        ]
+
+
+@pytest.mark.asyncio
+@patch("src.tools.crawl.Crawler")
+async def test_crawl_tool_async(mock_crawler_class):
+    async def acrawl(url, client=None, executor=None):
+        return Article("Async Article", "<p>async content</p>")
+
+    mock_crawler_class.return_value.acrawl = acrawl
+
+    result = await crawl_tool.ainvoke({"url": "https://example.com"})
+
+    assert result["crawled_content"].startswith("# Async Article")
+    mock_crawler_class.return_value.crawl.assert_not_called()
@@ -3,7 +3,9 @@
 
 from unittest.mock import Mock, call, patch
 
-from src.tools.decorators import create_logged_tool
+import pytest
+
+from src.tools.decorators import create_logged_tool, log_io
 
 
 class MockBaseTool:
@@ -117,3 +119,19 @@ class TestLoggedToolMixin:
             call_args = mock_debug.call_args[0][0]
             assert "Tool MockBaseTool returned:" in call_args
             assert "LoggedMockBaseTool" not in call_args
+
+
+class TestLogIo:
+    @pytest.mark.asyncio
+    async def test_log_io_awaits_coroutine_functions(self):
+        @log_io
+        async def fetch(url):
+            return f"content of {url}"
+
+        with patch("src.tools.decorators.logger") as mock_logger:
+            result = await fetch("https://example.com")
+
+        assert result == "content of https://example.com"
+        mock_logger.info.assert_called_with(
+            "Tool fetch returned: content of https://example.com"
+        )
@@ -0,0 +1,232 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import time
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.config import SearchEngine
+from src.tools.federated_search import (
+    FederatedSearchTool,
+    LatencyTracker,
+    fuse_results,
+    normalize_results,
+)
+from src.tools.search import get_web_search_tool
+
+TAVILY_RESULTS = [
+    {"type": "page", "title": "A", "url": "https://a.com/", "content": "a"},
+    {"type": "page", "title": "B", "url": "https://b.com/x", "content": "b"},
+    {"type": "image", "image_url": "https://a.com/a.png", "image_description": "a"},
+]
+DDG_RESULTS = json.dumps(
+    [
+        {"title": "B", "link": "https://B.com/x?utm_source=ddg", "snippet": "longer b"},
+        {"title": "C", "link": "https://c.com/", "snippet": "c"},
+    ]
+)
+
+
+class FakeEngine(BaseTool):
+    name: str = "fake"
+    description: str = "fake engine"
+    output: Any = None
+    delay: float = 0.0
+    error: bool = False
+    calls: List[float] = []
+
+    def _run(self, query: str) -> Any:
+        raise NotImplementedError
+
+    async def _arun(self, query: str) -> Any:
+        self.calls.append(time.monotonic())
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError("engine down")
+        return self.output
+
+
+@pytest.fixture(autouse=True)
+def tracker(monkeypatch):
+    tracker = LatencyTracker()
+    monkeypatch.setattr("src.tools.federated_search.latency_tracker", tracker)
+    return tracker
+
+
+def _tool(hedge=True, deadline=2.0, hedge_delay=0.1, grace=0.05, **engines):
+    return FederatedSearchTool(
+        engine_tools=engines,
+        hedge=hedge,
+        deadline=deadline,
+        default_hedge_delay=hedge_delay,
+        hedge_grace=grace,
+    )
+
+
+def test_normalize_results():
+    assert normalize_results("tavily", TAVILY_RESULTS)[0] == {
+        "title": "A",
+        "url": "https://a.com/",
+        "content": "a",
+    }
+    assert normalize_results("duckduckgo", DDG_RESULTS)[1]["url"] == "https://c.com/"
+    arxiv = normalize_results(
+        "arxiv",
+        "Published: 2017-06-12\nTitle: Attention Is All You Need\n"
+        "Authors: Vaswani\nSummary: The dominant\nsequence models\n\n"
+        "Published: 2018-10-11\nTitle: BERT\nAuthors: Devlin\nSummary: We introduce",
+    )
+    assert [r["title"] for r in arxiv] == ["Attention Is All You Need", "BERT"]
+    assert arxiv[0]["content"] == "The dominant\nsequence models"
+    wikipedia = normalize_results("wikipedia", "Page: Deep learning\nSummary: x")
+    assert wikipedia[0]["url"] == "https://en.wikipedia.org/wiki/Deep_learning"
+
+    with pytest.raises(ValueError):
+        normalize_results("tavily", "HTTPError('401 Unauthorized')")
+    with pytest.raises(ValueError):
+        normalize_results("arxiv", "Arxiv exception: timeout")
+
+
+def test_fuse_results_deduplicates_and_ranks():
+    fused = fuse_results(
+        {
+            "tavily": normalize_results("tavily", TAVILY_RESULTS),
+            "duckduckgo": normalize_results("duckduckgo", DDG_RESULTS),
+        },
+        max_results=5,
+    )
+
+    pages = [r for r in fused if r["type"] == "page"]
+    # b.com is found by both engines and wins over the first hits of each
+    assert [p["title"] for p in pages] == ["B", "A", "C"]
+    assert pages[0]["engines"] == ["tavily", "duckduckgo"]
+    assert pages[0]["content"] == "longer b"
+    assert fused[-1]["type"] == "image"
+
+    assert len(fuse_results({"tavily": TAVILY_RESULTS}, max_results=1)) == 2
+
+
+def test_latency_tracker_p95():
+    tracker = LatencyTracker()
+    for _ in range(4):
+        tracker.record("tavily", 0.1)
+    assert tracker.p95("tavily") is None
+
+    for seconds in range(1, 21):
+        tracker.record("duckduckgo", seconds / 10)
+    assert tracker.p95("duckduckgo") == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_uses_first_engine_when_fast():
+    fast = FakeEngine(output=TAVILY_RESULTS, calls=[])
+    backup = FakeEngine(output=DDG_RESULTS, calls=[])
+
+    output = await _tool(tavily=fast, duckduckgo=backup).ainvoke("query")
+
+    assert backup.calls == []
+    assert [r["engines"] for r in json.loads(output)[:2]] == [["tavily"], ["tavily"]]
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_hedges_slow_engine(tracker):
+    slow = FakeEngine(output=TAVILY_RESULTS, delay=1.0, calls=[])
+    backup = FakeEngine(output=DDG_RESULTS, calls=[])
+
+    start = time.monotonic()
+    output = await _tool(tavily=slow, duckduckgo=backup).ainvoke("query")
+
+    assert time.monotonic() - start < 0.5
+    assert backup.calls[0] - slow.calls[0] == pytest.approx(0.1, abs=0.05)
+    assert {r["title"] for r in json.loads(output)} == {"B", "C"}
+    assert tracker.p95("duckduckgo") is None
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_fuses_engines_finishing_within_grace():
+    slow = FakeEngine(output=TAVILY_RESULTS, delay=0.3, calls=[])
+    backup = FakeEngine(output=DDG_RESULTS, delay=0.1, calls=[])
+
+    start = time.monotonic()
+    output = await _tool(tavily=slow, duckduckgo=backup, grace=0.5).ainvoke("query")
+
+    assert time.monotonic() - start < 0.5
+    pages = [r for r in json.loads(output) if r["type"] == "page"]
+    assert [p["title"] for p in pages] == ["B", "A", "C"]
+    assert pages[0]["engines"] == ["tavily", "duckduckgo"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_p95(tracker):
+    for _ in range(10):
+        tracker.record("tavily", 0.3)
+    slow = FakeEngine(output=TAVILY_RESULTS, delay=0.2, calls=[])
+    backup = FakeEngine(output=DDG_RESULTS, calls=[])
+
+    await _tool(tavily=slow, duckduckgo=backup, hedge_delay=0.05).ainvoke("query")
+
+    assert backup.calls == []
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_moves_on_after_failure():
+    broken = FakeEngine(error=True, calls=[])
+    backup = FakeEngine(output=DDG_RESULTS, calls=[])
+
+    output = await _tool(tavily=broken, duckduckgo=backup, hedge_delay=5).ainvoke(
+        "query"
+    )
+
+    assert [r["title"] for r in json.loads(output)] == ["B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_search_returns_at_deadline():
+    fast = FakeEngine(output=TAVILY_RESULTS, calls=[])
+    backup = FakeEngine(output=DDG_RESULTS, delay=0.05, calls=[])
+    stuck = FakeEngine(output="Page: X\nSummary: x", delay=10, calls=[])
+
+    start = time.monotonic()
+    output = await _tool(
+        hedge=False, deadline=0.3, tavily=fast, duckduckgo=backup, wikipedia=stuck
+    ).ainvoke("query")
+
+    assert 0.25 < time.monotonic() - start < 1
+    pages = [r for r in json.loads(output) if r["type"] == "page"]
+    assert [p["title"] for p in pages] == ["B", "A", "C"]
+
+
+def test_search_fails_when_no_engine_answers():
+    tool = _tool(deadline=0.2, tavily=FakeEngine(error=True, calls=[]))
+
+    assert tool.invoke("query").startswith("Search failed")
+
+
+@pytest.mark.asyncio
+async def test_sync_invoke_inside_event_loop():
+    tool = _tool(tavily=FakeEngine(output=TAVILY_RESULTS, calls=[]))
+
+    assert json.loads(tool.invoke("query"))[0]["title"] == "A"
+
+
+@patch("src.tools.search.SELECTED_SEARCH_ENGINE", SearchEngine.FEDERATED.value)
+def test_get_web_search_tool_federated(monkeypatch):
+    monkeypatch.setenv("SEARCH_FEDERATED_ENGINES", "duckduckgo, arxiv,duckduckgo")
+    monkeypatch.setenv("SEARCH_FEDERATED_HEDGE", "false")
+
+    tool = get_web_search_tool(max_search_results=3)
+
+    assert tool.name == "web_search"
+    assert list(tool.engine_tools) == ["duckduckgo", "arxiv"]
+    assert tool.engine_tools["duckduckgo"].output_format == "json"
+    assert tool.engine_tools["duckduckgo"].max_results == 3
+    assert tool.hedge is False
+
+    monkeypatch.setenv("SEARCH_FEDERATED_ENGINES", "federated")
+    with pytest.raises(ValueError):
+        get_web_search_tool(max_search_results=3)
@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import sys
+import textwrap
+
+import pytest
+
+from src.tools.mcp_session_pool import MCPSessionPool, normalize_connection
+
+SERVER_SOURCE = textwrap.dedent(
+    """
+    import os
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP("echo")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        \"\"\"Echo the text back together with the server pid.\"\"\"
+        return f"{text}:{os.getpid()}"
+
+    server.run()
+    """
+)
+
+
+@pytest.fixture
+def stdio_connection(tmp_path):
+    script = tmp_path / "echo_server.py"
+    script.write_text(SERVER_SOURCE)
+    return {"transport": "stdio", "command": sys.executable, "args": [str(script)]}
+
+
+def test_normalize_connection_is_order_independent():
+    a = {"transport": "stdio", "command": "uvx", "args": ["x"]}
+    b = {"args": ["x"], "command": "uvx", "transport": "stdio"}
+    assert normalize_connection(a) == normalize_connection(b)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_session_and_caches_tools(stdio_connection):
+    pool = MCPSessionPool(tools_ttl_seconds=300, health_check_interval=300)
+    try:
+        first = await pool.get_tools({"echo": stdio_connection})
+        second = await pool.get_tools({"echo": dict(stdio_connection)})
+        assert [t.name for t in first] == ["echo"]
+        # Callers get copies, so editing a description leaves the cache intact
+        first[0].description = "changed"
+        assert second[0].description != "changed"
+
+        content_a, _ = await first[0].coroutine(text="a")
+        content_b, _ = await second[0].coroutine(text="b")
+        # Both calls went to the same server process
+        assert content_a.split(":")[1] == content_b.split(":")[1]
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_dead_session(stdio_connection):
+    pool = MCPSessionPool(tools_ttl_seconds=300, health_check_interval=0)
+    try:
+        tools = await pool.get_tools({"echo": stdio_connection})
+        content_before, _ = await tools[0].coroutine(text="a")
+
+        entry = pool._get_entry(stdio_connection)
+        await entry.close()
+        assert not entry.is_alive()
+
+        # The cached tool transparently uses the restarted session
+        content_after, _ = await tools[0].coroutine(text="b")
+        assert content_after.startswith("b:")
+        assert content_after.split(":")[1] != content_before.split(":")[1]
+    finally:
+        await pool.close()
@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+from unittest.mock import patch
+
+import pytest
+from langchain_community.tools import DuckDuckGoSearchResults
+from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+
+from src.crawler.article import Article
+from src.crawler.batch_crawler import CrawlResult
+from src.tools.crawl import batch_crawl_tool, crawl_tool
+from src.tools.research_registry import (
+    ResearchRegistry,
+    clear_research_registry,
+    current_research_registry,
+    get_research_registry,
+    use_research_registry,
+)
+from src.tools.search_cache import create_cached_search_tool
+
+calls = []
+HITS = [
+    {"title": "Acme annual report", "link": "https://acme.com/report"},
+    {"title": "Acme news", "link": "https://news.com/acme?utm_source=x"},
+]
+
+
+class _FakeDuckDuckGo(DuckDuckGoSearchResults):
+    def _run(self, query, run_manager=None):
+        calls.append(query)
+        return json.dumps(HITS), HITS
+
+
+CachedDuckDuckGo = create_cached_search_tool(_FakeDuckDuckGo, "duckduckgo")
+
+
+@pytest.fixture(autouse=True)
+def no_search_cache(monkeypatch):
+    calls.clear()
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+
+
+def _search_tool():
+    return CachedDuckDuckGo(
+        output_format="json", api_wrapper=DuckDuckGoSearchAPIWrapper()
+    )
+
+
+def test_registry_per_thread(monkeypatch):
+    registry = get_research_registry("thread-1")
+
+    assert get_research_registry("thread-1") is registry
+    assert get_research_registry("thread-2") is not registry
+    assert get_research_registry(None) is None
+
+    clear_research_registry("thread-1")
+    assert get_research_registry("thread-1") is not registry
+
+    monkeypatch.setenv("RESEARCH_REGISTRY_ENABLED", "false")
+    assert get_research_registry("thread-1") is None
+
+
+def test_search_is_served_from_registry():
+    registry = ResearchRegistry()
+    tool = _search_tool()
+
+    with use_research_registry(registry):
+        assert current_research_registry() is registry
+        first = tool.invoke("Acme Corp")
+        assert tool.invoke("acme  corp") == first
+    assert current_research_registry() is None
+
+    assert calls == ["Acme Corp"]
+    assert registry.queries() == ["Acme Corp"]
+    # Another run does not see the results
+    tool.invoke("Acme Corp")
+    assert len(calls) == 2
+
+
+def test_digest_lists_queries_and_sources():
+    registry = ResearchRegistry()
+    assert registry.digest() == ""
+
+    with use_research_registry(registry):
+        _search_tool().invoke("acme")
+    registry.record_page(
+        "https://news.com/acme", Article("Acme wins award", "<p>text</p>")
+    )
+
+    digest = registry.digest()
+    assert digest.startswith("# Already Known Sources")
+    assert 'Searched queries: "acme"' in digest
+    lines = [line for line in digest.splitlines() if line.startswith("- ")]
+    assert lines == [
+        "- [Acme wins award](https://news.com/acme) (crawled)",
+        "- [Acme annual report](https://acme.com/report)",
+    ]
+    assert registry.digest(max_sources=1).endswith("- ... and 1 more")
+
+
+@patch("src.tools.crawl.Crawler")
+def test_crawl_tool_uses_registry(mock_crawler_class):
+    registry = ResearchRegistry()
+    mock_crawler_class.return_value.crawl.return_value = Article(
+        "Title", "<p>content</p>"
+    )
+
+    with use_research_registry(registry):
+        first = crawl_tool.invoke({"url": "https://a.com/page?utm_source=x"})
+        second = crawl_tool.invoke({"url": "https://a.com/page"})
+
+    assert first["crawled_content"] == second["crawled_content"]
+    mock_crawler_class.return_value.crawl.assert_called_once()
+    assert registry.get_page("https://a.com/page").title == "Title"
+
+
+@pytest.mark.asyncio
+@patch("src.tools.crawl.BatchCrawler")
+async def test_batch_crawl_tool_skips_known_pages(mock_batch_crawler_class):
+    registry = ResearchRegistry()
+    registry.record_page("https://a.com", Article("Known", "<p>known</p>"))
+    crawled_urls = []
+
+    async def crawl_many(urls):
+        crawled_urls.extend(urls)
+        for url in urls:
+            yield CrawlResult(url=url, article=Article("New", "<p>new</p>"))
+
+    mock_batch_crawler_class.return_value.crawl_many = crawl_many
+
+    with use_research_registry(registry):
+        result = await batch_crawl_tool.ainvoke(
+            {"urls": ["https://a.com", "https://b.com"]}
+        )
+
+    assert crawled_urls == ["https://b.com"]
+    assert result[0]["crawled_content"].startswith("# Known")
+    assert result[1]["crawled_content"].startswith("# New")
+    assert registry.get_page("https://b.com").title == "New"
@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import patch
+
+import pytest
+from langchain_community.tools import WikipediaQueryRun
+from langchain_community.utilities import WikipediaAPIWrapper
+
+from src.tools.decorators import create_logged_tool
+from src.tools.search import get_web_search_tool
+from src.tools.search_cache import (
+    SearchCache,
+    create_cached_search_tool,
+    is_cacheable,
+    make_cache_key,
+    search_options,
+)
+
+calls = []
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SearchCache(path="", memory_size=8, default_ttl=60)
+    calls.clear()
+    monkeypatch.setattr("src.tools.search_cache._search_cache", cache)
+    monkeypatch.delenv("SEARCH_CACHE_ENABLED", raising=False)
+    return cache
+
+
+class _FakeWikipedia(WikipediaQueryRun):
+    def _run(self, query, run_manager=None):
+        calls.append(query)
+        return f"result for {query}"
+
+    async def _arun(self, query, run_manager=None):
+        calls.append(query)
+        return f"result for {query}"
+
+
+CachedWikipedia = create_cached_search_tool(
+    create_logged_tool(_FakeWikipedia), "wikipedia"
+)
+
+
+def _tool(top_k_results=2):
+    return CachedWikipedia(
+        name="web_search",
+        api_wrapper=WikipediaAPIWrapper(top_k_results=top_k_results),
+    )
+
+
+def search_options_like(options):
+    class _Tool:
+        pass
+
+    tool = _Tool()
+    for name, value in options.items():
+        setattr(tool, name, value)
+    return search_options(tool)
+
+
+def test_cache_key_normalizes_query_and_domains():
+    options_a = {"include_domains": ["b.com", "A.com"], "max_results": 3}
+    options_b = {"include_domains": ["a.com", "b.com"], "max_results": 3}
+    key = make_cache_key("tavily", "  Acme   Corp ", {"max_results": 3})
+
+    assert key == make_cache_key("tavily", "acme corp", {"max_results": 3})
+    assert key != make_cache_key("tavily", "acme corp", {"max_results": 5})
+    assert key != make_cache_key("brave_search", "acme corp", {"max_results": 3})
+    assert make_cache_key("tavily", "q", search_options_like(options_a)) == (
+        make_cache_key("tavily", "q", search_options_like(options_b))
+    )
+
+
+def test_cached_tool_serves_repeated_queries(cache):
+    tool = _tool()
+
+    assert tool.invoke("Acme Corp") == "result for Acme Corp"
+    assert tool.invoke("acme  corp") == "result for Acme Corp"
+
+    assert calls == ["Acme Corp"]
+    assert type(tool).__name__ == "Logged_FakeWikipedia"
+    stats = cache.get_stats()["wikipedia"]
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_async(cache):
+    tool = _tool()
+
+    assert await tool.ainvoke("acme") == "result for acme"
+    assert tool.invoke("acme") == "result for acme"
+
+    assert calls == ["acme"]
+
+
+def test_different_options_are_cached_separately(cache):
+    _tool(top_k_results=2).invoke("acme")
+    _tool(top_k_results=5).invoke("acme")
+    _tool(top_k_results=5).invoke("acme")
+
+    assert calls == ["acme", "acme"]
+
+
+def test_cache_disabled(cache, monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    tool = _tool()
+    tool.invoke("acme")
+    tool.invoke("acme")
+
+    assert calls == ["acme", "acme"]
+
+
+def test_entries_expire_after_engine_ttl(cache, monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_TTL_TAVILY", "10")
+    now = [1000.0]
+    monkeypatch.setattr("src.tools.search_cache.time.time", lambda: now[0])
+    cache.set("tavily", "k", (["content"], {"raw": 1}))
+
+    now[0] += 5
+    assert cache.get("tavily", "k") == (True, (["content"], {"raw": 1}))
+    now[0] += 10
+    assert cache.get("tavily", "k") == (False, None)
+
+
+def test_zero_ttl_disables_engine(cache, monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_TTL_BRAVE_SEARCH", "0")
+    cache.set("brave_search", "k", "result")
+
+    assert cache.get("brave_search", "k") == (False, None)
+
+
+def test_sqlite_store_is_shared(tmp_path):
+    path = str(tmp_path / "search.db")
+    SearchCache(path=path).set("arxiv", "k", "papers")
+
+    other = SearchCache(path=path)
+
+    assert other.get("arxiv", "k") == (True, "papers")
+    assert other.get("arxiv", "k") == (True, "papers")
+    assert other.get_stats()["arxiv"]["disk_hits"] == 1
+    assert other.get_stats()["arxiv"]["memory_hits"] == 1
+
+
+def test_memory_lru_is_bounded():
+    cache = SearchCache(path="", memory_size=2, default_ttl=60)
+    for key in ("a", "b", "c"):
+        cache.set("duckduckgo", key, key)
+
+    assert cache.get("duckduckgo", "a") == (False, None)
+    assert cache.get("duckduckgo", "c") == (True, "c")
+
+
+def test_errors_are_not_cached():
+    assert not is_cacheable(("HTTPError('429')", {}))
+    assert is_cacheable(([{"title": "t"}], {"results": []}))
+    assert is_cacheable("No good Wikipedia Search Result was found")
+
+
+@patch("src.tools.search.SELECTED_SEARCH_ENGINE", "arxiv")
+def test_web_search_tool_is_cached():
+    tool = get_web_search_tool(max_search_results=2)
+
+    assert tool.cache_engine == "arxiv"
+    assert search_options(tool)["api_wrapper.top_k_results"] == 2
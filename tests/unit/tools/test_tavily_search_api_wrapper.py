@@ -1,14 +1,17 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import patch
 
+import httpx
 import pytest
-import requests
 
 from src.tools.tavily_search.tavily_search_api_wrapper import (
     EnhancedTavilySearchAPIWrapper,
 )
+from src.tools.tavily_search.tavily_session import TavilySession
+from src.utils.outbound import OutboundGovernor
 
 
 class TestEnhancedTavilySearchAPIWrapper:
@@ -41,30 +44,48 @@ class TestEnhancedTavilySearchAPIWrapper:
             ],
         }
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
-    def test_raw_results_success(self, mock_post, wrapper, mock_response_data):
-        mock_response = Mock()
-        mock_response.json.return_value = mock_response_data
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+    @pytest.fixture
+    def session(self):
+        """A Tavily session whose requests are answered by ``session.handler``."""
+        requests = []
+
+        def handle(request):
+            requests.append(request)
+            return session.handler(request)
+
+        session = TavilySession(
+            transport=httpx.MockTransport(handle), backoff=0, max_retries=2
+        )
+        session.requests = requests
+        with (
+            patch(
+                "src.tools.tavily_search.tavily_search_api_wrapper.get_tavily_session",
+                return_value=session,
+            ),
+            patch(
+                "src.tools.tavily_search.tavily_session.get_outbound_governor",
+                return_value=OutboundGovernor(),
+            ),
+            patch("src.utils.outbound.DEFAULT_RETRY_AFTER", 0),
+        ):
+            yield session
+
+    def test_raw_results_success(self, wrapper, session, mock_response_data):
+        session.handler = lambda request: httpx.Response(200, json=mock_response_data)
 
         result = wrapper.raw_results("test query", max_results=10)
 
         assert result == mock_response_data
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-        assert "json" in call_args.kwargs
-        assert call_args.kwargs["json"]["query"] == "test query"
-        assert call_args.kwargs["json"]["max_results"] == 10
+        assert len(session.requests) == 1
+        params = json.loads(session.requests[0].content)
+        assert params["query"] == "test query"
+        assert params["max_results"] == 10
+        assert str(session.requests[0].url).endswith("/search")
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
     def test_raw_results_with_all_parameters(
-        self, mock_post, wrapper, mock_response_data
+        self, wrapper, session, mock_response_data
     ):
-        mock_response = Mock()
-        mock_response.json.return_value = mock_response_data
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        session.handler = lambda request: httpx.Response(200, json=mock_response_data)
 
         result = wrapper.raw_results(
             "test query",
@@ -79,76 +100,77 @@ class TestEnhancedTavilySearchAPIWrapper:
         )
 
         assert result == mock_response_data
-        call_args = mock_post.call_args
-        params = call_args.kwargs["json"]
+        params = json.loads(session.requests[0].content)
         assert params["include_domains"] == ["example.com"]
         assert params["exclude_domains"] == ["spam.com"]
         assert params["include_answer"] is True
         assert params["include_raw_content"] is True
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
-    def test_raw_results_http_error(self, mock_post, wrapper):
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.HTTPError("API Error")
-        mock_post.return_value = mock_response
+    def test_raw_results_http_error(self, wrapper, session):
+        session.handler = lambda request: httpx.Response(400, text="API Error")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            wrapper.raw_results("test query")
+        assert len(session.requests) == 1
+
+    def test_raw_results_retries_transient_errors(
+        self, wrapper, session, mock_response_data
+    ):
+        responses = iter(
+            [
+                httpx.ConnectError("reset"),
+                httpx.Response(503),
+                httpx.Response(200, json=mock_response_data),
+            ]
+        )
+
+        def handler(request):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        session.handler = handler
 
-        with pytest.raises(requests.HTTPError):
+        assert wrapper.raw_results("test query") == mock_response_data
+        assert len(session.requests) == 3
+
+    def test_raw_results_gives_up_after_max_retries(self, wrapper, session):
+        session.handler = lambda request: httpx.Response(429)
+
+        with pytest.raises(httpx.HTTPStatusError):
             wrapper.raw_results("test query")
+        assert len(session.requests) == 3
 
     @pytest.mark.asyncio
-    async def test_raw_results_async_success(self, wrapper, mock_response_data):
-        # Create a mock that acts as both the response and its context manager
-        mock_response_cm = AsyncMock()
-        mock_response_cm.__aenter__ = AsyncMock(return_value=mock_response_cm)
-        mock_response_cm.__aexit__ = AsyncMock(return_value=None)
-        mock_response_cm.status = 200
-        mock_response_cm.text = AsyncMock(return_value=json.dumps(mock_response_data))
-
-        # Create mock session that returns the context manager
-        mock_session = AsyncMock()
-        mock_session.post = MagicMock(
-            return_value=mock_response_cm
-        )  # Use MagicMock, not AsyncMock
-
-        # Create mock session class
-        mock_session_cm = AsyncMock()
-        mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_cm.__aexit__ = AsyncMock(return_value=None)
+    async def test_raw_results_async_success(
+        self, wrapper, session, mock_response_data
+    ):
+        session.handler = lambda request: httpx.Response(200, json=mock_response_data)
 
-        with patch(
-            "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
-            return_value=mock_session_cm,
-        ):
-            result = await wrapper.raw_results_async("test query")
+        result = await wrapper.raw_results_async("test query")
 
-            assert result == mock_response_data
+        assert result == mock_response_data
+        assert json.loads(session.requests[0].content)["query"] == "test query"
 
     @pytest.mark.asyncio
-    async def test_raw_results_async_error(self, wrapper):
-        # Create a mock that acts as both the response and its context manager
-        mock_response_cm = AsyncMock()
-        mock_response_cm.__aenter__ = AsyncMock(return_value=mock_response_cm)
-        mock_response_cm.__aexit__ = AsyncMock(return_value=None)
-        mock_response_cm.status = 400
-        mock_response_cm.reason = "Bad Request"
-
-        # Create mock session that returns the context manager
-        mock_session = AsyncMock()
-        mock_session.post = MagicMock(
-            return_value=mock_response_cm
-        )  # Use MagicMock, not AsyncMock
-
-        # Create mock session class
-        mock_session_cm = AsyncMock()
-        mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_cm.__aexit__ = AsyncMock(return_value=None)
+    async def test_raw_results_async_shares_one_client(
+        self, wrapper, session, mock_response_data
+    ):
+        session.handler = lambda request: httpx.Response(200, json=mock_response_data)
 
-        with patch(
-            "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
-            return_value=mock_session_cm,
-        ):
-            with pytest.raises(Exception, match="Error 400: Bad Request"):
-                await wrapper.raw_results_async("test query")
+        await asyncio.gather(*(wrapper.raw_results_async(f"q{i}") for i in range(5)))
+
+        assert len(session.requests) == 5
+        assert session.get_async_client() is session.get_async_client()
+        await session.aclose()
+
+    @pytest.mark.asyncio
+    async def test_raw_results_async_error(self, wrapper, session):
+        session.handler = lambda request: httpx.Response(400)
+
+        with pytest.raises(Exception, match="Error 400: Bad Request"):
+            await wrapper.raw_results_async("test query")
 
     def test_clean_results_with_images(self, wrapper, mock_response_data):
         result = wrapper.clean_results_with_images(mock_response_data)
@@ -0,0 +1,90 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import httpx
+import pytest
+
+import src.tools.tavily_search.tavily_session as tavily_session
+from src.tools.tavily_search.tavily_session import (
+    TavilySession,
+    close_tavily_session,
+    get_tavily_session,
+)
+
+
+def test_retry_delay_uses_full_jitter(monkeypatch):
+    session = TavilySession(backoff=0.5, max_backoff=3)
+    monkeypatch.setattr(tavily_session.random, "uniform", lambda low, high: high)
+
+    assert [session.retry_delay(attempt) for attempt in range(4)] == [
+        0.5,
+        1.0,
+        2.0,
+        3,
+    ]
+
+
+def test_retry_delay_honors_retry_after():
+    session = TavilySession(max_backoff=5)
+
+    assert (
+        session.retry_delay(0, httpx.Response(429, headers={"Retry-After": "2"})) == 2
+    )
+    assert (
+        session.retry_delay(0, httpx.Response(429, headers={"Retry-After": "60"})) == 5
+    )
+
+
+def test_session_configures_pool(monkeypatch):
+    monkeypatch.setenv("TAVILY_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("TAVILY_TIMEOUT", "12")
+
+    session = TavilySession()
+    client = session.get_client()
+
+    assert session.max_connections == 7
+    assert client.timeout.read == 12
+    assert session.get_client() is client
+
+
+def test_post_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    session = TavilySession(transport=httpx.MockTransport(handler), backoff=0)
+
+    assert session.post("https://api.tavily.com/search", {}).status_code == 404
+    assert len(calls) == 1
+
+
+def test_post_raises_after_transport_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout("slow")
+
+    session = TavilySession(
+        transport=httpx.MockTransport(handler), backoff=0, max_retries=1
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        session.post("https://api.tavily.com/search", {})
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_close_tavily_session():
+    session = get_tavily_session()
+    client = session.get_client()
+    async_client = session.get_async_client()
+
+    await close_tavily_session()
+
+    assert client.is_closed
+    assert async_client.is_closed
+    assert get_tavily_session() is not session
+    await close_tavily_session()
@@ -1,6 +1,8 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -66,23 +68,51 @@ async def test_retriever_tool_arun():
     mock_retriever = Mock(spec=Retriever)
     chunk = Chunk(content="async content", similarity=0.8)
     doc = Document(id="doc2", chunks=[chunk])
-    mock_retriever.query_relevant_documents.return_value = [doc]
+    mock_retriever.aquery_relevant_documents.return_value = [doc]
 
     resources = [Resource(uri="test://uri", title="Test")]
     tool = RetrieverTool(retriever=mock_retriever, resources=resources)
 
     mock_run_manager = Mock(spec=AsyncCallbackManagerForToolRun)
-    mock_sync_manager = Mock(spec=CallbackManagerForToolRun)
-    mock_run_manager.get_sync.return_value = mock_sync_manager
 
     result = await tool._arun("async keywords", mock_run_manager)
 
-    mock_run_manager.get_sync.assert_called_once()
+    mock_retriever.aquery_relevant_documents.assert_awaited_once_with(
+        "async keywords", resources
+    )
+    mock_retriever.query_relevant_documents.assert_not_called()
     assert isinstance(result, list)
     assert len(result) == 1
     assert result[0] == doc.to_dict()
 
 
+@pytest.mark.asyncio
+async def test_sync_retriever_runs_off_the_event_loop():
+    class SlowRetriever(Retriever):
+        def list_resources(self, query=None):
+            return []
+
+        def query_relevant_documents(self, query, resources=[]):
+            time.sleep(0.1)
+            return []
+
+    tool = RetrieverTool(retriever=SlowRetriever(), resources=[])
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    result = await tool._arun("keywords")
+    ticker.cancel()
+
+    assert result == "No results found from the local knowledge base."
+    assert ticks >= 5
+
+
 @patch("src.tools.retriever.build_retriever")
 def test_get_retriever_tool_success(mock_build_retriever):
     mock_retriever = Mock(spec=Retriever)
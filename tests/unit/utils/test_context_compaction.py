@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.utils.context_compaction import (
+    compact_findings,
+    estimate_tokens,
+    summarize_text,
+)
+
+FINDING = """## Market Size
+
+The market grew 12% in 2024. Growth was driven by new entrants and price cuts.
+
+## Employers
+
+Acme Corp employs 5,000 workers. Most of them work in warehouses across three states.
+
+- [Acme annual report](https://example.com/acme)
+- [Labor statistics](https://example.com/bls)
+"""
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_summarize_text_returns_short_text_unchanged():
+    assert summarize_text("short text", max_tokens=10) == "short text"
+
+
+def test_summarize_text_keeps_headings_leads_and_links():
+    summary = summarize_text(FINDING, max_tokens=60)
+    assert "## Market Size" in summary
+    assert "The market grew 12% in 2024." in summary
+    assert "Growth was driven" not in summary
+    assert "[Acme annual report](https://example.com/acme)" in summary
+    assert estimate_tokens(summary) <= 60
+
+
+def test_compact_findings_within_budget_keeps_full_text():
+    result = compact_findings([("a" * 40, None), ("b" * 40, None)], budget_tokens=100)
+    assert result.texts == ["a" * 40, "b" * 40]
+    assert result.saved_tokens == 0
+
+
+def test_compact_findings_disabled_with_zero_budget():
+    result = compact_findings([("a" * 4000, "summary")], budget_tokens=0)
+    assert result.texts == ["a" * 4000]
+
+
+def test_compact_findings_prefers_full_text_for_recent_findings():
+    old = ("old " * 200, "old summary")
+    recent = ("recent " * 50, "recent summary")
+    result = compact_findings([old, recent], budget_tokens=120)
+    assert result.texts == ["old summary", "recent " * 50]
+    assert result.used_tokens <= 120
+    assert result.saved_tokens == result.full_tokens - result.used_tokens
+
+
+def test_compact_findings_shrinks_summaries_to_fit():
+    findings = [(FINDING * 10, None) for _ in range(4)]
+    result = compact_findings(findings, budget_tokens=100)
+    assert result.used_tokens <= 100
+    assert len(result.texts) == 4
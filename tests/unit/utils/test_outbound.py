@@ -0,0 +1,258 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.utils.outbound import (
+    AsyncGovernedTransport,
+    CircuitBreaker,
+    CircuitOpenError,
+    GovernedTransport,
+    OutboundGovernor,
+    TokenBucket,
+)
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_token_bucket_pause_applies_without_rate():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert bucket.reserve() == 0
+
+    bucket.pause(2)
+
+    assert bucket.reserve() == pytest.approx(2, abs=0.05)
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    # Only one probe while half open
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_limit_fails_fast_when_circuit_is_open(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_BREAKER_FAILURES", "2")
+    governor = OutboundGovernor()
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            with governor.limit("search", "key"):
+                raise ConnectionError("down")
+    with pytest.raises(CircuitOpenError):
+        with governor.limit("search", "key"):
+            pass
+    # Other API keys have their own breaker
+    with governor.limit("search", "other-key"):
+        pass
+
+    stats = governor.get_stats()
+    assert len(stats) == 2
+    key_stats = next(s for name, s in stats.items() if name.startswith("search:"))
+    assert key_stats["failures"] == 2
+    assert key_stats["rejected"] == 1
+    assert key_stats["circuit"] == "open"
+    assert "key" not in "".join(stats)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_do_not_open_the_circuit(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_BREAKER_FAILURES", "2")
+    governor = OutboundGovernor()
+
+    async def call():
+        async with governor.alimit("tavily"):
+            await asyncio.sleep(10)
+
+    async def slow_handler(request):
+        await asyncio.sleep(10)
+
+    transport = AsyncGovernedTransport(
+        "tavily", transport=httpx.MockTransport(slow_handler), governor=governor
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(call(), 0.01)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get("https://api.test/"), 0.01)
+
+    stats = governor.get_stats()["tavily"]
+    assert stats["circuit"] == "closed"
+    assert stats["failures"] == 0
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_lets_the_next_call_probe(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_BREAKER_FAILURES", "1")
+    governor = OutboundGovernor()
+    limiter = governor.limiter("tavily")
+    limiter.breaker.reset_timeout = 0.05
+    with pytest.raises(ConnectionError):
+        async with governor.alimit("tavily"):
+            raise ConnectionError("down")
+    await asyncio.sleep(0.06)
+
+    async def probe():
+        async with governor.alimit("tavily"):
+            await asyncio.sleep(10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(probe(), 0.01)
+    assert limiter.breaker.state == "half_open"
+    async with governor.alimit("tavily"):
+        pass
+
+    assert governor.get_stats()["tavily"]["circuit"] == "closed"
+
+
+def test_limit_caps_concurrency_and_reports_queue_wait(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_LLM_CONCURRENCY", "2")
+    governor = OutboundGovernor()
+    active = []
+    peak = []
+
+    def call():
+        with governor.limit("llm"):
+            active.append(1)
+            peak.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    stats = governor.get_stats()["llm"]
+    assert stats["calls"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["queue_wait_max_ms"] >= 90
+
+
+@pytest.mark.asyncio
+async def test_alimit_caps_concurrency(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_CONCURRENCY", "1")
+    governor = OutboundGovernor()
+    active = []
+    peak = []
+
+    async def call():
+        async with governor.alimit("jina"):
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.pop()
+
+    await asyncio.gather(*(call() for _ in range(3)))
+
+    assert max(peak) == 1
+    assert governor.get_stats()["jina"]["calls"] == 3
+
+
+def test_concurrency_is_unlimited_by_default(monkeypatch):
+    monkeypatch.delenv("OUTBOUND_CONCURRENCY", raising=False)
+    monkeypatch.delenv("OUTBOUND_LLM_CONCURRENCY", raising=False)
+    governor = OutboundGovernor()
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def stream():
+        with governor.limit("llm"):
+            started.release()
+            release.wait(5)
+
+    threads = [threading.Thread(target=stream) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    acquired = [started.acquire(timeout=1) for _ in threads]
+    in_flight = governor.get_stats()["llm"]["in_flight"]
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(acquired)
+    assert in_flight == 20
+
+
+def test_rate_limited_response_pauses_provider(monkeypatch):
+    monkeypatch.setenv("OUTBOUND_BREAKER_FAILURES", "1")
+    governor = OutboundGovernor()
+
+    with governor.limit("tts") as permit:
+        permit.record_response(httpx.Response(429, headers={"Retry-After": "3"}))
+
+    limiter = governor.limiter("tts")
+    assert limiter.breaker.state == CircuitBreaker.OPEN
+    assert limiter.bucket.reserve() == pytest.approx(3, abs=0.05)
+
+
+def test_governed_transport_holds_permit_until_body_is_closed():
+    governor = OutboundGovernor()
+    transport = GovernedTransport(
+        "openai",
+        "sk-test",
+        httpx.MockTransport(
+            lambda request: httpx.Response(
+                503 if request.url.path == "/down" else 200, text="ok"
+            )
+        ),
+        governor=governor,
+    )
+    client = httpx.Client(transport=transport)
+    stats = lambda: next(iter(governor.get_stats().values()))  # noqa: E731
+
+    with client.stream("GET", "https://api.test/up") as response:
+        assert stats()["in_flight"] == 1
+        assert response.read() == b"ok"
+    assert stats()["in_flight"] == 0
+
+    assert client.get("https://api.test/down").status_code == 503
+    assert stats()["failures"] == 1
+    assert stats()["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_governed_transport():
+    governor = OutboundGovernor()
+    transport = AsyncGovernedTransport(
+        "openai",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text="ok")),
+        governor=governor,
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("https://api.test/")
+
+    assert response.text == "ok"
+    assert governor.get_stats()["openai"]["in_flight"] == 0